@@ -1,9 +1,40 @@
-from flask import Flask, request, jsonify 
+from flask import Flask, request, jsonify, Response, stream_with_context, g
 import pandas as pd
 import os
+import json
+import logging
+import time
+import uuid
 import numpy as np
 from flask_cors import CORS
-from efim import EFIM, jalankan_algoritma_efim  # Import kode EFIM yang telah dimodifikasi
+from efim import EFIM  # Import kode EFIM yang telah dimodifikasi
+from cache_hasil import CacheHasil, sidik_jari, batas_lengkap_topk
+from indeks_item import IndeksItem
+from pekerjaan import PengelolaJob
+from registri_dataset import RegistriDataset, baca_berkas
+from pipeline_preprocessing import PipelinePreprocessing
+from tipe_ringkas import ringkas_tipe, perkalian_lebar
+from profil_data import ProfilData
+from sapuan_threshold import SapuanThreshold, JUMLAH_BIN
+from halaman import (parameter_halaman, info_halaman, urutkan_itemset, urutan_transaksi, urutan_dari_total,
+                     kelompokkan_transaksi, iter_blok_transaksi, CacheKecil, UKURAN_HALAMAN, URUTAN)
+from penyimpanan_kolom import PenyimpananKolom, hash_berkas, baca_feather
+from preprocessing_streaming import (jalankan_streaming, ringkasan_berkas, periksa_missing_dan_duplikat,
+                                     hitung_baris, baris_transaksi, UKURAN_CHUNK)
+from efim_jendela import tambang_per_jendela, JENIS_JENDELA
+from hui_tertutup import MODE_HASIL, saring_maksimal, pulihkan_hui
+from metrik import MetrikEfim, TIPE_KONTEN
+from toko_transaksi import DirektoriToko
+
+# Frame registri dibagikan read-only antar endpoint; pandas 3 selalu copy-on-write, di pandas 2 perlu
+# diaktifkan sekali di sini
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Log mining (logger 'efim') mati secara default; EFIM_LOG_LEVEL=INFO/DEBUG untuk menyalakannya
+logging.basicConfig(level=os.environ.get('EFIM_LOG_LEVEL', 'WARNING').upper(),
+                    format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+log = logging.getLogger('efim.app')
 
 app = Flask(__name__)
 CORS(app)
@@ -15,19 +46,112 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
-# Variabel global untuk menyimpan jalur file dan berbagai status data
-uploaded_path = None
-raw_data = None  # Simpan data mentah asli
-cleaned_data = None  # Data setelah pembersihan (tanpa utility)
-processed_data = None  # Data setelah preprocessing lengkap (dengan utility)
+# Cache hasil EFIM per dataset (memori + persistensi di uploads/cache_efim). Berkas di disk dibatasi
+# EFIM_CACHE_DISK_ENTRI berkas dan EFIM_CACHE_DISK_MB; yang paling lama tidak dipakai dihapus.
+cache_efim = CacheHasil(direktori=os.path.join(UPLOAD_FOLDER, 'cache_efim'),
+                        maks_entri_disk=int(os.environ.get('EFIM_CACHE_DISK_ENTRI', 64)),
+                        maks_byte_disk=int(os.environ.get('EFIM_CACHE_DISK_MB', 512)) * (1 << 20))
+
+# Job mining asinkron (/jobs) dijalankan di pool berukuran tetap
+pengelola_job = PengelolaJob(maks_worker=int(os.environ.get('EFIM_JOB_WORKERS', 2)))
+
+# Registri dataset per upload (menggantikan variabel global per proses). Batas memori dalam MB.
+# Upload dan hasil preprocessing disimpan sebagai Feather di uploads/kolom (kunci: hash isi upload).
+penyimpanan_kolom = PenyimpananKolom(os.path.join(UPLOAD_FOLDER, 'kolom'))
+# Tahap preprocessing di-cache per sidik jari (dataset_id + tahap + parameter)
+pipeline = PipelinePreprocessing(penyimpanan=penyimpanan_kolom)
+# Request tanpa dataset_id ditolak (400) kecuali EFIM_SATU_PENGGUNA=1 (pengembangan / satu pengguna):
+# di mode itu upload terakhir dipakai, yang akan saling menimpa jika ada beberapa pengguna.
+SATU_PENGGUNA = os.environ.get('EFIM_SATU_PENGGUNA', '').lower() in ('1', 'true')
+registri = RegistriDataset(batas_memori=int(os.environ.get('EFIM_MEMORI_DATASET_MB', 1024)) * (1 << 20),
+                           penyimpanan=penyimpanan_kolom, kunci_tahap=pipeline.kunci_tahap,
+                           berkas_terakhir=os.path.join(UPLOAD_FOLDER, 'dataset_terakhir.json'),
+                           pakai_terakhir=SATU_PENGGUNA)
+
+# Database transaksi CSR untuk EFIM diterbitkan sekali per isi data dan dipetakan read-only oleh semua
+# worker (toko_transaksi); EFIM_DIREKTORI_TOKO=/dev/shm/... agar berkasnya di RAM. Total berkas dibatasi
+# EFIM_TOKO_MAKS_MB (toko paling lama tidak dipakai dihapus, termasuk milik data inline /run_efim).
+direktori_toko = DirektoriToko(os.environ.get('EFIM_DIREKTORI_TOKO', os.path.join(UPLOAD_FOLDER, 'toko')),
+                               maks_byte=int(os.environ.get('EFIM_TOKO_MAKS_MB', 2048)) * (1 << 20))
+
+# CSV di atas batas ini (MB) atau dengan form streaming=1 tidak dimuat utuh ke memori saat upload;
+# preprocessing-nya dijalankan per chunk (preprocessing_streaming)
+BATAS_STREAMING = int(os.environ.get('EFIM_BATAS_STREAMING_MB', 512)) * (1 << 20)
+UKURAN_CHUNK_STREAMING = int(os.environ.get('EFIM_UKURAN_CHUNK', UKURAN_CHUNK))
+
+# Turunan hasil untuk endpoint berhalaman (itemset terurut, indeks item, urutan transaksi)
+cache_halaman = CacheKecil()
+
+# Metrik Prometheus (/metrics): latensi per route dan agregat instrumentasi mining, per proses
+metrik = MetrikEfim()
+
+@app.before_request
+def _mulai_request():
+    g.mulai_request = time.perf_counter()
+
+@app.after_request
+def _catat_request(response):
+    # Route berupa pola URL (mis. /jobs/<job_id>) agar jumlah seri tetap kecil
+    mulai = g.pop('mulai_request', None)
+    if mulai is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'tidak_dikenal'
+        metrik.catat_request(route, request.method, response.status_code, time.perf_counter() - mulai)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_route():
+    return Response(metrik.teks(), content_type=TIPE_KONTEN)
 
 def allowed_file(filename):
     allowed_extensions = ['csv', 'xlsx']
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+def _dataset_id():
+    # dataset_id dari query string, body JSON atau form; None hanya berarti upload terakhir pada mode
+    # satu pengguna
+    data = request.get_json(silent=True) or {}
+    return request.args.get('dataset_id') or data.get('dataset_id') or request.form.get('dataset_id')
+
+def _tanpa_dataset_id():
+    return jsonify({'error': 'Parameter dataset_id diperlukan (dikembalikan oleh /upload)'}), 400
+
+def _ambil_tahap(*tahap):
+    # DataFrame tahap pertama yang tersedia untuk dataset di request (read-only, jangan diubah in-place).
+    # Mengembalikan (entri, df, None) atau (None, None, respons_error).
+    dataset_id = _dataset_id()
+    entri = registri.ambil(dataset_id)
+    if entri is None:
+        if dataset_id:
+            return None, None, (jsonify({'error': f'Dataset tidak ditemukan: {dataset_id}'}), 404)
+        if not registri.pakai_terakhir:
+            return None, None, _tanpa_dataset_id()
+        return None, None, (jsonify({'error': 'Belum ada file yang diupload atau data yang diproses'}), 400)
+    for nama in tahap:
+        if nama == 'raw' and entri.streaming:
+            # Upload streaming tidak pernah dimuat utuh
+            continue
+        try:
+            df = registri.tahap(entri.id, nama)
+        except Exception as e:
+            return None, None, (jsonify({'error': f'Gagal membaca file: {str(e)}'}), 500)
+        if df is not None:
+            return entri, df, None
+    return None, None, (jsonify({'error': 'Data untuk dataset ini belum tersedia'}), 400)
+
+def _format_tanggal(df):
+    # Salinan dangkal (copy-on-write) dengan TANGGAL sebagai string untuk preview
+    if 'TANGGAL' in df.columns and pd.api.types.is_datetime64_any_dtype(df['TANGGAL']):
+        return df.assign(TANGGAL=df['TANGGAL'].dt.strftime('%Y-%m-%d'))
+    return df.copy(deep=False)
+
+def _profil(entri, raw=None):
+    # Profil data mentah entri; dihitung saat upload, atau sekali di sini untuk entri yang dipulihkan
+    if entri.profil is None:
+        entri.profil = ProfilData(raw if raw is not None else registri.tahap(entri.id, 'raw'))
+    return entri.profil
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
-    global uploaded_path, raw_data
     file = request.files.get('file')
     if not file:
         return jsonify({'error': 'Tidak ada file yang dikirim'}), 400
@@ -36,57 +160,66 @@ def upload_file():
         return jsonify({'error': 'File tidak valid. Harap unggah file CSV atau Excel.'}), 400
         
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
+        # Nama berkas diberi awalan acak agar upload dengan nama sama tidak saling menimpa
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'{uuid.uuid4().hex[:8]}_{os.path.basename(file.filename)}')
         file.save(filepath)
         
         # Verifikasi file telah disimpan
         if not os.path.exists(filepath):
             return jsonify({'error': 'Gagal menyimpan file'}), 500
             
-        uploaded_path = filepath
-        
-        # Segera baca dan simpan data mentah asli
-        if filepath.endswith('.csv'):
-            raw_data = pd.read_csv(filepath)
-        elif filepath.endswith('.xlsx'):
-            raw_data = pd.read_excel(filepath)
+        streaming = filepath.endswith('.csv') and (request.form.get('streaming') in ('1', 'true')
+                                                   or os.path.getsize(filepath) > BATAS_STREAMING)
+        if streaming:
+            # Upload besar: hanya di-hash dan didaftarkan, data mentah dibaca per chunk saat dibutuhkan
+            # (isi yang sama pernah diupload biasa: entri lama dengan raw-nya tetap dipakai)
+            entri = registri.daftar(filepath, dataset_id=hash_berkas(filepath), streaming=True)
+            if entri.streaming and entri.jumlah_baris is None:
+                entri.jumlah_baris = hitung_baris(filepath, UKURAN_CHUNK_STREAMING)
+        else:
+            # Segera baca dan simpan data mentah asli; dataset_id = hash isi berkas, berkas yang sama
+            # cukup diparse sekali lalu dibaca dari penyimpanan kolumnar. Kolom identitas disimpan
+            # sebagai categorical dan numerik diturunkan (tipe_ringkas) untuk menghemat memori.
+            kunci, raw = penyimpanan_kolom.muat_upload(filepath, lambda path: ringkas_tipe(baca_berkas(path)))
+            entri = registri.daftar(filepath, raw, dataset_id=kunci)
+            # Profil (kosong, duplikat, kuantil, ...) dihitung sekali di sini dan disimpan di entri
+            _profil(entri, raw)
             
-        return jsonify({'message': 'File berhasil diupload', 'file_path': filepath}), 200
+        return jsonify({'message': 'File berhasil diupload', 'file_path': filepath, 'dataset_id': entri.id,
+                        'streaming': entri.streaming}), 200
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
-        print(f"Upload error: {error_details}")
+        log.error("Upload error: %s", error_details)
         return jsonify({'error': f'Gagal mengupload file: {str(e)}'}), 500
 
+def _entri_streaming():
+    # Entri dataset di request jika diupload dalam mode streaming, selain itu None
+    entri = registri.ambil(_dataset_id())
+    return entri if entri is not None and entri.streaming else None
+
 @app.route('/raw_preview', methods=['GET'])
 def raw_preview():
-    global uploaded_path, raw_data
-    
-    # Jika raw_data sudah tersedia, gunakan itu daripada membaca ulang file
-    if raw_data is not None:
-        print("Menggunakan data mentah yang sudah disimpan dalam memori")
-        df = raw_data
-    elif uploaded_path and os.path.exists(uploaded_path):
-        try:
-            print(f"Membaca preview file: {uploaded_path}")
-            if uploaded_path.endswith('.csv'):
-                df = pd.read_csv(uploaded_path)
-            elif uploaded_path.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_path)
-            else:
-                return jsonify({'error': 'Format file tidak dikenali'}), 400
-            # Update raw_data
-            raw_data = df.copy()
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"Preview error: {error_details}")
-            return jsonify({'error': f'Gagal membaca file: {str(e)}', 'details': error_details}), 500
-    else:
-        return jsonify({'error': 'Belum ada file yang diupload atau file tidak ditemukan'}), 400
-
     n = int(request.args.get('n', 20))
-    print(f"Berhasil membaca file. Jumlah baris: {len(df)}, Kolom: {df.columns.tolist()}")
+    entri = _entri_streaming()
+    if entri is not None:
+        # Hanya n baris pertama yang diparse; jumlah baris dihitung saat upload (atau sekali di sini
+        # untuk entri yang dipulihkan worker lain)
+        df = pd.read_csv(entri.path, nrows=n)
+        if entri.jumlah_baris is None:
+            entri.jumlah_baris = hitung_baris(entri.path, UKURAN_CHUNK_STREAMING)
+        return jsonify({
+            'preview': df.to_dict(orient='records'),
+            'total_rows': entri.jumlah_baris,
+            'total_columns': len(df.columns),
+            'column_names': list(df.columns)
+        })
+
+    _, df, error = _ambil_tahap('raw')
+    if error:
+        return error
+
+    log.debug("Berhasil membaca file. Jumlah baris: %d, Kolom: %s", len(df), df.columns.tolist())
     preview_data = df.head(n).to_dict(orient='records')
     return jsonify({
         'preview': preview_data,
@@ -97,454 +230,674 @@ def raw_preview():
 
 @app.route('/check_missing_and_duplicates', methods=['GET'])
 def check_missing_and_duplicates():
-    global uploaded_path, raw_data
-    
-    # Gunakan data yang sudah disimpan jika tersedia
-    if raw_data is not None:
-        df = raw_data.copy()
-    elif uploaded_path and os.path.exists(uploaded_path):
-        try:
-            print(f"Memeriksa data untuk missing values dan duplikat: {uploaded_path}")
-            if uploaded_path.endswith('.csv'):
-                df = pd.read_csv(uploaded_path)
-            elif uploaded_path.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_path)
-            else:
-                return jsonify({'error': 'Format file tidak dikenali'}), 400
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"Check missing error: {error_details}")
-            return jsonify({'error': f'Gagal memproses file: {str(e)}', 'details': error_details}), 500
-    else:
-        return jsonify({'error': 'Belum ada file yang diupload atau file tidak ditemukan'}), 400
-
-    missing_values = df.isnull().sum().to_dict()
-    missing_values = {k: (None if pd.isna(v) else int(v)) for k, v in missing_values.items()}
+    entri = _entri_streaming()
+    if entri is not None:
+        # Versi chunked; daftar grup duplikat tidak dikembalikan untuk berkas sebesar ini
+        kosong, num_duplicates, num_unique_duplicates = periksa_missing_dan_duplikat(entri.path, UKURAN_CHUNK_STREAMING)
+        return jsonify({
+            'missing_values': {k: int(v) for k, v in kosong.items()},
+            'num_duplicates': num_duplicates,
+            'num_unique_duplicates': num_unique_duplicates,
+            'duplicate_groups': []
+        })
+
+    # Dari profil upload; grup duplikat per halaman (cursor, page_size) dalam urutan kemunculan pertama
+    try:
+        offset, ukuran, _ = parameter_halaman({'cursor': request.args.get('cursor'),
+                                               'page_size': request.args.get('page_size'), 'urut': 'id'})
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Parameter halaman tidak valid: {str(e)}'}), 400
+    entri, df, error = _ambil_tahap('raw')
+    if error:
+        return error
+    profil = _profil(entri, df)
+    log.debug("Missing values: %s", profil.kosong)
+    log.debug("Jumlah duplikat: %d", profil.jumlah_duplikat)
 
-    num_duplicates = df.duplicated(keep=False).sum()
-    num_unique_duplicates = df.duplicated().sum()
+    return jsonify({
+        'missing_values': profil.kosong,
+        'num_duplicates': profil.jumlah_duplikat,
+        'num_unique_duplicates': profil.jumlah_duplikat_unik,
+        'duplicate_groups': profil.halaman_duplikat(df, offset, ukuran),
+        'duplicate_groups_halaman': info_halaman(profil.jumlah_duplikat, offset, ukuran, 'id'),
+    })
 
-    print(f"Missing values: {missing_values}")
-    print(f"Jumlah duplikat: {num_duplicates}")
+@app.route('/data_profile', methods=['GET'])
+def data_profile():
+    # Profil data mentah (kosong, dtype, kardinalitas, kuantil, duplikat) yang dihitung saat upload
+    if _entri_streaming() is not None:
+        return jsonify({'error': 'Profil data tidak tersedia untuk upload streaming'}), 400
+    entri, df, error = _ambil_tahap('raw')
+    if error:
+        return error
+    return jsonify({'dataset_id': entri.id, **_profil(entri, df).ringkasan()})
+
+def _ringkasan_tahap(df):
+    # Preview dari head(20) saja; tidak ada salinan frame penuh
+    return {
+        'preview': _format_tanggal(df.head(20)).to_dict(orient='records'),
+        'total_rows': len(df),
+        'total_columns': len(df.columns),
+        'column_names': list(df.columns)
+    }
 
-    duplicate_groups = []
-    if num_duplicates > 0:
-        df_duplikat = df[df.duplicated(keep=False)].copy()
-        df_duplikat['Duplicate_Group'] = df_duplikat.groupby(list(df.columns)).ngroup()
-        duplicate_groups = df_duplikat.sort_values(by='Duplicate_Group').to_dict(orient='records')
-        duplicate_groups = [
-            {k: (None if pd.isna(v) else v) for k, v in group.items()} for group in duplicate_groups
-        ]
+def _halaman_grup(dataset_id, df, halaman):
+    # grouped_data satu halaman; urutan transaksi di-cache per hasil preprocessing dan urutan
+    offset, ukuran, urut = halaman
+    ids = cache_halaman.ambil(('transaksi', pipeline.kunci_tahap(dataset_id, 'processed'), urut),
+                              lambda: urutan_transaksi(df, urut))
+    grouped = kelompokkan_transaksi(df, ids[offset:offset + ukuran])
+    return grouped.to_dict(orient='records'), info_halaman(len(ids), offset, ukuran, urut)
+
+def _preprocess_memori(entri, ambil_raw, halaman=None):
+    # halaman: (offset, ukuran, urut) untuk grouped_data berhalaman; None berarti semua transaksi
+    # Tiap tahap hanya dijalankan jika keluarannya belum ada di cache (memori atau kolumnar)
+    df_cleaned = pipeline.keluaran(entri.id, 'bersihkan', ambil_raw, entri.profil)
+    df_before_utility = pipeline.keluaran(entri.id, 'outlier', ambil_raw, entri.profil)
+    processed_data = pipeline.keluaran(entri.id, 'utilitas', ambil_raw, entri.profil)
+    registri.simpan(entri.id, 'cleaned', df_cleaned, berkas=pipeline.path(entri.id, 'bersihkan'))
+
+    # Hasil preprocessing tersimpan kolumnar (Feather); berkas CSV hanya jika pyarrow tidak tersedia
+    preprocessed_path = pipeline.path(entri.id, 'utilitas')
+    if preprocessed_path is None:
+        preprocessed_path = os.path.join(app.config['UPLOAD_FOLDER'], f'preprocessed_{entri.id}.csv')
+        if not os.path.exists(preprocessed_path):
+            processed_data.to_csv(preprocessed_path, index=False)
+    registri.simpan(entri.id, 'processed', processed_data, berkas=preprocessed_path)
+    log.info("Hasil preprocessing: %s", preprocessed_path)
+
+    hasil = {
+        'dataset_id': entri.id,
+        'after_cleaning': _ringkasan_tahap(df_cleaned),
+        'after_outlier_removal': _ringkasan_tahap(df_before_utility),
+        'with_utility': _ringkasan_tahap(processed_data),
+    }
+    if halaman is None:
+        # Keluaran 'grup' tidak tersimpan di disk; registri yang memegangnya (dalam batas memorinya)
+        grup = pipeline.keluaran(entri.id, 'grup', ambil_raw, entri.profil)
+        registri.simpan(entri.id, 'grup', grup)
+        hasil['grouped_data'] = grup.to_dict(orient='records')
+    else:
+        hasil['grouped_data'], hasil['grouped_halaman'] = _halaman_grup(entri.id, processed_data, halaman)
+    return hasil, processed_data
+
+def _ringkasan_berkas_tahap(path, tanpa=()):
+    # Seperti _ringkasan_tahap untuk berkas Feather: hanya head dan metadata batch yang dibaca
+    jumlah, kolom, head = ringkasan_berkas(path)
+    kolom = [col for col in kolom if col not in tanpa]
+    return {
+        'preview': _format_tanggal(head[kolom]).to_dict(orient='records'),
+        'total_rows': jumlah,
+        'total_columns': len(kolom),
+        'column_names': kolom
+    }
 
-    return jsonify({
-        'missing_values': missing_values,
-        'num_duplicates': int(num_duplicates),
-        'num_unique_duplicates': int(num_unique_duplicates),
-        'duplicate_groups': duplicate_groups
-    })
+def _halaman_grup_streaming(path_hasil, transaksi, halaman):
+    # grouped_data satu halaman dari ringkasan per transaksi; hanya baris transaksi di halaman yang
+    # dibaca dari berkas hasil
+    offset, ukuran, urut = halaman
+    ids = cache_halaman.ambil(('transaksi', path_hasil, urut),
+                              lambda: urutan_dari_total(transaksi['ID_PENJUALAN'].to_numpy(),
+                                                        transaksi['UTILITY'].to_numpy(), urut))
+    ids_halaman = ids[offset:offset + ukuran]
+    grouped = kelompokkan_transaksi(ringkas_tipe(baris_transaksi(path_hasil, ids_halaman)), ids_halaman)
+    return grouped.to_dict(orient='records'), info_halaman(len(ids), offset, ukuran, urut)
+
+def _processed_streaming(entri, path_hasil):
+    # Hasil preprocessing streaming utuh, dimuat hanya saat dibutuhkan EFIM
+    df = entri.tahap.get('processed')
+    if df is None:
+        df = ringkas_tipe(baca_feather(path_hasil))
+        registri.simpan(entri.id, 'processed', df, berkas=path_hasil)
+    return df
+
+def _preprocess_streaming(entri, halaman=None):
+    # Preprocessing per chunk; keluaran tahap langsung ditulis ke Feather. Ringkasan respons dan
+    # grouped_data (selalu berhalaman) diambil dari statistik lintasan chunk dan ringkasan per
+    # transaksi, tanpa memuat hasil utuh. Mengembalikan (hasil, fungsi pemuat hasil untuk EFIM).
+    path_bersih, path_hasil, transaksi = jalankan_streaming(pipeline, entri.id, entri.path, UKURAN_CHUNK_STREAMING)
+    registri.pasang_berkas(entri.id, 'cleaned', path_bersih)
+    registri.pasang_berkas(entri.id, 'processed', path_hasil)
+    hasil = {
+        'dataset_id': entri.id,
+        'streaming': True,
+        'after_cleaning': _ringkasan_berkas_tahap(path_bersih),
+        'after_outlier_removal': _ringkasan_berkas_tahap(path_hasil, tanpa=('UTILITY',)),
+        'with_utility': _ringkasan_berkas_tahap(path_hasil),
+        # Bagian yang tumbuh dengan data: ringkasan per transaksi (keluaran tahap 'grup') dipegang utuh
+        # di memori; dedup dan pembersihan dibatasi ukuran chunk dan partisi (preprocessing_streaming)
+        'memori_ringkasan_transaksi': {
+            'jumlah_transaksi': len(transaksi),
+            'byte': int(transaksi.memory_usage(index=False, deep=True).sum()),
+        },
+    }
+    hasil['grouped_data'], hasil['grouped_halaman'] = _halaman_grup_streaming(path_hasil, transaksi,
+                                                                              halaman or (0, UKURAN_HALAMAN, 'id'))
+    return hasil, lambda: _processed_streaming(entri, path_hasil)
 
 @app.route('/preprocess', methods=['POST'])
 def preprocess_data():
-    global uploaded_path, raw_data, cleaned_data, processed_data
-    
-    # Gunakan data yang sudah disimpan jika tersedia
-    if raw_data is not None:
-        df = raw_data.copy()
-    elif uploaded_path and os.path.exists(uploaded_path):
+    entri = registri.ambil(_dataset_id())
+    if entri is None:
+        return _ambil_tahap('raw')[2]
+    if entri.streaming and not penyimpanan_kolom.tersedia:
+        return jsonify({'error': 'Preprocessing streaming membutuhkan pyarrow'}), 400
+    # grouped_page_size (opsional): grouped_data berhalaman (grouped_cursor, grouped_urut) alih-alih semua
+    # transaksi; halaman berikutnya diambil lewat /grouped_data
+    halaman = None
+    if request.json.get('grouped_page_size') is not None:
         try:
-            print(f"Processing file: {uploaded_path}")
-            if uploaded_path.endswith('.csv'):
-                df = pd.read_csv(uploaded_path)
-                print(f"Berhasil membaca file CSV. Ukuran data: {df.shape}")
-            elif uploaded_path.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_path)
-                print(f"Berhasil membaca file Excel. Ukuran data: {df.shape}")
-            else:
-                return jsonify({'error': 'Format file tidak dikenali'}), 400
-            
-            # Simpan data mentah asli
-            raw_data = df.copy()
-        except Exception as e:
-            print(f"ERROR SAAT MEMBACA FILE: {str(e)}")
-            return jsonify({'error': f'Gagal membaca file: {str(e)}'}), 500
-    else:
-        return jsonify({'error': 'Belum ada file yang diupload atau file tidak ditemukan'}), 400
+            halaman = parameter_halaman({'cursor': request.json.get('grouped_cursor'),
+                                         'page_size': request.json.get('grouped_page_size'),
+                                         'urut': request.json.get('grouped_urut', 'id')})
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Parameter halaman tidak valid: {str(e)}'}), 400
+
+    def ambil_raw():
+        df = registri.tahap(entri.id, 'raw')
+        if df is None:
+            raise ValueError('Data mentah dataset tidak ditemukan')
+        return df
 
     try:
-        print("============ MULAI DEBUGGING PREPROCESS ============")
-        
-        # Langkah 2: Periksa kolom yang ada
-        print(f"Kolom dalam file: {df.columns.tolist()}")
-        print(f"Tipe data per kolom: {df.dtypes.to_dict()}")
-        print(f"Jumlah nilai NULL per kolom: {df.isnull().sum().to_dict()}")
-        
-        # Langkah 3: Standarisasi nama kolom
-        df.columns = [col.upper().strip().replace(' ', '_') for col in df.columns]
-        print(f"Kolom setelah standarisasi: {df.columns.tolist()}")
-        
-        # Langkah 4: Hapus baris kosong
-        rows_before = len(df)
-        df.dropna(how='all', inplace=True)
-        print(f"Baris setelah hapus kosong: {len(df)} (dihapus {rows_before - len(df)})")
-
-        # Langkah 5: Hapus kolom dengan banyak nilai kosong
-        threshold = 0.5
-        missing_fraction = df.isnull().mean()
-        cols_to_drop = missing_fraction[missing_fraction > threshold].index.tolist()
-        if cols_to_drop:
-            print(f"Menghapus kolom dengan banyak nilai kosong: {cols_to_drop}")
-            df.drop(columns=cols_to_drop, inplace=True)
-
-        # Langkah 6: Hapus baris dengan nilai NaN dan duplikat
-        rows_before = len(df)
-        df.dropna(inplace=True)
-        print(f"Baris setelah hapus NaN: {len(df)} (dihapus {rows_before - len(df)})")
-        
-        rows_before = len(df)
-        df.drop_duplicates(inplace=True)
-        print(f"Baris setelah hapus duplikat: {len(df)} (dihapus {rows_before - len(df)})")
-
-        # Langkah 7: Konversi kolom TANGGAL
-        if 'TANGGAL' in df.columns:
-            print(f"Format nilai di kolom TANGGAL sebelum konversi: {df['TANGGAL'].head().tolist()}")
-            # Simpan data asli sebelum konversi
-            original_dates = df['TANGGAL'].copy()
-            df['TANGGAL'] = pd.to_datetime(df['TANGGAL'], errors='coerce')
-             # Identifikasi baris dengan tanggal tidak valid (NaT)
-            invalid_mask = df['TANGGAL'].isna()
-             # Tampilkan jumlah tanggal tidak valid
-            print(f"Jumlah tanggal tidak valid: {invalid_mask.sum()}")
-             # Tetapkan tanggal default untuk nilai tidak valid (misal: 2 juni 2010)
-            default_date = pd.Timestamp('2010-06-02')
-            df.loc[invalid_mask, 'TANGGAL'] = default_date
-            print(f"Format nilai di kolom TANGGAL setelah konversi: {df['TANGGAL'].head().tolist()}")
-            print(f"Nilai yang diubah menjadi tanggal default: {invalid_mask.sum()}")
-
-        # Langkah 8: Hapus kolom yang tidak diperlukan
-        columns_to_drop = ['NOMORREF', 'SATUAN']
-        dropped = []
-        for col in columns_to_drop:
-            if col in df.columns:
-                df.drop(col, axis=1, inplace=True)
-                dropped.append(col)
-        if dropped:
-            print(f"Kolom yang dihapus: {dropped}")
-
-        # Simpan data yang sudah dibersihkan tetapi belum ditambah kolom UTILITY
-        df_cleaned = df.copy()
-        cleaned_data = df_cleaned.copy()  # Simpan data setelah pembersihan
-        print(f"Kolom setelah cleaning: {df_cleaned.columns.tolist()}")
-        print(f"Ukuran data setelah cleaning: {df_cleaned.shape}")
-
-        # Preview data setelah pembersihan (tanpa tambahan kolom utility)
-        preview_cleaned = df_cleaned.copy()
-        if 'TANGGAL' in preview_cleaned.columns and pd.api.types.is_datetime64_any_dtype(preview_cleaned['TANGGAL']):
-            preview_cleaned['TANGGAL'] = preview_cleaned['TANGGAL'].dt.strftime('%Y-%m-%d')
-
-        # Langkah 9: Tangani outlier
-        df_numeric = df_cleaned.select_dtypes(include=['number'])
-        if 'ID_PENJUALAN' in df_numeric.columns:
-            df_numeric = df_numeric.drop(columns=['ID_PENJUALAN'])
-            
-        if not df_numeric.empty:
-            print(f"Kolom numerik untuk deteksi outlier: {df_numeric.columns.tolist()}")
-            Q1 = df_numeric.quantile(0.25)
-            Q3 = df_numeric.quantile(0.75)
-            IQR = Q3 - Q1
-            
-            print("Batas outlier:")
-            for col in df_numeric.columns:
-                lower_bound = Q1[col] - 1.5 * IQR[col]
-                upper_bound = Q3[col] + 1.5 * IQR[col]
-                print(f"  - {col}: [{lower_bound}, {upper_bound}]")
-            
-            filter_outlier = ~((df_numeric < (Q1 - 1.5 * IQR)) | (df_numeric > (Q3 + 1.5 * IQR))).any(axis=1)
-            df_outlier_removed = df_cleaned[filter_outlier]
-            print(f"Baris setelah penghapusan outlier: {len(df_outlier_removed)} (dihapus {len(df_cleaned) - len(df_outlier_removed)})")
-        else:
-            print("Tidak ada kolom numerik untuk deteksi outlier")
-            df_outlier_removed = df_cleaned
-
-        # Langkah 10: Cek dan tambahkan kolom yang diperlukan
-        print("Validasi kolom yang diperlukan")
-        required_cols = ['ID_PENJUALAN', 'KODE_BARANG', 'NAMA_BARANG', 'QTY', 'HARGASATUAN', 'TANGGAL']
-        
-        for col in required_cols:
-            if col not in df_outlier_removed.columns:
-                print(f"Kolom {col} tidak ditemukan - membuat kolom dengan nilai default")
-                if col == 'ID_PENJUALAN':
-                    df_outlier_removed[col] = range(1, len(df_outlier_removed) + 1)
-                elif col == 'QTY':
-                    df_outlier_removed[col] = 1
-                elif col == 'HARGASATUAN':
-                    df_outlier_removed[col] = 0
-                elif col == 'TANGGAL':
-                    df_outlier_removed[col] = pd.Timestamp.now()
-                else:
-                    df_outlier_removed[col] = "Data Tidak Tersedia"
-
-        # BUAT COPY DATA SETELAH OUTLIER REMOVAL TAPI SEBELUM TAMBAH UTILITY
-        df_before_utility = df_outlier_removed.copy()
-        
-        # Pastikan format tanggal konsisten untuk preview df_before_utility
-        if 'TANGGAL' in df_before_utility.columns and pd.api.types.is_datetime64_any_dtype(df_before_utility['TANGGAL']):
-            df_before_utility['TANGGAL'] = df_before_utility['TANGGAL'].dt.strftime('%Y-%m-%d')
-
-        # Langkah 11: Tambahkan/Update UTILITY
-        if all(col in df_outlier_removed.columns for col in ['QTY', 'HARGASATUAN']):
-            # Buat kolom UTILITY baru
-            df_outlier_removed['UTILITY'] = df_outlier_removed['QTY'] * df_outlier_removed['HARGASATUAN']
-            print("Kolom UTILITY telah ditambahkan/diperbarui")
-        else:
-            df_outlier_removed['UTILITY'] = 0
-            print("Dibuat kolom UTILITY dengan nilai 0")
-
-        # Simpan data setelah preprocessing lengkap (dengan utility)
-        processed_data = df_outlier_removed.copy()
-        
-        # Buat versi yang dapat ditampilkan untuk preview
-        preview_df = processed_data.copy()
-        if 'TANGGAL' in preview_df.columns and pd.api.types.is_datetime64_any_dtype(preview_df['TANGGAL']):
-            preview_df['TANGGAL'] = preview_df['TANGGAL'].dt.strftime('%Y-%m-%d')
-
-        # Langkah 12: Groupby untuk mendapatkan nilai agregat
-        print("Melakukan operasi groupby")
-        # Pastikan kolom 'UTILITY' ada dalam df_outlier_removed sebelum groupby
-        if 'UTILITY' not in df_outlier_removed.columns:
-            print("PERINGATAN: Kolom UTILITY tidak ditemukan sebelum groupby")
-            # Cek kolom apa saja yang ada
-            print(f"Kolom yang tersedia: {df_outlier_removed.columns.tolist()}")
-        
-        grouped = df_outlier_removed.groupby('ID_PENJUALAN').agg({
-            'KODE_BARANG': lambda x: list(x.astype(str)),
-            'NAMA_BARANG': lambda x: list(x.astype(str)),
-            'QTY': lambda x: list(x),
-            'HARGASATUAN': lambda x: list(x),
-            'UTILITY': lambda x: list(x),
-            'TANGGAL': lambda x: list(x)
-        }).reset_index()
-        print(f"Berhasil melakukan groupby, jumlah grup: {len(grouped)}")
-
-        # Langkah 13: Simpan hasil preprocessing
-        print("Menyimpan hasil preprocessing")
-        preprocessed_path = os.path.join(app.config['UPLOAD_FOLDER'], 'preprocessed_data.csv')
-        processed_data.to_csv(preprocessed_path, index=False)
-        
-        # Verifikasi file telah disimpan
-        if os.path.exists(preprocessed_path):
-            print(f"File preprocessed berhasil disimpan: {preprocessed_path}")
+        log.info("Mulai preprocess dataset %s", entri.id)
+        if entri.streaming:
+            hasil, ambil_processed = _preprocess_streaming(entri, halaman)
         else:
-            print(f"Error: Gagal menyimpan file preprocessed: {preprocessed_path}")
-            return jsonify({'error': 'Gagal menyimpan file hasil preprocessing'}), 500
-
-        print("============ SELESAI DEBUGGING PREPROCESS ============")
-        
-        # Periksa kolom sebelum menjalankan EFIM
-        print(f"Kolom dalam data processed_data sebelum EFIM: {processed_data.columns.tolist()}")
-        
-        # Jalankan EFIM secara otomatis setelah preprocessing
-        min_util = request.json.get('min_util', 700000)  # Default nilai min_util jika tidak disediakan
-        threshold = request.json.get('threshold', 700000)
-        try:
-            efim_result = run_efim(processed_data, threshold)
-            print(f"EFIM berhasil dijalankan secara otomatis dengan min_util: {threshold}")
-            
-            # Gabungkan hasil preprocessing dan EFIM
-            return jsonify({
-                'after_cleaning': {
-                    'preview': preview_cleaned.head(20).to_dict(orient='records'),
-                    'total_rows': len(df_cleaned),
-                    'total_columns': len(df_cleaned.columns),
-                    'column_names': list(df_cleaned.columns)
-                },
-                'after_outlier_removal': {
-                    'preview': df_before_utility.head(20).to_dict(orient='records'),
-                    'total_rows': len(df_before_utility),
-                    'total_columns': len(df_before_utility.columns),
-                    'column_names': list(df_before_utility.columns)
-                },
-                'with_utility': {
-                    'preview': preview_df.head(20).to_dict(orient='records'),
-                    'total_rows': len(processed_data),
-                    'total_columns': len(processed_data.columns),
-                    'column_names': list(processed_data.columns)
-                },
-                'grouped_data': grouped.to_dict(orient='records'),
-                'efim_result': efim_result
-            })
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"ERROR SAAT MENJALANKAN EFIM OTOMATIS: {error_details}")
-            
-            # Jika EFIM gagal, tetap kembalikan hasil preprocessing
-            return jsonify({
-                'after_cleaning': {
-                    'preview': preview_cleaned.head(20).to_dict(orient='records'),
-                    'total_rows': len(df_cleaned),
-                    'total_columns': len(df_cleaned.columns),
-                    'column_names': list(df_cleaned.columns)
-                },
-                'after_outlier_removal': {
-                    'preview': df_before_utility.head(20).to_dict(orient='records'),
-                    'total_rows': len(df_before_utility),
-                    'total_columns': len(df_before_utility.columns),
-                    'column_names': list(df_before_utility.columns)
-                },
-                'with_utility': {
-                    'preview': preview_df.head(20).to_dict(orient='records'),
-                    'total_rows': len(processed_data),
-                    'total_columns': len(processed_data.columns),
-                    'column_names': list(processed_data.columns)
-                },
-                'grouped_data': grouped.to_dict(orient='records'),
-                'efim_error': str(e)
-            })
-    
+            hasil, processed_data = _preprocess_memori(entri, ambil_raw, halaman)
+            ambil_processed = lambda: processed_data
+        log.info("Selesai preprocess dataset %s", entri.id)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
-        print("============ ERROR UTAMA PADA PREPROCESS ============")
-        print(error_details)
-        print("============ AKHIR ERROR UTAMA ============")
+        log.error("Error pada preprocess dataset %s: %s", entri.id, error_details)
         return jsonify({'error': f'Gagal melakukan preprocessing: {str(e)}', 'details': error_details}), 500
 
-# Fungsi untuk menjalankan EFIM tanpa endpoint terpisah
-def run_efim(df, threshold):
+    # Jalankan EFIM secara otomatis setelah preprocessing
+    threshold = request.json.get('threshold', 700000)  # Default nilai threshold jika tidak disediakan
+    k = request.json.get('k')  # Mode top-K: threshold dinaikkan otomatis selama mining
+    if k is not None:
+        threshold = request.json.get('threshold', 0)
     try:
-        print(f"Menjalankan EFIM dengan threshold: {threshold}")
-        
-        # Cek kolom yang diperlukan
-        required_columns = {'ID_PENJUALAN', 'NAMA_BARANG', 'TANGGAL', 'KODE_BARANG', 'UTILITY'}
-        missing_columns = required_columns - set(df.columns)
-        
-        if missing_columns:
-            print(f"Kolom yang diperlukan tidak ditemukan: {missing_columns}")
-            raise ValueError(f"File harus memiliki kolom: {required_columns}. Kolom yang hilang: {missing_columns}")
-            
-        # Ambil data transaksi
-        transaksi_data = df[['ID_PENJUALAN', 'NAMA_BARANG', 'TANGGAL', 'KODE_BARANG', 'UTILITY']].copy()
-        print(f"Data transaksi berhasil disiapkan, jumlah baris: {len(transaksi_data)}")
-
-        # Buat mapping nama barang
-        kode_nama_mapping = df[['KODE_BARANG', 'NAMA_BARANG']].drop_duplicates().set_index('KODE_BARANG')['NAMA_BARANG'].to_dict()
-
-        # Hitung TWU per item
-        twu_per_item = {}
-        transaksi_grouped = transaksi_data.groupby('ID_PENJUALAN')
-        for id_transaksi, group in transaksi_grouped:
-            transaksi_utility = group['UTILITY'].sum()
-            for item in group['KODE_BARANG'].unique():
-                twu_per_item[item] = twu_per_item.get(item, 0) + transaksi_utility
+        processed_data = ambil_processed()
+        if request.json.get('async'):
+            # Mode asinkron: EFIM dikirim sebagai job, hasilnya dipantau lewat /jobs/<job_id>
+            job = kirim_job_efim(processed_data, threshold, k=k)
+            hasil['efim_result'] = {'job_id': job.id, 'status': job.status}
+        else:
+            hasil['efim_result'] = run_efim(processed_data, threshold, k=k)
+        log.info("EFIM berhasil dijalankan secara otomatis dengan min_util: %s", threshold)
+    except Exception as e:
+        log.exception("Error saat menjalankan EFIM otomatis")
+        # Jika EFIM gagal, tetap kembalikan hasil preprocessing
+        hasil['efim_error'] = str(e)
+    return jsonify(hasil)
+
+@app.route('/grouped_data', methods=['GET'])
+def grouped_data_route():
+    # Transaksi hasil preprocessing yang dikelompokkan, per halaman (cursor, page_size, urut)
+    try:
+        halaman = parameter_halaman(request.args, ukuran_bawaan=UKURAN_HALAMAN)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Parameter halaman tidak valid: {str(e)}'}), 400
+    entri = _entri_streaming()
+    if entri is not None and penyimpanan_kolom.tersedia and 'processed' in entri.berkas:
+        # Upload streaming yang sudah dipreprocess: dari ringkasan per transaksi, tanpa memuat hasil utuh
+        try:
+            _, path_hasil, transaksi = jalankan_streaming(pipeline, entri.id, entri.path, UKURAN_CHUNK_STREAMING)
+        except Exception as e:
+            return jsonify({'error': f'Gagal membaca hasil preprocessing: {str(e)}'}), 500
+        grouped, info = _halaman_grup_streaming(path_hasil, transaksi, halaman)
+        return jsonify({'dataset_id': entri.id, 'grouped_data': grouped, **info})
+    entri, df, error = _ambil_tahap('processed')
+    if error:
+        return error
+    grouped, info = _halaman_grup(entri.id, df, halaman)
+    return jsonify({'dataset_id': entri.id, 'grouped_data': grouped, **info})
+
+@app.route('/grouped_data/stream', methods=['GET'])
+def grouped_data_stream_route():
+    # Semua transaksi yang dikelompokkan sebagai NDJSON (satu transaksi per baris), ditulis per blok
+    urut = request.args.get('urut', 'id')
+    if urut not in URUTAN:
+        return jsonify({'error': f'urut harus salah satu dari {URUTAN}'}), 400
+    _, df, error = _ambil_tahap('processed')
+    if error:
+        return error
+
+    def hasilkan():
+        for blok in iter_blok_transaksi(df, urut):
+            yield ''.join(json.dumps(baris, default=_json_default) + '\n' for baris in blok.to_dict(orient='records'))
+
+    return Response(stream_with_context(hasilkan()), mimetype='application/x-ndjson')
+
+def siapkan_data_efim(df):
+    # Validasi kolom lalu ambil data transaksi untuk EFIM
+    required_columns = {'ID_PENJUALAN', 'NAMA_BARANG', 'TANGGAL', 'KODE_BARANG', 'UTILITY'}
+    missing_columns = required_columns - set(df.columns)
+
+    if missing_columns:
+        log.warning("Kolom yang diperlukan tidak ditemukan: %s", missing_columns)
+        raise ValueError(f"File harus memiliki kolom: {required_columns}. Kolom yang hilang: {missing_columns}")
+
+    # Ambil data transaksi
+    transaksi_data = df[['ID_PENJUALAN', 'NAMA_BARANG', 'TANGGAL', 'KODE_BARANG', 'UTILITY']]
+    log.info("Data transaksi berhasil disiapkan, jumlah baris: %d", len(transaksi_data))
+    return transaksi_data
+
+def _json_default(nilai):
+    # Serialisasi tipe numpy/pandas yang tidak dikenal json.dumps; tanggal diformat sama seperti jsonify
+    if hasattr(nilai, 'item'):
+        return nilai.item()
+    try:
+        return app.json.default(nilai)
+    except TypeError:
+        return str(nilai)
 
+def _toko_transaksi(kunci, transaksi_data):
+    # Toko transaksi bersama untuk data (kunci: sidik jari isinya); None jika labelnya tidak bisa
+    # dipetakan, EFIM lalu memfaktorisasi DataFrame sendiri
+    try:
+        return direktori_toko.ambil(kunci, transaksi_data)
+    except ValueError as e:
+        log.info("Toko transaksi tidak dipakai: %s", e)
+        return None
+
+def _mode_mining(mode, pulihkan):
+    # Mode 'maksimal' dan 'semua' yang dibangun ulang (pulihkan) diturunkan dari hasil mode 'tertutup'
+    return 'semua' if mode == 'semua' and not pulihkan else 'tertutup'
+
+def _tambang(df, threshold, mesin='utility_list', n_workers=1, k=None, anggaran_waktu=None, anggaran_node=None,
+             mode='semua', pulihkan=False, efim=None):
+    # Itemset dari cache jika ada, selain itu dari EFIM (efim: instance yang sudah disiapkan, mis. milik
+    # job asinkron). Mengembalikan (kunci_cache, hasil_itemset, efim atau None jika dari cache, dihentikan).
+    # Closed HUI di-cache terpisah sebagai (itemset, utilitas, utilitas per item); maximal HUI disaring
+    # darinya dan pulihkan=True membangun ulang semua HUI darinya tanpa mining ulang.
+    log.info("Menjalankan EFIM dengan threshold: %s, mesin: %s, k: %s, mode: %s", threshold, mesin, k, mode)
+    transaksi_data = siapkan_data_efim(df)
+
+    # Cek cache dulu: dataset sama dengan threshold >= threshold yang pernah di-mining cukup disaring
+    kunci_cache = sidik_jari(transaksi_data, ('ID_PENJUALAN', 'KODE_BARANG', 'UTILITY'))
+    mode_mining = _mode_mining(mode, pulihkan)
+    kunci_mode = kunci_cache if mode_mining == 'semua' else f'{kunci_cache}-{mode_mining}'
+    hasil_itemset = cache_efim.ambil(kunci_mode, threshold, k)
+    dihentikan = None
+    metrik.catat_cache(hasil_itemset is not None)
+    if hasil_itemset is not None:
+        log.info("Hasil EFIM diambil dari cache, jumlah itemset: %d", len(hasil_itemset))
+        efim = None
+    else:
         # Panggil algoritma EFIM
-        hasil_itemset = jalankan_algoritma_efim(transaksi_data, threshold)
-        print(f"EFIM berhasil dijalankan, jumlah itemset: {len(hasil_itemset)}")
-        
-        # Format hasil
-        hasil_format = []
-        for itemset, total_utility in hasil_itemset:
-            itemset_list = list(itemset)
-            nama_barang_list = [kode_nama_mapping.get(kode, f'Produk {kode}') for kode in itemset_list]
-
-            rentang_waktu = 0
-            terjual = 0
-            # Hitung rentang waktu dan jumlah terjual
-            for kode in itemset_list:
-                kode_data = df[df['KODE_BARANG'] == kode]
-                if not kode_data.empty:
-                    if 'TANGGAL' in df.columns:
-                        tanggal_data = pd.to_datetime(kode_data['TANGGAL'], errors='coerce')
-                        valid_dates = tanggal_data.dropna()
-                        if len(valid_dates) > 1:
-                            date_range = (valid_dates.max() - valid_dates.min()).days
-                            rentang_waktu = max(rentang_waktu, date_range)
-
-                    if 'QTY' in df.columns:
-                        terjual += kode_data['QTY'].sum()
-
-            hasil_format.append({
-                'kode_barang': itemset_list,
-                'nama_barang': nama_barang_list,
-                'total_utility': total_utility,
-                'rentang_waktu': rentang_waktu,
-                'total_terjual': terjual
-            })
+        if efim is None:
+            efim = EFIM(threshold, mesin=mesin, n_workers=n_workers, k=k,
+                        anggaran_waktu=anggaran_waktu, anggaran_node=anggaran_node, mode=mode_mining)
+        toko_data = _toko_transaksi(kunci_cache, transaksi_data)
+        efim.jalankan(transaksi_data if toko_data is None else toko_data)
+        hasil_itemset = efim.high_utility_itemsets
+        if mode_mining == 'tertutup':
+            hasil_itemset = [(itemset, util, efim.utilitas_unit[tuple(itemset)]) for itemset, util in hasil_itemset]
+        metrik.catat_mining(efim.statistik())
+        log.info("EFIM berhasil dijalankan, jumlah itemset: %d", len(hasil_itemset))
+        # Hasil parsial (dibatalkan / anggaran habis) tidak boleh masuk cache
+        dihentikan = efim.dihentikan
+        if dihentikan is None:
+            batas = threshold if k is None else batas_lengkap_topk(hasil_itemset, k, threshold)
+            cache_efim.simpan(kunci_mode, batas, hasil_itemset)
+
+    if mode == 'maksimal':
+        hasil_itemset = saring_maksimal(hasil_itemset)
+    elif mode_mining != mode:
+        hasil_itemset = pulihkan_hui(hasil_itemset, threshold)
+    return kunci_cache, hasil_itemset, efim, dihentikan
+
+# Kolom yang dibaca IndeksItem; kunci cache indeksnya harus ikut menghitung semuanya (dua dataset dengan
+# transaksi sama tetapi nama/tanggal/qty berbeda tidak boleh berbagi indeks)
+KOLOM_INDEKS = ('ID_PENJUALAN', 'KODE_BARANG', 'UTILITY', 'NAMA_BARANG', 'TANGGAL', 'QTY')
+
+def _indeks_item(df, efim):
+    # IndeksItem dari cache_halaman, dikunci sidik jari semua kolom yang dibacanya
+    kolom = [nama for nama in KOLOM_INDEKS if nama in df.columns]
+    return cache_halaman.ambil(('indeks', sidik_jari(df, kolom)), lambda: IndeksItem(df, efim))
+
+# Fungsi untuk menjalankan EFIM tanpa endpoint terpisah
+def run_efim(df, threshold, mesin='utility_list', n_workers=1, k=None, anggaran_waktu=None, anggaran_node=None,
+             mode='semua', pulihkan=False, efim=None):
+    # efim: instance EFIM yang sudah disiapkan (mis. milik job asinkron); jika None dibuat di sini
+    try:
+        _, hasil_itemset, efim, dihentikan = _tambang(df, threshold, mesin, n_workers, k,
+                                                      anggaran_waktu, anggaran_node, mode, pulihkan, efim)
+        dari_cache = efim is None
+
+        # Statistik per item dihitung sekali (TWU dipakai ulang dari EFIM jika mining dijalankan)
+        mulai = time.perf_counter()
+        indeks = IndeksItem(df, efim)
+        hasil_format = [indeks.format_itemset(entri[0], entri[1]) for entri in hasil_itemset]
+        if mode == 'tertutup':
+            # Utilitas tiap item di tidset closed HUI: cukup untuk menghitung utilitas semua subset-nya
+            for hasil, entri in zip(hasil_format, hasil_itemset):
+                hasil['utilitas_item'] = entri[2]
+        detik_format = time.perf_counter() - mulai
+        metrik.amati('efim_mining_fase_seconds', detik_format, mesin=mesin, fase='format')
+
+        # Instrumentasi mining (waktu & memori per fase, node, join, pruning); None jika dari cache
+        statistik = None
+        if not dari_cache:
+            statistik = efim.statistik()
+            statistik['fase']['format'] = {'detik': detik_format, 'memori': None}
+        twu_per_item = indeks.twu
         total_twu = sum(twu_per_item.values())
         return {
             'message': 'EFIM berhasil dijalankan',
             'itemset_utilitas_tinggi': hasil_format,
             'threshold': threshold,
+            'mesin': mesin,
+            'k': k,
+            'mode': mode,
+            'dari_cache': dari_cache,
+            # None jika pencarian tuntas; selain itu alasan berhenti dan hasilnya parsial
+            'dihentikan': dihentikan,
+            # Pada mode top-K, utilitas itemset ke-K menjadi threshold efektif
+            'threshold_efektif': min((entri[1] for entri in hasil_itemset), default=threshold) if k is not None else threshold,
             'twu_per_item': twu_per_item,
-            'twu': total_twu
+            'twu': total_twu,
+            'statistik': statistik
         }
 
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
-        print(f"EFIM processing error: {error_details}")
+        log.error("EFIM processing error: %s", error_details)
         raise Exception(f"Gagal menjalankan EFIM: {str(e)}")
 
-# Tetap pertahankan endpoint terpisah untuk run_efim sebagai API
-@app.route('/run_efim', methods=['POST'])
-def run_efim_route():
-    global processed_data, uploaded_path
+def _data_dan_parameter_efim(data=None):
+    # Ambil DataFrame dan parameter EFIM dari request /run_efim (atau dari data jika diberikan).
+    # Mengembalikan (df, parameter, None) atau (None, None, respons_error).
+    # Ambil parameter dari request
+    if data is None:
+        data = request.get_json()
+    min_util = data.get('min_util')
+    k = data.get('k')
     
-    # Gunakan data yang sudah diproses jika tersedia
-    if processed_data is not None:
-        df = processed_data.copy()
-        print("Menggunakan data yang sudah diproses dari memori")
-    elif uploaded_path and os.path.exists(uploaded_path):
-        try:
-            print(f"Menjalankan EFIM untuk file: {uploaded_path}")
-            if uploaded_path.endswith('.csv'):
-                df = pd.read_csv(uploaded_path)
-            elif uploaded_path.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_path)
-            else:
-                return jsonify({'error': 'Format file tidak dikenali'}), 400
-        except Exception as e:
-            return jsonify({'error': f'Gagal membaca file: {str(e)}'}), 500
+    if min_util is None and k is None:
+        return None, None, (jsonify({'error': 'Parameter min_util atau k diperlukan'}), 400)
+    if k is not None:
+        k = int(k)
+        if min_util is None:
+            min_util = 0
+    # mode keluaran: 'semua', 'tertutup' (closed HUI) atau 'maksimal' (maximal HUI); pulihkan=True pada
+    # mode 'semua' membangun semua HUI dari closed HUI (yang di-cache) alih-alih mining biasa
+    mode = data.get('mode') or 'semua'
+    pulihkan = bool(data.get('pulihkan', False))
+    if mode not in MODE_HASIL:
+        return None, None, (jsonify({'error': f'Mode tidak dikenal: {mode}. Pilihan: {list(MODE_HASIL)}'}), 400)
+    if _mode_mining(mode, pulihkan) != 'semua' and (k is not None or data.get('mesin', 'utility_list') != 'utility_list'):
+        return None, None, (jsonify({'error': 'Mode tertutup/maksimal dan pulihkan hanya untuk mesin utility_list tanpa k'}), 400)
+        
+    # Jika data sudah disediakan dalam request, gunakan itu; selain itu data dataset (hasil
+    # preprocessing jika ada, jika belum data mentah)
+    if 'data' in data and data['data']:
+        df = pd.DataFrame(data.get('data'))
     else:
-        return jsonify({'error': 'Belum ada file yang diupload atau data yang diproses'}), 400
+        _, df, error = _ambil_tahap('processed', 'raw')
+        if error:
+            return None, None, error
     
+    # Pastikan kolom UTILITY ada (assign: frame di registri tidak ikut berubah)
+    if 'UTILITY' not in df.columns and all(col in df.columns for col in ['QTY', 'HARGASATUAN']):
+        df = df.assign(UTILITY=perkalian_lebar(df['QTY'], df['HARGASATUAN']))
+
+    parameter = {
+        'threshold': min_util,
+        'mesin': data.get('mesin', 'utility_list'),   # 'utility_list' atau 'proyeksi'
+        'n_workers': int(data.get('n_workers', 1)),   # > 1: mining paralel (hasil identik dengan serial)
+        'k': k,
+        # Anggaran opsional: detik wall-clock / jumlah node; jika habis hasil parsial dikembalikan
+        'anggaran_waktu': float(data['anggaran_waktu']) if data.get('anggaran_waktu') is not None else None,
+        'anggaran_node': int(data['anggaran_node']) if data.get('anggaran_node') is not None else None,
+        'mode': mode,
+        'pulihkan': pulihkan,
+    }
+    return df, parameter, None
+
+# Tetap pertahankan endpoint terpisah untuk run_efim sebagai API
+@app.route('/run_efim', methods=['POST'])
+def run_efim_route():
     try:
-        # Ambil parameter dari request
-        data = request.get_json()
-        min_util = data.get('min_util')
-        
-        if min_util is None:
-            return jsonify({'error': 'Parameter min_util diperlukan'}), 400
-            
-        # Jika data sudah disediakan dalam request, gunakan itu
-        if 'data' in data and data['data']:
-            df = pd.DataFrame(data.get('data'))
-        
-        # Pastikan kolom UTILITY ada
-        if 'UTILITY' not in df.columns and all(col in df.columns for col in ['QTY', 'HARGASATUAN']):
-            df['UTILITY'] = df['QTY'] * df['HARGASATUAN']
-        
+        df, parameter, error = _data_dan_parameter_efim()
+        if error:
+            return error
+
         # Jalankan algoritma EFIM
-        result = run_efim(df, min_util)
+        result = run_efim(df, **parameter)
         return jsonify(result), 200
 
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
-        print(f"EFIM route error: {error_details}")
+        log.error("EFIM route error: %s", error_details)
+        return jsonify({'error': f'Gagal menjalankan EFIM: {str(e)}', 'details': error_details}), 500
+
+@app.route('/run_efim/stream', methods=['POST'])
+def run_efim_stream_route():
+    # Versi streaming: itemset dikirim sebagai NDJSON (satu objek JSON per baris) segera setelah
+    # ditemukan, tanpa menampung seluruh hasil di memori server
+    try:
+        df, parameter, error = _data_dan_parameter_efim()
+        if error:
+            return error
+        if parameter['pulihkan']:
+            return jsonify({'error': 'Versi streaming tidak mendukung pulihkan'}), 400
+        transaksi_data = siapkan_data_efim(df)
+        toko_data = _toko_transaksi(sidik_jari(transaksi_data, ('ID_PENJUALAN', 'KODE_BARANG', 'UTILITY')),
+                                    transaksi_data)
+        indeks = IndeksItem(df)
+    except Exception as e:
+        return jsonify({'error': f'Gagal menjalankan EFIM: {str(e)}'}), 500
+
+    efim = EFIM(parameter['threshold'], mesin=parameter['mesin'], k=parameter['k'],
+                anggaran_waktu=parameter['anggaran_waktu'], anggaran_node=parameter['anggaran_node'],
+                mode=parameter['mode'])
+
+    def hasilkan():
+        for itemset, total_utility in efim.iter_itemset(transaksi_data if toko_data is None else toko_data):
+            yield json.dumps(indeks.format_itemset(itemset, total_utility), default=_json_default) + '\n'
+        metrik.catat_mining(efim.statistik())
+
+    return Response(stream_with_context(hasilkan()), mimetype='application/x-ndjson')
+
+@app.route('/run_efim/halaman', methods=['POST'])
+def run_efim_halaman_route():
+    # Versi berhalaman: parameter sama dengan /run_efim ditambah cursor, page_size dan urut
+    # ('utility', 'utility_asc', 'id'). Hasil mining di-cache, jadi halaman berikutnya tidak menambang ulang.
+    try:
+        offset, ukuran, urut = parameter_halaman(request.get_json())
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Parameter halaman tidak valid: {str(e)}'}), 400
+    try:
+        df, parameter, error = _data_dan_parameter_efim()
+        if error:
+            return error
+        kunci_cache, hasil_itemset, efim, dihentikan = _tambang(df, **parameter)
+        if dihentikan is None:
+            # Daftar terurut dan indeks item dipakai ulang oleh halaman-halaman berikutnya
+            terurut = cache_halaman.ambil(('itemset', kunci_cache, parameter['threshold'], parameter['k'],
+                                           parameter['mode'], parameter['pulihkan'], urut),
+                                          lambda: urutkan_itemset(hasil_itemset, urut))
+        else:
+            terurut = urutkan_itemset(hasil_itemset, urut)
+        indeks = _indeks_item(df, efim)
+        return jsonify({
+            'itemset_utilitas_tinggi': [indeks.format_itemset(entri[0], entri[1])
+                                        for entri in terurut[offset:offset + ukuran]],
+            **info_halaman(len(terurut), offset, ukuran, urut),
+            'threshold': parameter['threshold'],
+            'k': parameter['k'],
+            'mode': parameter['mode'],
+            'dari_cache': efim is None,
+            'dihentikan': dihentikan,
+        }), 200
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        log.error("EFIM route error: %s", error_details)
         return jsonify({'error': f'Gagal menjalankan EFIM: {str(e)}', 'details': error_details}), 500
 
+@app.route('/run_efim/sweep', methods=['POST'])
+def run_efim_sweep_route():
+    # Sapuan threshold: body seperti /run_efim dengan 'thresholds' (list) menggantikan min_util.
+    # Mining sekali pada threshold terendah; tiap threshold mendapat jumlah itemset, total utilitas dan
+    # satu halaman itemset (cursor, page_size, urut; 'itemset': false untuk melewatinya), ditambah
+    # histogram utilitas (jumlah_bin) untuk kurva jumlah itemset terhadap threshold.
+    data = request.get_json() or {}
+    try:
+        thresholds = [t if isinstance(t, (int, float)) and not isinstance(t, bool) else float(t)
+                      for t in data.get('thresholds') or []]
+        offset, ukuran, urut = parameter_halaman(data)
+        jumlah_bin = int(data.get('jumlah_bin', JUMLAH_BIN))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Parameter sapuan tidak valid: {str(e)}'}), 400
+    if not thresholds:
+        return jsonify({'error': 'Parameter thresholds (list) diperlukan'}), 400
+    if data.get('k') is not None:
+        return jsonify({'error': 'Sapuan threshold tidak mendukung mode top-K'}), 400
+    if (data.get('mode') or 'semua') != 'semua' or data.get('pulihkan'):
+        return jsonify({'error': 'Sapuan threshold hanya untuk mode semua'}), 400
+    try:
+        df, parameter, error = _data_dan_parameter_efim({**data, 'min_util': min(thresholds)})
+        if error:
+            return error
+        kunci_cache, hasil_itemset, efim, dihentikan = _tambang(df, **parameter)
+        if dihentikan is None:
+            sapuan = cache_halaman.ambil(('sapuan', kunci_cache, parameter['threshold']),
+                                         lambda: SapuanThreshold(hasil_itemset))
+        else:
+            sapuan = SapuanThreshold(hasil_itemset)
+        indeks = _indeks_item(df, efim)
+
+        hasil = []
+        for threshold in thresholds:
+            ringkasan = sapuan.ringkasan(threshold)
+            if data.get('itemset', True):
+                ringkasan['itemset_utilitas_tinggi'] = [
+                    indeks.format_itemset(itemset, total_utility)
+                    for itemset, total_utility in sapuan.itemset(threshold, offset, ukuran, urut)]
+                ringkasan['halaman'] = info_halaman(ringkasan['jumlah_itemset'], offset, ukuran, urut)
+            hasil.append(ringkasan)
+        return jsonify({
+            'threshold_mining': parameter['threshold'],
+            'mesin': parameter['mesin'],
+            'dari_cache': efim is None,
+            'dihentikan': dihentikan,
+            'sapuan': hasil,
+            'histogram': sapuan.histogram(jumlah_bin),
+        }), 200
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        log.error("EFIM route error: %s", error_details)
+        return jsonify({'error': f'Gagal menjalankan sapuan EFIM: {str(e)}', 'details': error_details}), 500
+
+def kirim_job_efim(df, threshold, mesin='utility_list', k=None, anggaran_waktu=None, anggaran_node=None,
+                   mode='semua', pulihkan=False):
+    # Jalankan run_efim di pool job; EFIM dibuat di sini agar progresnya bisa dipantau sejak awal.
+    # Job selalu bisa dibatalkan sehingga pencariannya serial (flag batal hanya berlaku di proses ini).
+    efim = EFIM(threshold, mesin=mesin, n_workers=1, k=k,
+                anggaran_waktu=anggaran_waktu, anggaran_node=anggaran_node, mode=_mode_mining(mode, pulihkan))
+    return pengelola_job.kirim(lambda efim: run_efim(df, threshold, mesin, 1, k, mode=mode, pulihkan=pulihkan,
+                                                      efim=efim), efim)
+
+@app.route('/jobs', methods=['POST'])
+def kirim_job_route():
+    # Parameter sama dengan /run_efim kecuali n_workers; respons langsung berisi job_id untuk dipantau
+    # di /jobs/<id>
+    try:
+        df, parameter, error = _data_dan_parameter_efim()
+        if error:
+            return error
+        if parameter.pop('n_workers') != 1:
+            return jsonify({'error': 'Job asinkron dijalankan serial agar bisa dibatalkan; n_workers selain 1 '
+                                     'hanya didukung di /run_efim'}), 400
+        job = kirim_job_efim(df, **parameter)
+        return jsonify({'job_id': job.id, 'status': job.status}), 202
+    except Exception as e:
+        return jsonify({'error': f'Gagal mengirim job EFIM: {str(e)}'}), 500
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def status_job_route(job_id):
+    # Status, progres (node dijelajahi, itemset ditemukan, kedalaman) dan hasil jika sudah selesai
+    job = pengelola_job.ambil(job_id)
+    if job is None:
+        return jsonify({'error': f'Job tidak ditemukan: {job_id}'}), 404
+    return Response(json.dumps(job.ringkasan(), default=_json_default), mimetype='application/json')
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def batalkan_job_route(job_id):
+    # Pembatalan: job yang sedang berjalan berhenti dengan hasil parsial sejauh ini
+    job = pengelola_job.batalkan(job_id)
+    if job is None:
+        return jsonify({'error': f'Job tidak ditemukan: {job_id}'}), 404
+    return jsonify({'job_id': job.id, 'status': job.status}), 200
+
+@app.route('/run_efim/jendela', methods=['POST'])
+def run_efim_jendela_route():
+    # Mining per jendela waktu atas TANGGAL ('harian', 'mingguan', 'bulanan' atau 'geser' selebar
+    # lebar_hari yang maju setiap langkah_hari). Struktur EFIM dipakai ulang antar jendela.
+    try:
+        df, parameter, error = _data_dan_parameter_efim()
+        if error:
+            return error
+        if parameter['k'] is not None:
+            return jsonify({'error': 'Mode jendela waktu tidak mendukung parameter k'}), 400
+        if parameter['mode'] != 'semua' or parameter['pulihkan']:
+            return jsonify({'error': 'Mode jendela waktu hanya untuk mode semua'}), 400
+        data = request.get_json()
+        jenis = data.get('jenis', 'harian')
+        if jenis not in JENIS_JENDELA:
+            return jsonify({'error': f'Jenis jendela tidak dikenal: {jenis}. Pilihan: {list(JENIS_JENDELA)}'}), 400
+        transaksi_data = siapkan_data_efim(df)
+        indeks = IndeksItem(df)
+
+        jendela = []
+        for hasil in tambang_per_jendela(transaksi_data, parameter['threshold'], jenis,
+                                         lebar_hari=int(data.get('lebar_hari', 7)),
+                                         langkah_hari=int(data.get('langkah_hari', 1))):
+            jendela.append({
+                'awal': hasil['awal'].strftime('%Y-%m-%d'),
+                'akhir': hasil['akhir'].strftime('%Y-%m-%d'),
+                'jumlah_transaksi': hasil['jumlah_transaksi'],
+                'itemset_utilitas_tinggi': [indeks.format_itemset(itemset, total_utility)
+                                            for itemset, total_utility in hasil['itemset']],
+            })
+        return jsonify({
+            'message': 'EFIM per jendela waktu berhasil dijalankan',
+            'threshold': parameter['threshold'],
+            'jenis': jenis,
+            'jendela': jendela
+        }), 200
+
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        log.error("EFIM jendela route error: %s", error_details)
+        return jsonify({'error': f'Gagal menjalankan EFIM per jendela: {str(e)}', 'details': error_details}), 500
+
 # TAMBAHKAN ENDPOINT BARU UNTUK MELIHAT STATUS DATA BERBEDA
 @app.route('/get_data_status', methods=['GET'])
 def get_data_status():
-    # Endpoint untuk mendapatkan informasi tentang status data
-    global raw_data, cleaned_data, processed_data
+    # Endpoint untuk mendapatkan informasi tentang status data per dataset_id
+    dataset_id = _dataset_id()
+    if not dataset_id and not registri.pakai_terakhir:
+        return _tanpa_dataset_id()
+    entri = registri.ambil(dataset_id)
+    tersedia = entri.ringkasan()['tahap'] if entri is not None else {}
     
     status = {
-        'raw_data': raw_data is not None,
-        'cleaned_data': cleaned_data is not None,
-        'processed_data': processed_data is not None
+        'dataset_id': entri.id if entri is not None else None,
+        'raw_data': tersedia.get('raw', False),
+        'cleaned_data': tersedia.get('cleaned', False),
+        'processed_data': tersedia.get('processed', False),
+        'memori_registri': registri.memori_terpakai,
+        'jumlah_dataset': len(registri)
     }
     
     return jsonify(status)
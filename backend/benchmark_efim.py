@@ -0,0 +1,259 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from efim import EFIM
+from indeks_item import IndeksItem
+from tipe_ringkas import ringkas_tipe, turunkan_numerik, perkalian_lebar
+
+# Benchmark EFIM atas data ritel sintetis. Generator ber-seed menghasilkan skema yang sama dengan data
+# upload (ID_PENJUALAN, TANGGAL, KODE_BARANG, NAMA_BARANG, QTY, HARGASATUAN): popularitas item mengikuti
+# distribusi Zipf, ukuran keranjang ~ 1 + Poisson, harga per item log-normal. Tiap fase EFIM.jalankan
+# diukur dengan membungkus method instance (jalur kode yang diukur sama dengan produksi), ditambah fase
+# format seperti run_efim. Waktu diambil minimum dari beberapa ulangan; memori puncak per fase diukur
+# pada lintasan terpisah dengan tracemalloc karena tracemalloc memperlambat alokasi.
+# Hasil dibandingkan dengan baseline JSON untuk mendeteksi regresi waktu, memori dan jumlah itemset.
+#
+#   python benchmark_efim.py                          # semua skenario bawaan, bandingkan dengan baseline
+#   python benchmark_efim.py --skenario kecil --ulang 5
+#   python benchmark_efim.py --simpan-baseline         # tulis ulang baseline dari mesin ini
+
+FASE = ('muat_data', 'hitung_TWU', 'database_terpangkas', 'hitung_EUCS', 'buat_utility_list', 'rekursi', 'format')
+# Method EFIM yang dibungkus; sisa waktu jalankan dihitung sebagai fase 'rekursi'
+FASE_METHOD = ('muat_data', 'hitung_TWU', 'database_terpangkas', 'hitung_EUCS', 'buat_utility_list')
+
+# threshold_relatif: min_util sebagai pecahan total utilitas dataset, agar skenario sebanding antar ukuran
+SKENARIO = {
+    'kecil': {'jumlah_baris': 20_000, 'jumlah_item': 500, 'rata_keranjang': 4, 'threshold_relatif': 0.002},
+    'sedang': {'jumlah_baris': 100_000, 'jumlah_item': 2_000, 'rata_keranjang': 5, 'threshold_relatif': 0.001},
+    'keranjang_besar': {'jumlah_baris': 100_000, 'jumlah_item': 1_000, 'rata_keranjang': 12, 'threshold_relatif': 0.002},
+}
+
+BERKAS_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+# Regresi: lebih lambat dari baseline * (1 + toleransi) DAN lebih dari MIN_SELISIH_DETIK (fase sangat
+# singkat didominasi derau)
+TOLERANSI_WAKTU = 0.25
+TOLERANSI_MEMORI = 0.10
+MIN_SELISIH_DETIK = 0.02
+
+
+def buat_data_retail(jumlah_baris, jumlah_item=1000, rata_keranjang=4, eksponen_zipf=1.1, seed=0,
+                     tanggal_awal='2024-01-01', jumlah_hari=365):
+    # DataFrame transaksi ritel sintetis dengan jumlah_baris baris (satu baris per item unik per
+    # transaksi). Seed yang sama selalu menghasilkan data yang sama.
+    rng = np.random.default_rng(seed)
+    bobot = 1.0 / np.arange(1, jumlah_item + 1) ** eksponen_zipf
+    bobot /= bobot.sum()
+
+    # Transaksi dibuat berlebih karena item ganda dalam keranjang digabung, lalu dipotong tepat jumlah_baris
+    jumlah_transaksi = max(1, int(np.ceil(1.5 * jumlah_baris / rata_keranjang)))
+    ukuran = 1 + rng.poisson(max(rata_keranjang - 1, 0), jumlah_transaksi)
+    tid = np.repeat(np.arange(jumlah_transaksi, dtype=np.int64), ukuran)
+    item = rng.choice(jumlah_item, size=len(tid), p=bobot)
+    # Item yang sama dua kali dalam satu keranjang digabung menjadi satu baris
+    kunci = np.unique(tid * jumlah_item + item)[:jumlah_baris]
+    tid, item = kunci // jumlah_item, kunci % jumlah_item
+
+    harga = np.round(rng.lognormal(np.log(15_000), 0.8, jumlah_item), -2).clip(500)
+    detik = np.sort(rng.integers(0, jumlah_hari * 86_400, jumlah_transaksi))
+    kode = np.array([f'{i:07d}' for i in range(jumlah_item)], dtype=object)
+    return pd.DataFrame({
+        'ID_PENJUALAN': tid + 1,
+        'TANGGAL': pd.Timestamp(tanggal_awal) + pd.to_timedelta(detik[tid], unit='s'),
+        'KODE_BARANG': kode[item],
+        'NAMA_BARANG': np.array([f'Produk {k}' for k in kode], dtype=object)[item],
+        'QTY': (1 + rng.poisson(0.4, len(tid))).astype(np.float64),
+        'HARGASATUAN': harga[item],
+    })
+
+
+def siapkan_frame(df):
+    # Bentuk frame seperti di registri setelah preprocessing: tipe ringkas + kolom UTILITY
+    df = ringkas_tipe(df)
+    return df.assign(UTILITY=turunkan_numerik(perkalian_lebar(df['QTY'], df['HARGASATUAN'])))
+
+
+def _ukur_sekali(df, min_util, mesin='utility_list', memori=False):
+    # Satu run EFIM.jalankan + format; mengembalikan (waktu per fase, memori puncak per fase, jumlah itemset)
+    efim = EFIM(min_util, mesin=mesin)
+    waktu = dict.fromkeys(FASE, 0.0)
+    puncak = dict.fromkeys(FASE, 0)
+    # Memori terpakai saat peak terakhir di-reset (dasar untuk puncak fase berikutnya)
+    dasar = [tracemalloc.get_traced_memory()[0] if memori else 0]
+
+    def catat(nama, mulai):
+        waktu[nama] += time.perf_counter() - mulai
+        if memori:
+            sekarang, tertinggi = tracemalloc.get_traced_memory()
+            puncak[nama] = max(puncak[nama], tertinggi - dasar[0])
+            tracemalloc.reset_peak()
+            dasar[0] = sekarang
+
+    def bungkus(nama):
+        asli = getattr(efim, nama)
+
+        def terukur(*args, **kwargs):
+            if memori:
+                tracemalloc.reset_peak()
+                dasar[0] = tracemalloc.get_traced_memory()[0]
+            mulai = time.perf_counter()
+            try:
+                return asli(*args, **kwargs)
+            finally:
+                catat(nama, mulai)
+        setattr(efim, nama, terukur)
+
+    for nama in FASE_METHOD:
+        bungkus(nama)
+    transaksi = df[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+    # EFIM mencatat lewat logger 'efim'; selama run levelnya WARNING seperti bawaan produksi
+    # (EFIM_LOG_LEVEL), agar log DEBUG/INFO proses pemanggil tidak ikut terukur
+    logger, level = logging.getLogger('efim'), logging.getLogger('efim').level
+    logger.setLevel(logging.WARNING)
+    try:
+        mulai = time.perf_counter()
+        efim.jalankan(transaksi)
+        total = time.perf_counter() - mulai
+    finally:
+        logger.setLevel(level)
+    if memori:
+        puncak['rekursi'] = max(puncak['rekursi'], tracemalloc.get_traced_memory()[1] - dasar[0])
+        tracemalloc.reset_peak()
+        dasar[0] = tracemalloc.get_traced_memory()[0]
+    waktu['rekursi'] = max(total - sum(waktu[nama] for nama in FASE_METHOD), 0.0)
+
+    # Fase format: sama dengan run_efim (indeks statistik item + format tiap itemset)
+    mulai = time.perf_counter()
+    indeks = IndeksItem(df, efim)
+    hasil = [indeks.format_itemset(itemset, util) for itemset, util in efim.high_utility_itemsets]
+    catat('format', mulai)
+    return waktu, puncak, len(hasil)
+
+
+def jalankan_skenario(nama, jumlah_baris, jumlah_item, rata_keranjang, threshold_relatif, seed=0,
+                      eksponen_zipf=1.1, mesin='utility_list', ulang=3, memori=True):
+    # Ringkasan satu skenario: parameter, min_util, waktu minimum per fase dari `ulang` run, memori puncak
+    df = siapkan_frame(buat_data_retail(jumlah_baris, jumlah_item, rata_keranjang, eksponen_zipf, seed))
+    min_util = float(df['UTILITY'].sum()) * threshold_relatif
+    waktu = {fase: float('inf') for fase in FASE}
+    total = float('inf')
+    jumlah_itemset = None
+    for _ in range(max(1, ulang)):
+        waktu_run, _, jumlah_itemset = _ukur_sekali(df, min_util, mesin)
+        for fase in FASE:
+            waktu[fase] = min(waktu[fase], waktu_run[fase])
+        total = min(total, sum(waktu_run.values()))
+
+    puncak = dict.fromkeys(FASE, 0)
+    if memori:
+        tracemalloc.start()
+        try:
+            _, puncak, _ = _ukur_sekali(df, min_util, mesin, memori=True)
+        finally:
+            tracemalloc.stop()
+    return {
+        'skenario': nama,
+        'parameter': {'jumlah_baris': jumlah_baris, 'jumlah_item': jumlah_item, 'rata_keranjang': rata_keranjang,
+                      'threshold_relatif': threshold_relatif, 'seed': seed, 'eksponen_zipf': eksponen_zipf,
+                      'mesin': mesin},
+        'jumlah_baris': len(df),
+        'jumlah_transaksi': int(df['ID_PENJUALAN'].nunique()),
+        'min_util': min_util,
+        'jumlah_itemset': jumlah_itemset,
+        'waktu': waktu,
+        'waktu_total': total,
+        'memori_puncak': puncak,
+        'memori_puncak_maks': max(puncak.values()),
+    }
+
+
+def bandingkan(hasil, baseline, toleransi_waktu=TOLERANSI_WAKTU, toleransi_memori=TOLERANSI_MEMORI,
+               min_selisih=MIN_SELISIH_DETIK):
+    # Daftar pesan regresi hasil (dict nama -> ringkasan) terhadap baseline; skenario tanpa baseline dilewati
+    regresi = []
+    for nama, baru in hasil.items():
+        lama = baseline.get(nama)
+        if lama is None:
+            continue
+        if lama['parameter'] != baru['parameter']:
+            regresi.append(f"{nama}: parameter berbeda dari baseline, simpan ulang baseline")
+            continue
+        if lama['jumlah_itemset'] != baru['jumlah_itemset']:
+            regresi.append(f"{nama}: jumlah itemset {lama['jumlah_itemset']} -> {baru['jumlah_itemset']}")
+        for fase in FASE:
+            a, b = lama['waktu'].get(fase, 0.0), baru['waktu'][fase]
+            if b > a * (1 + toleransi_waktu) and b - a > min_selisih:
+                regresi.append(f"{nama}: waktu {fase} {a:.3f}s -> {b:.3f}s (+{(b / a - 1) * 100 if a else float('inf'):.0f}%)")
+        a, b = lama.get('memori_puncak_maks', 0), baru['memori_puncak_maks']
+        if a and b > a * (1 + toleransi_memori):
+            regresi.append(f"{nama}: memori puncak {a / 2**20:.1f} MiB -> {b / 2**20:.1f} MiB")
+    return regresi
+
+
+def baca_baseline(path=BERKAS_BASELINE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as berkas:
+        return json.load(berkas)
+
+
+def simpan_baseline(hasil, path=BERKAS_BASELINE):
+    # Gabung dengan baseline yang ada (skenario yang tidak dijalankan tetap disimpan)
+    baseline = baca_baseline(path)
+    baseline.update(hasil)
+    sementara = path + '.tmp'
+    with open(sementara, 'w') as berkas:
+        json.dump(baseline, berkas, indent=2, sort_keys=True)
+        berkas.write('\n')
+    os.replace(sementara, path)
+
+
+def cetak(ringkasan):
+    print(f"\n== {ringkasan['skenario']}: {ringkasan['jumlah_baris']} baris, {ringkasan['jumlah_transaksi']} transaksi, "
+          f"min_util {ringkasan['min_util']:.0f}, {ringkasan['jumlah_itemset']} itemset")
+    for fase in FASE:
+        print(f"   {fase:<20} {ringkasan['waktu'][fase]:8.3f}s  {ringkasan['memori_puncak'][fase] / 2**20:8.1f} MiB")
+    print(f"   {'total':<20} {ringkasan['waktu_total']:8.3f}s  {ringkasan['memori_puncak_maks'] / 2**20:8.1f} MiB (puncak)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark EFIM dengan data ritel sintetis')
+    parser.add_argument('--skenario', nargs='*', default=list(SKENARIO), help=f'Pilihan: {list(SKENARIO)}')
+    parser.add_argument('--ulang', type=int, default=3, help='Jumlah run per skenario (waktu minimum dipakai)')
+    parser.add_argument('--mesin', default='utility_list')
+    parser.add_argument('--tanpa-memori', action='store_true', help='Lewati lintasan tracemalloc')
+    parser.add_argument('--baseline', default=BERKAS_BASELINE)
+    parser.add_argument('--simpan-baseline', action='store_true')
+    parser.add_argument('--toleransi', type=float, default=TOLERANSI_WAKTU)
+    args = parser.parse_args(argv)
+
+    hasil = {}
+    for nama in args.skenario:
+        if nama not in SKENARIO:
+            parser.error(f'Skenario tidak dikenal: {nama}')
+        hasil[nama] = jalankan_skenario(nama, **SKENARIO[nama], mesin=args.mesin, ulang=args.ulang,
+                                        memori=not args.tanpa_memori)
+        cetak(hasil[nama])
+
+    if args.simpan_baseline:
+        simpan_baseline(hasil, args.baseline)
+        print(f"\nBaseline disimpan ke {args.baseline}")
+        return 0
+    baseline = baca_baseline(args.baseline)
+    if not baseline:
+        print("\nBaseline belum ada; jalankan dengan --simpan-baseline")
+        return 0
+    regresi = bandingkan(hasil, baseline, toleransi_waktu=args.toleransi)
+    for pesan in regresi:
+        print(f"REGRESI {pesan}")
+    print("\nTidak ada regresi terhadap baseline" if not regresi else f"\n{len(regresi)} regresi ditemukan")
+    return 1 if regresi else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import numpy as np
+
+# Tidset per item dalam bentuk bitmap (1 bit per transaksi database terpangkas). Pada mesin utility
+# list, tid gabungan Px dan Py = tid(Px) ∩ tid(y), sehingga keanggotaan tid Px di Py cukup dicek ke
+# bitmap item y (satu gather + shift per tid) tanpa searchsorted ke utility list Py.
+# Sebelum join, ukuran irisan |tid(Px) ∩ tid(y)| dihitung dengan AND + popcount atas rentang byte
+# yang dicakup tid(Px) untuk semua kandidat sekaligus; kandidat yang irisannya terlalu kecil tidak
+# pernah di-join.
+
+# Batas memori seluruh bitmap; di atas ini join kembali memakai searchsorted atas tid terurut
+BATAS_BYTE_BITMAP = 64 << 20
+# Batas byte per blok kandidat saat menghitung ukuran irisan
+UKURAN_BLOK_IRISAN = 1 << 20
+# Popcount per byte (np.bitwise_count baru ada di NumPy 2)
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bit):
+    return np.bitwise_count(bit) if hasattr(np, 'bitwise_count') else _POPCOUNT[bit]
+
+
+class BitmapTid:
+    __slots__ = ('bit', 'jumlah_transaksi')
+
+    def __init__(self, bit, jumlah_transaksi):
+        self.bit = bit                        # uint8 (jumlah item, ceil(jumlah_transaksi / 8))
+        self.jumlah_transaksi = jumlah_transaksi
+
+    @classmethod
+    def dari_pasangan(cls, items, tids, jumlah_item, jumlah_transaksi, batas_byte=None):
+        # Bitmap dari pasangan (item, tid); None jika melebihi batas_byte (default BATAS_BYTE_BITMAP)
+        lebar = (jumlah_transaksi + 7) // 8
+        if jumlah_item * lebar > (BATAS_BYTE_BITMAP if batas_byte is None else batas_byte):
+            return None
+        bit = np.zeros(jumlah_item * lebar, dtype=np.uint8)
+        tids = np.asarray(tids, dtype=np.int64)
+        np.bitwise_or.at(bit, np.asarray(items, dtype=np.int64) * lebar + (tids >> 3),
+                         np.left_shift(1, tids & 7).astype(np.uint8))
+        return cls(bit.reshape(jumlah_item, lebar), jumlah_transaksi)
+
+    def anggota(self, item, tids):
+        # Mask bool: tid mana yang memuat item
+        return ((self.bit[item, tids >> 3] >> (tids & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def jumlah_irisan(self, items, tids):
+        # |tids ∩ tid(item)| untuk tiap item: bitmap tids (tid terurut naik) di-AND dengan baris bitmap
+        # item pada rentang byte yang dicakup tids, lalu popcount. Kandidat diproses per blok agar
+        # memori sementara dibatasi UKURAN_BLOK_IRISAN.
+        items = np.asarray(items, dtype=np.int64)
+        jumlah = np.zeros(len(items), dtype=np.int64)
+        if not len(tids) or not len(items):
+            return jumlah
+        awal, akhir = int(tids[0]) >> 3, (int(tids[-1]) >> 3) + 1
+        bit_tids = np.zeros(akhir - awal, dtype=np.uint8)
+        np.bitwise_or.at(bit_tids, (tids >> 3) - awal, np.left_shift(1, tids & 7).astype(np.uint8))
+        per_blok = max(1, UKURAN_BLOK_IRISAN // (akhir - awal))
+        for a in range(0, len(items), per_blok):
+            irisan = self.bit[items[a:a + per_blok], awal:akhir] & bit_tids
+            jumlah[a:a + per_blok] = popcount(irisan).sum(axis=1, dtype=np.int64)
+        return jumlah
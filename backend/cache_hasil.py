@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Cache hasil EFIM per dataset. Kuncinya sidik jari isi kolom transaksi + mapping kolom, sehingga
+# dataset yang sama (walau diupload ulang) langsung dikenali. Memanfaatkan monotonisitas threshold:
+# hasil untuk threshold T memuat semua itemset dengan utilitas >= T, jadi permintaan dengan
+# threshold >= T cukup dijawab dengan menyaring hasil tersebut tanpa mining ulang.
+# Persistensi disk berupa JSON (bukan pickle, berkas cache tidak bisa menjalankan kode saat dibaca) dan
+# dibatasi jumlah entri + total byte; entri paling lama tidak dipakai (mtime, disentuh saat dibaca) dihapus.
+
+log = logging.getLogger('efim.cache')
+
+
+def sidik_jari(df, kolom):
+    # Hash isi kolom (urutan baris ikut dihitung) + nama kolom; dihitung vektor oleh pandas
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(tuple(kolom)).encode())
+    h.update(pd.util.hash_pandas_object(df[list(kolom)], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def batas_lengkap_topk(itemsets, k, threshold):
+    # Hasil top-K lengkap untuk utilitas > utilitas ke-K (itemset seri di posisi K bisa terpotong).
+    # Jika hasil kurang dari K, seluruh itemset >= threshold sudah ada di hasil.
+    if len(itemsets) < k:
+        return threshold
+    return float(np.nextafter(min(util for _, util in itemsets), np.inf))
+
+
+class CacheHasil:
+    def __init__(self, maks_entri=8, maks_itemset=2_000_000, direktori=None, maks_entri_disk=64,
+                 maks_byte_disk=512 << 20):
+        self.maks_entri = maks_entri        # jumlah dataset yang disimpan di memori
+        self.maks_itemset = maks_itemset    # total itemset di memori (batas ukuran)
+        self.direktori = direktori          # None: tanpa persistensi ke disk
+        self.maks_entri_disk = maks_entri_disk  # jumlah berkas cache di direktori (None: tanpa batas)
+        self.maks_byte_disk = maks_byte_disk    # total byte berkas cache di direktori (None: tanpa batas)
+        self._entri = OrderedDict()         # kunci -> (threshold, itemsets), urut LRU
+        self._jumlah_itemset = 0
+        self._kunci = threading.Lock()
+        if direktori and not os.path.exists(direktori):
+            os.makedirs(direktori)
+
+    def __len__(self):
+        return len(self._entri)
+
+    def _berkas(self, kunci):
+        return os.path.join(self.direktori, f'efim_{kunci}.json')
+
+    def _baca_disk(self, kunci):
+        if not self.direktori or not os.path.exists(self._berkas(kunci)):
+            return None
+        try:
+            with open(self._berkas(kunci), encoding='utf-8') as berkas:
+                isi = json.load(berkas)
+            # Sentuh mtime: jam LRU untuk rapikan_disk
+            os.utime(self._berkas(kunci))
+        except (OSError, ValueError) as e:
+            log.warning("Cache EFIM di disk tidak bisa dibaca: %s", e)
+            return None
+        # JSON menyimpan tuple sebagai list; entri dikembalikan ke bentuk tuple seperti hasil EFIM
+        return isi['threshold'], [tuple(entri) for entri in isi['itemsets']]
+
+    def _tulis_disk(self, kunci, threshold, itemsets):
+        # Tulis ke berkas sementara lalu rename agar berkas cache tidak pernah setengah jadi
+        sementara = self._berkas(kunci) + '.tmp'
+        with open(sementara, 'w', encoding='utf-8') as berkas:
+            json.dump({'threshold': threshold, 'itemsets': itemsets}, berkas, separators=(',', ':'))
+        os.replace(sementara, self._berkas(kunci))
+        self.rapikan_disk()
+
+    def rapikan_disk(self):
+        # Hapus berkas cache paling lama tidak dipakai sampai jumlah <= maks_entri_disk dan
+        # total byte <= maks_byte_disk. Mengembalikan kunci yang dihapus.
+        if not self.direktori or (self.maks_entri_disk is None and self.maks_byte_disk is None):
+            return []
+        berkas = []
+        for nama in os.listdir(self.direktori):
+            if not (nama.startswith('efim_') and nama.endswith('.json')):
+                continue
+            path = os.path.join(self.direktori, nama)
+            try:
+                berkas.append((os.path.getmtime(path), nama[len('efim_'):-len('.json')], os.path.getsize(path)))
+            except FileNotFoundError:
+                continue
+        jumlah, total = len(berkas), sum(ukuran for _, _, ukuran in berkas)
+        dihapus = []
+        for _, kunci, ukuran in sorted(berkas):
+            if ((self.maks_entri_disk is None or jumlah <= self.maks_entri_disk)
+                    and (self.maks_byte_disk is None or total <= self.maks_byte_disk)):
+                break
+            try:
+                os.remove(self._berkas(kunci))
+            except FileNotFoundError:
+                pass
+            jumlah -= 1
+            total -= ukuran
+            dihapus.append(kunci)
+        if dihapus:
+            log.info("Cache EFIM di disk dirapikan, %d berkas dihapus", len(dihapus))
+        return dihapus
+
+    def _pasang(self, kunci, threshold, itemsets):
+        # Simpan ke memori lalu buang entri yang paling lama tidak dipakai sampai muat di batas
+        lama = self._entri.pop(kunci, None)
+        if lama is not None:
+            self._jumlah_itemset -= len(lama[1])
+        if len(itemsets) > self.maks_itemset:
+            return
+        self._entri[kunci] = (threshold, itemsets)
+        self._jumlah_itemset += len(itemsets)
+        while len(self._entri) > self.maks_entri or self._jumlah_itemset > self.maks_itemset:
+            _, (_, dibuang) = self._entri.popitem(last=False)
+            self._jumlah_itemset -= len(dibuang)
+
+    def ambil(self, kunci, threshold, k=None):
+        # Mengembalikan list (itemset, utilitas) atau None jika harus mining. Entri boleh membawa data
+        # tambahan setelah utilitas (mis. utilitas per item closed HUI); tuple dikembalikan utuh.
+        # Tanpa k: semua itemset >= threshold (urutan mengikuti hasil yang di-cache).
+        # Dengan k: K itemset terbaik >= threshold, terurut utilitas turun seperti hasil mode top-K.
+        with self._kunci:
+            entri = self._entri.get(kunci)
+            if entri is None:
+                entri = self._baca_disk(kunci)
+                if entri is None:
+                    return None
+                self._pasang(kunci, *entri)
+            else:
+                self._entri.move_to_end(kunci)
+        batas, itemsets = entri
+
+        terpilih = [entri for entri in itemsets if entri[1] >= threshold]
+        if k is None:
+            return terpilih if threshold >= batas else None
+        terpilih.sort(key=lambda x: x[1], reverse=True)
+        terpilih = terpilih[:k]
+        # Valid jika cache lengkap di threshold tsb, atau K itemset teratas semuanya di atas batas cache
+        if threshold >= batas or (len(terpilih) == k and terpilih[-1][1] >= batas):
+            return terpilih
+        return None
+
+    def simpan(self, kunci, threshold, itemsets):
+        # itemsets harus memuat SEMUA itemset dengan utilitas >= threshold.
+        # Entri dengan threshold lebih rendah mencakup yang lebih tinggi, jadi hanya itu yang disimpan.
+        with self._kunci:
+            entri = self._entri.get(kunci) or self._baca_disk(kunci)
+            if entri is not None and entri[0] <= threshold:
+                return
+            self._pasang(kunci, threshold, itemsets)
+            if self.direktori:
+                self._tulis_disk(kunci, threshold, itemsets)
+
+    def kosongkan(self):
+        with self._kunci:
+            self._entri.clear()
+            self._jumlah_itemset = 0
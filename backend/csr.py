@@ -0,0 +1,150 @@
+import numpy as np
+
+# Konstanta untuk hashing baris transaksi (dipakai saat transaction merging)
+_PENGALI_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+def dtype_utilitas(nilai):
+    # Utilitas integer tetap int64, selain itu float64
+    nilai = np.asarray(nilai)
+    if nilai.dtype.kind in 'iub':
+        return np.int64
+    return np.float64
+
+
+def indeks_baris(offset):
+    # Nomor baris (transaksi) untuk setiap posisi di array CSR
+    panjang = np.diff(offset)
+    return np.repeat(np.arange(len(panjang), dtype=np.int64), panjang)
+
+
+def posisi_relatif(offset):
+    # Posisi setiap elemen relatif terhadap awal barisnya
+    panjang = np.diff(offset)
+    return np.arange(offset[-1], dtype=np.int64) - np.repeat(offset[:-1], panjang)
+
+
+def gabung_transaksi_identik(offset, items, utils, dtype):
+    # Transaction merging: transaksi dengan itemset identik digabung, utilitas per item dijumlahkan.
+    # Input berupa CSR (offset, items, utils) dengan item di tiap baris terurut naik dan tanpa baris kosong.
+    # Mengembalikan CSR baru dan array grup (baris lama -> baris baru).
+    n = len(offset) - 1
+    if n == 0:
+        return offset, items, utils, np.zeros(0, dtype=np.int64)
+    panjang = np.diff(offset)
+
+    # Hash per baris = jumlah hash item (urutan item di baris sudah tetap)
+    h = (items.astype(np.uint64) + np.uint64(1)) * _PENGALI_HASH
+    h ^= h >> np.uint64(29)
+    hash_baris = np.add.reduceat(h, offset[:-1])
+
+    urut = np.lexsort((hash_baris, panjang))
+    hash_urut, panjang_urut = hash_baris[urut], panjang[urut]
+    beda = np.ones(n, dtype=bool)
+    beda[1:] = (hash_urut[1:] != hash_urut[:-1]) | (panjang_urut[1:] != panjang_urut[:-1])
+    pemimpin_urut = urut[np.maximum.accumulate(np.where(beda, np.arange(n), 0))]
+    pemimpin = np.empty(n, dtype=np.int64)
+    pemimpin[urut] = pemimpin_urut
+
+    # Verifikasi isi baris terhadap pemimpin grupnya (menghindari tabrakan hash)
+    baris = indeks_baris(offset)
+    relatif = posisi_relatif(offset)
+    sama = items == items[offset[pemimpin[baris]] + relatif]
+    tidak_cocok = np.zeros(n, dtype=bool)
+    np.logical_or.at(tidak_cocok, baris[~sama], True)
+    pemimpin[tidak_cocok] = np.arange(n)[tidak_cocok]
+
+    # Baris baru diurutkan mengikuti kemunculan pertama pemimpin
+    pemimpin_unik, grup = np.unique(pemimpin, return_inverse=True)
+    offset_baru = np.zeros(len(pemimpin_unik) + 1, dtype=np.int64)
+    np.cumsum(panjang[pemimpin_unik], out=offset_baru[1:])
+    items_baru = items[indeks_gather(offset, pemimpin_unik)]
+    target = offset_baru[grup[baris]] + relatif
+    utils_baru = np.bincount(target, weights=utils, minlength=offset_baru[-1]).astype(dtype)
+    return offset_baru, items_baru, utils_baru, grup
+
+
+def indeks_rentang(awal, panjang):
+    # Gabungan rentang posisi [awal, awal + panjang) untuk setiap pasangan, dalam satu array
+    offset_baru = np.zeros(len(awal) + 1, dtype=np.int64)
+    np.cumsum(panjang, out=offset_baru[1:])
+    return np.repeat(awal - offset_baru[:-1], panjang) + np.arange(offset_baru[-1], dtype=np.int64)
+
+
+def indeks_gather(offset, baris_terpilih):
+    # Posisi seluruh elemen dari baris-baris terpilih (urut sesuai baris_terpilih)
+    awal = offset[baris_terpilih]
+    return indeks_rentang(awal, offset[baris_terpilih + 1] - awal)
+
+
+def sisa_utilitas(offset, utils):
+    # Remaining utility per posisi: jumlah utilitas item setelahnya di baris yang sama
+    if not len(utils):
+        return utils.copy()
+    kumulatif = np.cumsum(utils)
+    total_baris = kumulatif[offset[1:] - 1]
+    return (total_baris[indeks_baris(offset)] - kumulatif).astype(utils.dtype)
+
+
+def buang_baris_kosong(offset):
+    # Offset baru tanpa baris kosong (offset tetap tidak turun, jadi cukup ambil nilai unik)
+    return np.unique(offset)
+
+
+def susun_csr(kode_tid, kode_item, utilitas, jumlah_tid):
+    # Sort-and-split: susun baris (tid, item, utilitas) menjadi CSR per transaksi.
+    # Item yang muncul berulang di satu transaksi dijumlahkan sehingga (tid, item) unik.
+    dtype = dtype_utilitas(utilitas)
+    jumlah_item = int(kode_item.max()) + 1 if len(kode_item) else 0
+    kunci = kode_tid.astype(np.int64) * jumlah_item + kode_item
+    urut = np.argsort(kunci, kind='stable')
+    kunci = kunci[urut]
+    awal = np.ones(len(kunci), dtype=bool)
+    awal[1:] = kunci[1:] != kunci[:-1]
+    awal = np.flatnonzero(awal)
+    utilitas = np.asarray(utilitas)[urut].astype(dtype)
+    items = kode_item[urut][awal].astype(np.int32)
+    utils = np.add.reduceat(utilitas, awal) if len(awal) else utilitas
+    offset = np.zeros(jumlah_tid + 1, dtype=np.int64)
+    np.cumsum(np.bincount(kode_tid[urut][awal], minlength=jumlah_tid), out=offset[1:])
+    return offset, items, utils
+
+
+class ArrayTumbuh:
+    # Array yang bisa ditambah di akhir secara in-place dengan kapasitas berlipat
+    # (amortized O(1) per elemen), dipakai untuk store CSR pada mining inkremental.
+
+    def __init__(self, data, kapasitas=None):
+        data = np.asarray(data)
+        self.n = len(data)
+        self._awal = 0      # elemen terdepan yang sudah dibuang (buang_depan) tidak disalin ulang
+        self._buffer = np.empty(max(self.n, kapasitas or 0, 16), dtype=data.dtype)
+        self._buffer[:self.n] = data
+
+    @property
+    def data(self):
+        return self._buffer[self._awal:self._awal + self.n]
+
+    def memegang(self, array):
+        # True jika array adalah view isi buffer ini (belum diganti dari luar)
+        return array.base is self._buffer and len(array) == self.n
+
+    def tambah(self, nilai):
+        nilai = np.asarray(nilai)
+        perlu = self.n + len(nilai)
+        dtype = np.result_type(self._buffer.dtype, nilai.dtype)
+        if self._awal + perlu > len(self._buffer) or dtype != self._buffer.dtype:
+            # Pindah ke buffer baru berkapasitas 2x isi; ruang elemen yang dibuang ikut dibebaskan
+            buffer = np.empty(max(2 * perlu, 16), dtype=dtype)
+            buffer[:self.n] = self.data
+            self._buffer = buffer
+            self._awal = 0
+        self._buffer[self._awal + self.n:self._awal + perlu] = nilai
+        self.n = perlu
+        return self.data
+
+    def buang_depan(self, jumlah):
+        # Buang elemen terdepan tanpa menyalin
+        self._awal += jumlah
+        self.n -= jumlah
+        return self.data
@@ -0,0 +1,14 @@
+import pandas as pd
+
+# Data transaksi kecil yang dipakai bersama oleh test per fitur (sama dengan setUp di test_efim.py)
+
+MIN_UTIL = 15000
+
+
+def data_transaksi():
+    return pd.DataFrame({
+        'ID_PENJUALAN': ['T1', 'T1', 'T1', 'T2', 'T2', 'T2', 'T3', 'T3', 'T3', 'T4', 'T4', 'T4'],
+        'KODE_BARANG': ['A', 'B', 'C', 'A', 'C', 'D', 'B', 'C', 'E', 'A', 'B', 'E'],
+        'HARGA': [5000, 7000, 3000, 5000, 3000, 2000, 7000, 3000, 1000, 5000, 7000, 1000],
+        'KUANTITAS': [2, 1, 1, 1, 3, 2, 2, 1, 4, 1, 3, 2],
+    }).assign(UTILITY=lambda df: df['HARGA'] * df['KUANTITAS'])
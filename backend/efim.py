@@ -1,176 +1,971 @@
+import heapq
+import logging
+import time
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from efim_proyeksi import PencarianProyeksi
+from efim_paralel import jumlah_worker, tambang_paralel
+from eucs import EUCS, pasangan_item
+from bitmap_tid import BitmapTid
+from hui_tertutup import MODE_HASIL, saring_maksimal
+from toko_transaksi import TokoTransaksi
+from csr import (susun_csr, indeks_baris, indeks_gather, indeks_rentang, gabung_transaksi_identik, sisa_utilitas,
+                 buang_baris_kosong, dtype_utilitas, ArrayTumbuh)
+
 
-class Element:
-    def __init__(self, tid, iutils, rutils):
-        self.tid = tid        # Transaction ID
-        self.iutils = iutils  # Item Utility
-        self.rutils = rutils  # Remaining Utility 
 class UtilityList:
-    def __init__(self, item):
+    # Utility list berbasis array paralel (tid, iutil, rutil) tanpa objek per elemen.
+    # tid berupa integer padat dan selalu terurut naik sehingga join cukup merge integer.
+    __slots__ = ('item', 'tids', 'iutils', 'rutils', 'sum_iutils', 'sum_rutils')
+
+    def __init__(self, item, tids, iutils, rutils):
         self.item = item
-        self.elements = []
-        self.sum_iutils = 0
-        self.sum_rutils = 0
+        self.tids = tids        # Transaction ID (int, terurut)
+        self.iutils = iutils    # Item Utility
+        self.rutils = rutils    # Remaining Utility
+        self.sum_iutils = iutils.sum()
+        self.sum_rutils = rutils.sum()
+
+    def __len__(self):
+        return len(self.tids)
+
+    @property
+    def nbytes(self):
+        return self.tids.nbytes + self.iutils.nbytes + self.rutils.nbytes
+
+
+def _faktorisasi(nilai):
+    # pd.factorize tanpa sort: id mengikuti urutan kemunculan pertama, nilai kosong menjadi -1
+    kode, label = pd.factorize(nilai, sort=False)
+    return kode, np.asarray(label)
+
+
+def _faktorisasi_kolom(kolom):
+    # Kolom categorical: kode kategori dipakai langsung sebagai id (kamus kategori menjadi label),
+    # kategori yang tidak muncul di baris mana pun dibuang agar id tetap padat
+    if not isinstance(kolom.dtype, pd.CategoricalDtype):
+        return _faktorisasi(kolom.to_numpy())
+    kode = kolom.cat.codes.to_numpy().astype(np.int64)
+    label = np.asarray(kolom.cat.categories)
+    terpakai = np.bincount(kode[kode >= 0], minlength=len(label)) > 0
+    if not terpakai.all():
+        peta = np.cumsum(terpakai) - 1
+        kode = np.where(kode >= 0, peta[kode], -1)
+        label = label[terpakai]
+    return kode, label
+
+
+def _faktorisasi_arrow(kolom):
+    # Faktorisasi langsung di Arrow (dictionary_encode) tanpa konversi ke pandas
+    import pyarrow.compute as pc
+    if hasattr(kolom, 'combine_chunks'):
+        kolom = kolom.combine_chunks()
+    terkode = pc.dictionary_encode(kolom)
+    kode = terkode.indices.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+    return kode, terkode.dictionary.to_numpy(zero_copy_only=False)
+
+
+def faktorisasi_transaksi(data_transaksi, kolom_id_transaksi, kolom_id_item, kolom_utilitas):
+    # Mengembalikan (kode_tid, label_tid, kode_item, label_item, utilitas) dari berbagai bentuk input.
+    # Baris dengan id transaksi/item atau utilitas kosong dibuang.
+    if isinstance(data_transaksi, pd.DataFrame):
+        kode_tid, label_tid = _faktorisasi_kolom(data_transaksi[kolom_id_transaksi])
+        kode_item, label_item = _faktorisasi_kolom(data_transaksi[kolom_id_item])
+        utilitas = data_transaksi[kolom_utilitas].to_numpy()
+    elif hasattr(data_transaksi, 'column_names') and hasattr(data_transaksi, 'column'):
+        kode_tid, label_tid = _faktorisasi_arrow(data_transaksi.column(kolom_id_transaksi))
+        kode_item, label_item = _faktorisasi_arrow(data_transaksi.column(kolom_id_item))
+        utilitas = data_transaksi.column(kolom_utilitas).to_numpy()
+    elif isinstance(data_transaksi, (tuple, list)) and len(data_transaksi) in (2, 3):
+        if len(data_transaksi) == 2:
+            kunci = np.asarray(data_transaksi[0])
+            tids, items = kunci[:, 0], kunci[:, 1]
+        else:
+            tids, items = data_transaksi[0], data_transaksi[1]
+        kode_tid, label_tid = _faktorisasi(np.asarray(tids))
+        kode_item, label_item = _faktorisasi(np.asarray(items))
+        utilitas = np.asarray(data_transaksi[-1])
+    else:
+        raise TypeError("data_transaksi harus berupa DataFrame, tabel Arrow, atau pasangan array NumPy")
+
+    # Utilitas yang tipenya sudah diturunkan (int8/int16/float32) dilebarkan agar TU/TWU tidak overflow
+    if utilitas.dtype.kind in 'iub':
+        utilitas = utilitas.astype(np.int64, copy=False)
+    else:
+        utilitas = utilitas.astype(np.float64, copy=False)
+    valid = (kode_tid >= 0) & (kode_item >= 0)
+    if utilitas.dtype.kind == 'f':
+        valid &= ~np.isnan(utilitas)
+    if not valid.all():
+        kode_tid, kode_item, utilitas = kode_tid[valid], kode_item[valid], utilitas[valid]
+        # Padatkan ulang id agar tidak ada transaksi/item tanpa baris
+        terpakai, kode_tid = np.unique(kode_tid, return_inverse=True)
+        label_tid = label_tid[terpakai]
+        terpakai, kode_item = np.unique(kode_item, return_inverse=True)
+        label_item = label_item[terpakai]
+    return kode_tid, label_tid, kode_item, label_item, utilitas
+
+
+def _perluas_label(label_lama, label_batch, kode_batch):
+    # Petakan id lokal batch ke id global; label yang belum dikenal mendapat id lanjutan di akhir
+    posisi = pd.Index(label_lama).get_indexer(label_batch)
+    baru = posisi < 0
+    posisi[baru] = len(label_lama) + np.arange(baru.sum())
+    return posisi[kode_batch], np.concatenate([label_lama, label_batch[baru]])
+
+
+def _skalar(nilai):
+    # Ubah skalar numpy menjadi tipe Python agar aman di-serialisasi ke JSON
+    return nilai.item() if hasattr(nilai, 'item') else nilai
+
+
+# Mesin pencarian yang tersedia:
+# - 'utility_list': join utility list gaya HUI-Miner dengan EUCS dan LU-Prune (default)
+# - 'proyeksi': EFIM dengan projected database, transaction merging dan batas su/lu
+MESIN_TERSEDIA = ('utility_list', 'proyeksi')
+
+# Pembatalan dan anggaran waktu dicek setiap INTERVAL_CEK node agar biayanya tetap kecil
+INTERVAL_CEK = 256
+# Join utility list diproses per blok entri Px; LA-Prune dicek setelah tiap blok
+UKURAN_BLOK_JOIN = 4096
+
+# Log pencarian (level INFO/DEBUG); tanpa konfigurasi logging, hanya WARNING ke atas yang tampil
+log = logging.getLogger('efim')
+
+
+class PencarianDihentikan(Exception):
+    # Dilempar dari dalam pencarian saat dibatalkan atau anggaran habis; hasil sejauh ini tetap disimpan
+    def __init__(self, alasan):
+        super().__init__(alasan)
+        self.alasan = alasan  # 'dibatalkan', 'anggaran_waktu' atau 'anggaran_node'
 
-    def add_element(self, element):
-        self.elements.append(element)
-        self.sum_iutils += element.iutils
-        self.sum_rutils += element.rutils
 
 class EFIM:
-    def __init__(self, min_util, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG', kolom_utilitas='UTILITY'):
-        self.min_util = min_util
+    # Penghitung pencarian per run (lihat penghitung/statistik):
+    # - jumlah_node: node (kandidat itemset) yang dijelajahi
+    # - join_dibangun / join_dipangkas: join utility list yang selesai / dihentikan LA-Prune
+    # - join_dilewati: join yang tidak dimulai karena ukuran irisan tidset (popcount bitmap) terlalu kecil
+    # - pangkas_twu: item yang dibuang TWU pruning sebelum pencarian
+    # - pangkas_eucs: pasangan perluasan yang dilewati karena EUCS < min_util
+    # - pangkas_lu: mesin utility list: node yang tidak diperluas (LU-Prune); mesin proyeksi: item
+    #   yang dibuang dari Secondary karena lu < min_util
+    # - pangkas_su: mesin proyeksi: item di Secondary yang sub-tree-nya dipangkas karena su < min_util
+    # - cabang_tidak_tertutup: cabang yang dipangkas karena tidak memuat itemset tertutup
+    PENGHITUNG = ('jumlah_node', 'join_dibangun', 'join_dipangkas', 'join_dilewati', 'pangkas_twu', 'pangkas_eucs',
+                  'pangkas_lu', 'pangkas_su', 'cabang_tidak_tertutup')
+
+    def __init__(self, min_util, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG', kolom_utilitas='UTILITY', mesin='utility_list', n_workers=1, k=None,
+                 anggaran_waktu=None, anggaran_node=None, batal=None, mode='semua'):
+        if mesin not in MESIN_TERSEDIA:
+            raise ValueError(f"Mesin tidak dikenal: {mesin}. Pilihan: {MESIN_TERSEDIA}")
+        if k is not None and k <= 0:
+            raise ValueError("k harus lebih besar dari 0")
+        if mode not in MODE_HASIL:
+            raise ValueError(f"Mode tidak dikenal: {mode}. Pilihan: {MODE_HASIL}")
+        if mode != 'semua' and (mesin != 'utility_list' or k is not None):
+            raise ValueError(f"Mode {mode} hanya tersedia untuk mesin utility_list tanpa top-K")
+        self.min_util = min_util if min_util is not None else 0
+        # Mode top-K: simpan K itemset terbaik dalam min-heap dan naikkan min_util saat heap penuh
+        self.k = k
+        self._heap_topk = []
+        self._urutan_topk = 0
+        self.mesin = mesin
+        self.n_workers = n_workers  # > 1: mining paralel per item level pertama; None/0: semua core
         self.kolom_id_transaksi = kolom_id_transaksi
         self.kolom_id_item = kolom_id_item
         self.kolom_utilitas = kolom_utilitas
         self.high_utility_itemsets = []
-        self.transaksi = []
+        # Mode keluaran (lihat hui_tertutup): 'semua', 'tertutup' atau 'maksimal'. Mode tertutup menyimpan
+        # utilitas per item tiap closed HUI: tuple itemset -> list utilitas item di tidset itemset tersebut
+        self.mode = mode
+        self.utilitas_unit = dict()
+        # Database transaksi terkompresi (CSR): item & transaksi sudah difaktorisasi ke id integer padat
+        self.label_transaksi = np.empty(0, dtype=object)
+        self.label_item = np.empty(0, dtype=object)
+        self.offset = np.zeros(1, dtype=np.int64)
+        self.item_transaksi = np.empty(0, dtype=np.int32)
+        self.util_transaksi = np.empty(0, dtype=np.int64)
+        self.twu = np.empty(0, dtype=np.int64)
         self.items_twu = defaultdict(int)
-        self.eucs = defaultdict(int)  # Untuk Estimated Utility Co-occurrence Structure (EUCS)
+        self.eucs = EUCS()  # Untuk Estimated Utility Co-occurrence Structure (EUCS)
+        self.rank_ke_item = np.empty(0, dtype=np.int64)
+        # Mining inkremental: buffer store CSR yang bisa ditambah in-place, penanda EUCS berbasis TU penuh,
+        # dan tid (setelah merging) pertama milik transaksi baru selama pencarian delta
+        self._store = None
+        self._eucs_inkremental = False
+        self.tid_baru_awal = None
+        self._reset_penghitung()
+        self.kedalaman = 0    # Kedalaman node yang sedang dijelajahi (panjang itemset)
+        # Waktu dinding (detik) dan memori (byte struktur yang dihasilkan) per fase run terakhir.
+        # Memori fase rekursi = puncak ukuran utility list / database proyeksi di sepanjang jalur DFS.
+        self.fase = dict()
+        self._bitmap = None      # BitmapTid per item untuk join (None: searchsorted)
+        self._mask_join = np.empty(0, dtype=bool)
+        self._ul_akar = dict()          # Utility list item tunggal (rank -> UtilityList)
+        self._jumlah_tid_akar = np.empty(0, dtype=np.int64)
+        # Kendali pencarian: anggaran waktu (detik) / jumlah node dan flag pembatalan (threading.Event).
+        # Jika salah satunya habis, pencarian berhenti dan dihentikan berisi alasannya.
+        self.anggaran_waktu = anggaran_waktu
+        self.anggaran_node = anggaran_node
+        self.batal = batal
+        self.dihentikan = None
+        self._kendali_aktif = False
+        self._batas_waktu = None
+        self._batas_node = None
+
+    @property
+    def jumlah_transaksi(self):
+        return len(self.offset) - 1
 
     def muat_data(self, data_transaksi):
-        transaksi_dict = defaultdict(list)
-        for _, row in data_transaksi.iterrows():
-            transaksi_dict[row[self.kolom_id_transaksi]].append((row[self.kolom_id_item], row[self.kolom_utilitas]))
-        
-        for id_transaksi, items in transaksi_dict.items():
-            self.transaksi.append((id_transaksi, items))
-        print("Data transaksi dimuat.")
+        # Faktorisasi transaksi dan item ke id integer, lalu susun sebagai CSR per transaksi.
+        # data_transaksi boleh berupa DataFrame, tabel Arrow, atau pasangan array NumPy
+        # ((id_transaksi, id_item), utilitas) / tuple (id_transaksi, id_item, utilitas).
+        # TokoTransaksi (CSR yang sudah disusun, dipetakan dari berkas bersama) dipakai langsung tanpa
+        # salinan; array-nya read-only, mining inkremental menyalinnya ke buffer sendiri saat ditambah.
+        if isinstance(data_transaksi, TokoTransaksi):
+            self.offset, self.item_transaksi, self.util_transaksi = (
+                data_transaksi.offset, data_transaksi.item, data_transaksi.utilitas)
+            self.label_transaksi, self.label_item = data_transaksi.label_transaksi, data_transaksi.label_item
+        else:
+            kode_tid, self.label_transaksi, kode_item, self.label_item, utilitas = faktorisasi_transaksi(
+                data_transaksi, self.kolom_id_transaksi, self.kolom_id_item, self.kolom_utilitas)
+            self.offset, self.item_transaksi, self.util_transaksi = susun_csr(
+                kode_tid, kode_item, utilitas, len(self.label_transaksi))
+        self._store = None
+        self._eucs_inkremental = False
+        log.info("Data transaksi dimuat: %d transaksi, %d item", self.jumlah_transaksi, len(self.label_item))
+
+    def _utilitas_transaksi(self):
+        # Total utilitas per transaksi (TU)
+        return np.bincount(indeks_baris(self.offset), weights=self.util_transaksi,
+                           minlength=self.jumlah_transaksi).astype(self.util_transaksi.dtype)
 
     def hitung_TWU(self):
         #Menghitung Transaction Weighted Utilization (TWU) untuk semua item#
-        for tid, items in self.transaksi:
-            transaksi_utilitas = sum(util for _, util in items)
-            for item, _ in items:
-                self.items_twu[item] += transaksi_utilitas
-        print(f"TWU per item: {dict(self.items_twu)}")
+        tu = self._utilitas_transaksi()
+        bobot = np.repeat(tu, np.diff(self.offset))
+        self.twu = np.bincount(self.item_transaksi, weights=bobot,
+                               minlength=len(self.label_item)).astype(self.util_transaksi.dtype)
+        self.items_twu = defaultdict(int, zip(self.label_item.tolist(), self.twu.tolist()))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("TWU per item: %s", dict(self.items_twu))
 
-    def hitung_EUCS(self):
+    def hitung_EUCS(self, items=None, db=None):
         # Membangun Estimated Utility Co-occurrence Structure (EUCS) #
-        for tid, items in self.transaksi:
-            item_set = set(item for item, _ in items)
-            transaksi_utilitas = sum(util for _, util in items) #total utilitas dari semua item di transaksi tersebut 
-            for item1 in item_set:
-                for item2 in item_set:
-                    if item1 != item2:
-                        self.eucs[(item1, item2)] += transaksi_utilitas
-
-    def buat_utility_list(self, items):
-         # Membuat Utility List untuk setiap item yang lolos TWU, dengan Transaction Merging #
-        utility_lists = dict()
-        for item in items:
-            utility_lists[item] = UtilityList(item)
+        # Hanya atas item yang lolos TWU pruning; tiap pasangan tak berurut disimpan sekali (sparse).
+        # TU yang dipakai adalah utilitas transaksi setelah item tak menjanjikan dibuang (tetap batas atas yang sah).
+        if items is None:
+            items = self.rank_ke_item if len(self.rank_ke_item) else self.prune_items_by_twu()
+        if db is None:
+            db = self.database_terpangkas(items)
+        offset, rank, utils = db
+        tu = np.bincount(indeks_baris(offset), weights=utils, minlength=len(offset) - 1).astype(utils.dtype)
+        self.eucs = EUCS.dari_transaksi(offset, items[rank], tu)
+
+    def database_terpangkas(self, items, baris_baru=None):
+        # Database transaksi yang hanya berisi item lolos TWU, item per transaksi diurutkan berdasarkan rank,
+        # lalu transaksi identik digabung (Transaction Merging). Mengembalikan CSR (offset, rank, utilitas).
+        # items: array id item terurut berdasarkan TWU naik; posisi di array = rank item
+        # baris_baru: mask transaksi baru (mining inkremental); transaksi gabungan yang memuat transaksi
+        # baru diletakkan di akhir dan tid pertamanya disimpan di self.tid_baru_awal
+        rank_item = np.full(len(self.label_item), -1, dtype=np.int64)
+        rank_item[items] = np.arange(len(items))
+
+        # Buang item yang tidak lolos TWU lalu urutkan item di tiap transaksi berdasarkan rank
+        rank = rank_item[self.item_transaksi]
+        simpan = rank >= 0
+        baris = indeks_baris(self.offset)[simpan]
+        rank = rank[simpan]
+        utils = self.util_transaksi[simpan]
+        urut = np.lexsort((rank, baris))
+        baris, rank, utils = baris[urut], rank[urut], utils[urut]
+        offset = np.zeros(self.jumlah_transaksi + 1, dtype=np.int64)
+        np.cumsum(np.bincount(baris, minlength=self.jumlah_transaksi), out=offset[1:])
+        tidak_kosong = np.diff(offset) > 0
+        offset = buang_baris_kosong(offset)
 
         # Transaction Merging: group transaksi yang punya itemset sama
-        merged_transaksi = defaultdict(list)
-        for tid, transaksi_items in self.transaksi:
-            itemset = frozenset(item for item, _ in transaksi_items if item in items)
-            merged_transaksi[itemset].append((tid, transaksi_items))
+        offset, rank, utils, grup = gabung_transaksi_identik(offset, rank, utils, utils.dtype)
+        if baris_baru is not None:
+            grup_baru = np.zeros(len(offset) - 1, dtype=bool)
+            grup_baru[grup[baris_baru[tidak_kosong]]] = True
+            urut = np.argsort(grup_baru, kind='stable')
+            rank, utils = rank[indeks_gather(offset, urut)], utils[indeks_gather(offset, urut)]
+            panjang = np.diff(offset)[urut]
+            offset = np.zeros(len(panjang) + 1, dtype=np.int64)
+            np.cumsum(panjang, out=offset[1:])
+            self.tid_baru_awal = int(len(grup_baru) - grup_baru.sum())
+        return offset, rank, utils
 
-        for itemset, transaksi_group in merged_transaksi.items():
-            if not itemset:
-                continue
-            # Kalau ada lebih dari satu transaksi yang sama, merge mereka
-            combined_items = []
-            for _, items_list in transaksi_group:
-                combined_items.extend(items_list)
-            
-            # Hitung ulang transaksi setelah merge
-            transaksi_items = [item for item in combined_items if item[0] in items]
-            transaksi_items.sort(key=lambda x: (self.items_twu[x[0]], x[0]))  # Sort by TWU naik
-
-            remaining_utility = sum(util for _, util in transaksi_items)
-
-            for i in range(len(transaksi_items)):
-                item, utilitas = transaksi_items[i]
-                remaining_utility -= utilitas
-                e = Element("-".join(str(tid) for tid, _ in transaksi_group), utilitas, remaining_utility)
-                utility_lists[item].add_element(e)
+    def buat_utility_list(self, items, db=None):
+        # Membuat Utility List untuk setiap item yang lolos TWU, dengan Transaction Merging #
+        m = len(items)
+        offset, rank, utils = self.database_terpangkas(items) if db is None else db
 
+        # Remaining utility = jumlah utilitas item setelahnya di transaksi yang sama
+        baris = indeks_baris(offset)
+        rutils = sisa_utilitas(offset, utils)
+
+        # Kelompokkan per item; urutan stabil menjaga tid tetap terurut naik
+        urut = np.argsort(rank, kind='stable')
+        batas = np.zeros(m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rank, minlength=m), out=batas[1:])
+        tids, iutils, rutils = baris[urut], utils[urut], rutils[urut]
+        self._bitmap = BitmapTid.dari_pasangan(rank, baris, m, len(offset) - 1)
+        utility_lists = dict()
+        for r in range(m):
+            a, b = batas[r], batas[r + 1]
+            utility_lists[r] = UtilityList(r, tids[a:b], iutils[a:b], rutils[a:b])
+        self._ul_akar = utility_lists
+        self._jumlah_tid_akar = np.diff(batas)
         return utility_lists
 
     def prune_items_by_twu(self):
         # Mengambil item dengan TWU >= min_util #
-        return {item for item, twu in self.items_twu.items() if twu >= self.min_util}
+        return np.flatnonzero(self.twu >= self.min_util)
+
+    def _label_itemset(self, simpul):
+        # simpul: prefix berbagi (rank, simpul_induk); ditelusuri ke akar hanya saat hasil dimaterialisasi
+        return self.label_item[self.rank_ke_item[self._rank_simpul(simpul)[::-1]]].tolist()
+
+    def _simpan_itemset(self, prefix, utilitas):
+        # Konsumen hasil kedua mesin untuk mode non-stream (prefix berupa simpul rank berbagi)
+        if self.k is not None:
+            self._simpan_topk(prefix, utilitas)
+            return
+        self.high_utility_itemsets.append((self._label_itemset(prefix), _skalar(utilitas)))
+
+    def _simpan_topk(self, prefix, utilitas):
+        # Min-heap berisi K itemset terbaik; saat penuh, utilitas terkecil di heap menjadi min_util baru
+        # sehingga pruning (TWU/EUCS/LU/su) di sisa pencarian ikut mengetat
+        if len(self._heap_topk) >= self.k and utilitas <= self._heap_topk[0][0]:
+            return
+        self._urutan_topk += 1
+        entri = (_skalar(utilitas), -self._urutan_topk, self._label_itemset(prefix))
+        if len(self._heap_topk) < self.k:
+            heapq.heappush(self._heap_topk, entri)
+        else:
+            heapq.heapreplace(self._heap_topk, entri)
+        if len(self._heap_topk) == self.k and self._heap_topk[0][0] > self.min_util:
+            self.min_util = self._heap_topk[0][0]
+
+    def _naikkan_threshold_awal(self):
+        # Threshold awal top-K: utilitas item tunggal ke-K terbesar (pasti ada K itemset >= nilai ini)
+        utilitas_item = np.bincount(self.item_transaksi, weights=self.util_transaksi, minlength=len(self.label_item))
+        if len(utilitas_item) >= self.k:
+            batas = np.partition(utilitas_item, len(utilitas_item) - self.k)[len(utilitas_item) - self.k]
+            if self.util_transaksi.dtype.kind == 'f':
+                # Beri kelonggaran pembulatan: urutan penjumlahan float di mesin bisa sedikit berbeda
+                batas -= abs(batas) * 1e-9
+            self.min_util = max(self.min_util, _skalar(batas.astype(self.util_transaksi.dtype)))
+
+    @property
+    def terkendali(self):
+        return self.batal is not None or self.anggaran_waktu is not None or self.anggaran_node is not None
 
-    def efim_recursive(self, prefix, utility_lists, items):
+    def _mulai_kendali(self):
+        # Kendali hanya aktif selama jalankan/iter_itemset (bukan saat pencarian delta inkremental)
+        self.dihentikan = None
+        self.kedalaman = 1
+        self._kendali_aktif = True
+        self._batas_waktu = None if self.anggaran_waktu is None else time.monotonic() + self.anggaran_waktu
+        self._batas_node = self.anggaran_node
+
+    def _selesai_kendali(self, alasan=None):
+        if alasan is not None:
+            self.dihentikan = alasan
+            log.warning("Pencarian dihentikan (%s), hasil parsial dikembalikan", alasan)
+        self._kendali_aktif = False
+        self._batas_waktu = self._batas_node = None
+
+    def cek_kendali(self):
+        if not self._kendali_aktif:
+            return
+        if self.batal is not None and self.batal.is_set():
+            raise PencarianDihentikan('dibatalkan')
+        if self._batas_waktu is not None and time.monotonic() >= self._batas_waktu:
+            raise PencarianDihentikan('anggaran_waktu')
+
+    def hitung_node(self):
+        # Dipanggil kedua mesin setiap menjelajahi node; anggaran node dicek tiap node (perbandingan
+        # integer), pembatalan dan waktu hanya tiap INTERVAL_CEK node
+        if self._batas_node is not None and self.jumlah_node >= self._batas_node:
+            raise PencarianDihentikan('anggaran_node')
+        self.jumlah_node += 1
+        if self.jumlah_node % INTERVAL_CEK == 0:
+            self.cek_kendali()
+
+    def progres(self):
+        # Ringkasan progres untuk dipantau dari thread lain selama pencarian berjalan
+        return {
+            'jumlah_node': self.jumlah_node,
+            'jumlah_itemset': len(self._heap_topk) if self.k is not None else len(self.high_utility_itemsets),
+            'kedalaman': self.kedalaman,
+            **{nama: getattr(self, nama) for nama in self.PENGHITUNG if nama != 'jumlah_node'},
+            'min_util': _skalar(self.min_util),
+        }
+
+    def _reset_penghitung(self):
+        for nama in self.PENGHITUNG:
+            setattr(self, nama, 0)
+        self._memori_jalur = 0
+        self._memori_jalur_puncak = 0
+
+    def penghitung(self):
+        return {nama: getattr(self, nama) for nama in self.PENGHITUNG}
+
+    def catat_memori_jalur(self, nbytes):
+        # Dipanggil kedua mesin saat masuk (+) / keluar (-) level rekursi dengan ukuran struktur level itu
+        self._memori_jalur += nbytes
+        if self._memori_jalur > self._memori_jalur_puncak:
+            self._memori_jalur_puncak = self._memori_jalur
+
+    def _catat_fase(self, nama, mulai, memori=0):
+        # Tambahkan waktu sejak mulai (perf_counter) ke fase nama; memori diambil maksimumnya
+        fase = self.fase.setdefault(nama, {'detik': 0.0, 'memori': 0})
+        fase['detik'] += time.perf_counter() - mulai
+        fase['memori'] = max(fase['memori'], int(memori))
+
+    def statistik(self):
+        # Instrumentasi run terakhir: waktu & memori per fase beserta penghitung pencarian
+        return {
+            'mesin': self.mesin,
+            'mode': self.mode,
+            'min_util': _skalar(self.min_util),
+            'jumlah_itemset': len(self.high_utility_itemsets),
+            'dihentikan': self.dihentikan,
+            'fase': {nama: dict(nilai) for nama, nilai in self.fase.items()},
+            **self.penghitung(),
+        }
+
+    def efim_recursive(self, prefix, utility_lists, items, ulist_prefix=None, indeks=None):
         # Algoritma recursive EFIM dengan LU-Prune dan Upper Bound Check #
-        for i in range(len(items)):
+        # Generator: yield (simpul, utilitas) untuk tiap high utility itemset. simpul = (rank, simpul_induk)
+        # sehingga prefix dipakai bersama oleh semua turunannya tanpa menyalin list.
+        # indeks: posisi item di level ini yang dijelajahi (default semua); dipakai mode paralel
+        if self.mode != 'semua':
+            yield from self._efim_tertutup(prefix, utility_lists, items, ulist_prefix, indeks)
+            return
+        for i in (range(len(items)) if indeks is None else indeks):
             Xi = items[i]
             ulist_Xi = utility_lists[Xi]
+            simpul = (Xi, prefix)
+            self.hitung_node()
 
-            # Simpan high upython app.pytility itemset
+            # Simpan high utility itemset
             if ulist_Xi.sum_iutils >= self.min_util:
-                self.high_utility_itemsets.append((prefix + [Xi], ulist_Xi.sum_iutils))
+                yield simpul, ulist_Xi.sum_iutils
 
             # LU-Prune: lanjut mining kalau sum_iutils + sum_rutils masih layak
-            if ulist_Xi.sum_iutils + ulist_Xi.sum_rutils >= self.min_util:
-                exULs = dict()
-                for j in range(i + 1, len(items)):
-                    Xj = items[j]
+            if ulist_Xi.sum_iutils + ulist_Xi.sum_rutils < self.min_util:
+                self.pangkas_lu += 1
+                continue
+            exULs = self._perluas(ulist_Xi, items[i + 1:], utility_lists, ulist_prefix)
+            if exULs:
+                self.kedalaman += 1
+                yield from self._turun(simpul, exULs, np.fromiter(exULs, dtype=np.int64), ulist_Xi)
+                self.kedalaman -= 1
 
-                    # Cek menggunakan EUCS sebelum konstruksi utility list
-                    if (Xi, Xj) in self.eucs and self.eucs[(Xi, Xj)] < self.min_util:
-                        continue
+    def _turun(self, simpul, exULs, items, ulist_Xi, indeks=None):
+        # Rekursi ke level berikutnya sambil mencatat memori utility list di jalur DFS
+        nbytes = sum(ulist.nbytes for ulist in exULs.values())
+        self.catat_memori_jalur(nbytes)
+        try:
+            yield from self.efim_recursive(simpul, exULs, items, ulist_Xi, indeks)
+        finally:
+            self.catat_memori_jalur(-nbytes)
 
-                    exUL = self.construct_utility_list(ulist_Xi, utility_lists[Xj])
+    def _perluas(self, ulist_Xi, kandidat, utility_lists, ulist_prefix):
+        # Utility list perluasan Xi dengan tiap item kandidat (dict rank -> UtilityList, urut kandidat)
+        exULs = dict()
+        # Cek menggunakan EUCS sebelum konstruksi utility list (satu lookup vektor per Xi)
+        eucs_Xi = self.eucs.ambil(self.rank_ke_item[ulist_Xi.item], self.rank_ke_item[kandidat])
+        lolos = np.flatnonzero(eucs_Xi >= self.min_util)
+        self.pangkas_eucs += len(kandidat) - len(lolos)
+        if self._bitmap is not None and len(lolos):
+            lolos = self._saring_irisan(ulist_Xi, kandidat, lolos)
+        for j in lolos.tolist():
+            Xj = kandidat[j]
+            exUL = self.construct_utility_list(ulist_Xi, utility_lists[Xj], ulist_prefix)
 
-                    # Upper Bound Check setelah construct
-                    if exUL and exUL.sum_iutils + exUL.sum_rutils >= self.min_util:
-                        exULs[Xj] = exUL
+            # exUL yang lolos LA-Prune tetap disimpan walau sum_iutils + sum_rutils < min_util karena
+            # masih dibutuhkan sebagai pasangan join untuk item sebelumnya; LU-Prune diterapkan saat
+            # exUL menjadi Xi
+            # Pada pencarian delta (inkremental), exUL tanpa transaksi baru tidak bisa berubah utilitasnya
+            if exUL is not None and (self.tid_baru_awal is None or exUL.tids[-1] >= self.tid_baru_awal):
+                exULs[Xj] = exUL
+        return exULs
 
-                if exULs:
-                    self.efim_recursive(prefix + [Xi], exULs, list(exULs.keys()))
+    def _saring_irisan(self, ulist_Xi, kandidat, lolos):
+        # Pra-cek sebelum join: dengan c = |tid(Px) ∩ tid(y)| (AND + popcount bitmap), utilitas Pxy dan
+        # perluasannya <= jumlah c nilai iutil + rutil Px terbesar. Kandidat dengan c = 0 atau batas
+        # itu < min_util dilewati tanpa join; LA-Prune pasti memangkasnya juga, jadi hasil tidak berubah.
+        irisan = self._bitmap.jumlah_irisan(kandidat[lolos], ulist_Xi.tids)
+        terbesar = np.cumsum(np.sort(ulist_Xi.iutils + ulist_Xi.rutils)[::-1])
+        batas = np.where(irisan > 0, terbesar[np.maximum(irisan, 1) - 1], 0)
+        cukup = (irisan > 0) & (batas >= self.min_util)
+        self.join_dilewati += len(lolos) - int(cukup.sum())
+        return lolos[cukup]
 
-    def construct_utility_list(self, ulistP, ulistQ):
-        # Mengkonstruksi utility list baru untuk gabungan item P dan Q #
-        ulist = UtilityList(ulistQ.item)
-        idxP = 0
-        idxQ = 0
-        while idxP < len(ulistP.elements) and idxQ < len(ulistQ.elements):
-            eP = ulistP.elements[idxP]
-            eQ = ulistQ.elements[idxQ]
-            if eP.tid == eQ.tid:
-                new_element = Element(
-                    eP.tid,
-                    eP.iutils + eQ.iutils,
-                    eQ.rutils
-                )
-                ulist.add_element(new_element)
-                idxP += 1
-                idxQ += 1
-            elif eP.tid < eQ.tid:
-                idxP += 1
+    def _efim_tertutup(self, prefix, utility_lists, items, ulist_prefix=None, indeks=None):
+        # efim_recursive untuk mode 'tertutup' dan 'maksimal': hanya closed HUI yang di-yield.
+        # - Mundur: ada item z di luar Px dan di luar kandidat perluasannya dengan tid(Px) ⊆ tid(z).
+        #   Px dan semua turunannya tidak tertutup (z tidak pernah ditambahkan), cabang dipangkas.
+        # - Maju: perluasan Pxy dengan tidset sama (|Pxy| = |Px|). Px tidak tertutup, dan turunan yang
+        #   melewati y tanpa memuatnya juga tidak, jadi hanya cabang sampai item maju pertama yang dijelajahi.
+        # Closed HUI di-yield setelah turunannya (pada mode maksimal Px dilewati jika turunannya ada yang HUI).
+        for i in (range(len(items)) if indeks is None else indeks):
+            Xi = items[i]
+            ulist_Xi = utility_lists[Xi]
+            simpul = (Xi, prefix)
+            self.hitung_node()
+
+            # LU-Prune: Px dan turunannya tidak mungkin HUI
+            if ulist_Xi.sum_iutils + ulist_Xi.sum_rutils < self.min_util:
+                self.pangkas_lu += 1
+                continue
+            kandidat = items[i + 1:]
+            if self._ada_item_mundur(simpul, ulist_Xi.tids, kandidat):
+                self.cabang_tidak_tertutup += 1
+                continue
+
+            exULs = self._perluas(ulist_Xi, kandidat, utility_lists, ulist_prefix)
+            urutan = np.fromiter(exULs, dtype=np.int64)
+            maju = [j for j, Xj in enumerate(urutan.tolist()) if len(exULs[Xj]) == len(ulist_Xi)]
+            ada_turunan = False
+            if exULs:
+                self.kedalaman += 1
+                for hasil in self._turun(simpul, exULs, urutan, ulist_Xi, range(maju[0] + 1) if maju else None):
+                    ada_turunan = True
+                    yield hasil
+                self.kedalaman -= 1
+
+            if not maju and ulist_Xi.sum_iutils >= self.min_util and not (self.mode == 'maksimal' and ada_turunan):
+                if self.mode == 'tertutup':
+                    self.utilitas_unit[tuple(self._label_itemset(simpul))] = self._utilitas_unit(simpul, ulist_Xi.tids)
+                yield simpul, ulist_Xi.sum_iutils
+
+    def _rank_simpul(self, simpul):
+        ranks = []
+        while simpul is not None:
+            ranks.append(simpul[0])
+            simpul = simpul[1]
+        return ranks
+
+    def _ada_item_mundur(self, simpul, tids, kandidat):
+        # True jika ada item di luar itemset simpul dan kandidat yang memuat semua tids.
+        # Calon disaring dulu dengan ukuran tidset, lalu per blok tid dengan bitmap (atau tid utility list akar)
+        calon = self._jumlah_tid_akar >= len(tids)
+        calon[kandidat] = False
+        calon[self._rank_simpul(simpul)] = False
+        calon = np.flatnonzero(calon)
+        for a in range(0, len(tids), 64):
+            if not len(calon):
+                return False
+            blok = tids[a:a + 64]
+            if self._bitmap is not None:
+                bit = self._bitmap.bit[np.ix_(calon, blok >> 3)] >> (blok & 7).astype(np.uint8)
+                calon = calon[(bit & 1).all(axis=1)]
             else:
-                idxQ += 1
+                calon = calon[[np.isin(blok, self._ul_akar[z].tids, assume_unique=True).all() for z in calon.tolist()]]
+        return len(calon) > 0
+
+    def _utilitas_unit(self, simpul, tids):
+        # Utilitas tiap item itemset (urut seperti _label_itemset) dijumlahkan di tids
+        unit = []
+        for r in self._rank_simpul(simpul)[::-1]:
+            ulist = self._ul_akar[r]
+            unit.append(_skalar(ulist.iutils[np.searchsorted(ulist.tids, tids)].sum()))
+        return unit
+
+    def _anggota_tid(self, tids, ulistQ):
+        # Mask tid Px yang juga ada di Py. tid(Py) = tid(P) ∩ tid(y) dan tid Px sudah di tid(P),
+        # jadi cukup dicek ke bitmap item y; tanpa bitmap memakai searchsorted ke tid Py
+        if self._bitmap is not None:
+            return self._bitmap.anggota(ulistQ.item, tids)
+        posisi = np.searchsorted(ulistQ.tids, tids)
+        np.minimum(posisi, len(ulistQ) - 1, out=posisi)
+        return ulistQ.tids[posisi] == tids
 
-        if not ulist.elements:
+    def construct_utility_list(self, ulistP, ulistQ, ulist_prefix=None):
+        # Mengkonstruksi utility list baru untuk gabungan item P dan Q #
+        # LA-Prune: utilitas Pxy dan semua perluasannya <= jumlah iutil + rutil Px di tid yang juga
+        # memuat y. Batas ini dimulai dari total Px lalu dikurangi entri Px yang tidak memuat y per
+        # blok; begitu di bawah min_util join dihentikan dan utility list tidak dibuat (None).
+        n = len(ulistP)
+        if not n or not len(ulistQ):
+            return None
+        if len(self._mask_join) < n:
+            self._mask_join = np.empty(max(n, 2 * len(self._mask_join)), dtype=bool)
+        mask = self._mask_join[:n]
+        batas = ulistP.sum_iutils + ulistP.sum_rutils
+        for a in range(0, n, UKURAN_BLOK_JOIN):
+            b = min(a + UKURAN_BLOK_JOIN, n)
+            cocok = self._anggota_tid(ulistP.tids[a:b], ulistQ)
+            mask[a:b] = cocok
+            hilang = ~cocok
+            if hilang.any():
+                batas -= ulistP.iutils[a:b][hilang].sum() + ulistP.rutils[a:b][hilang].sum()
+                if batas < self.min_util:
+                    self.join_dipangkas += 1
+                    return None
+        tids = ulistP.tids[mask]
+        if not len(tids):
             return None
-        return ulist
+        # Utilitas prefix dikurangkan agar tidak dihitung dua kali
+        idxQ = np.searchsorted(ulistQ.tids, tids)
+        iutils = ulistP.iutils[mask] + ulistQ.iutils[idxQ]
+        if ulist_prefix is not None:
+            iutils -= ulist_prefix.iutils[np.searchsorted(ulist_prefix.tids, tids)]
+        self.join_dibangun += 1
+        return UtilityList(ulistQ.item, tids, iutils, ulistQ.rutils[idxQ])
 
-    def jalankan(self, data_transaksi):
-        # Menjalankan semua proses EFIM#
+    def siapkan(self, data_transaksi):
+        # Tahap sebelum pencarian: muat data, TWU, pruning, urutan item, database terpangkas dan EUCS.
+        # Mengembalikan database terpangkas (CSR) atau None jika tidak ada item yang lolos.
+        self._reset_penghitung()
+        self.fase = dict()
+        mulai = time.perf_counter()
         self.muat_data(data_transaksi)
+        self._catat_fase('muat_data', mulai, self.offset.nbytes + self.item_transaksi.nbytes + self.util_transaksi.nbytes)
+        mulai = time.perf_counter()
         self.hitung_TWU()
-        self.hitung_EUCS()  # Tambahkan hitung EUCS
+        if self.k is not None:
+            self._naikkan_threshold_awal()
+            log.info("Mode top-%d: threshold awal %s", self.k, self.min_util)
         item_terpilih = self.prune_items_by_twu()
-        print(f"Item terpilih setelah TWU pruning: {item_terpilih}")
+        self._catat_fase('hitung_TWU', mulai, self.twu.nbytes)
+        self.pangkas_twu = len(self.label_item) - len(item_terpilih)
+        log.info("Item terpilih setelah TWU pruning: %d item", len(item_terpilih))
+
+        if not len(item_terpilih):
+            log.info("Tidak ada item yang memenuhi batas minimum utilitas.")
+            return None
 
-        if not item_terpilih:
-            print("Tidak ada item yang memenuhi batas minimum utilitas.")
+        # Sort berdasarkan TWU (naik), id item sebagai pemutus seri
+        self.rank_ke_item = item_terpilih[np.lexsort((item_terpilih, self.twu[item_terpilih]))]
+        mulai = time.perf_counter()
+        db = self.database_terpangkas(self.rank_ke_item)
+        self._catat_fase('database_terpangkas', mulai, sum(a.nbytes for a in db))
+        if self.mesin == 'utility_list':
+            mulai = time.perf_counter()
+            self.hitung_EUCS(self.rank_ke_item, db)  # EUCS dibangun setelah TWU pruning
+            self._catat_fase('hitung_EUCS', mulai, self.eucs.kunci.nbytes + self.eucs.nilai.nbytes)
+        return db
+
+    def cari(self, db):
+        # Generator pencarian serial untuk mesin terpilih: yield (simpul, utilitas)
+        if self.mesin == 'proyeksi':
+            return PencarianProyeksi(self, len(self.rank_ke_item)).mulai(*db)
+        mulai = time.perf_counter()
+        utility_lists = self.buat_utility_list(self.rank_ke_item, db)
+        self._catat_fase('buat_utility_list', mulai, sum(ulist.nbytes for ulist in utility_lists.values())
+                         + (self._bitmap.bit.nbytes if self._bitmap is not None else 0))
+        return self.efim_recursive(None, utility_lists, np.arange(len(self.rank_ke_item)))
+
+    def iter_itemset(self, data_transaksi):
+        # API streaming: yield (tuple kode item, utilitas) segera setelah itemset ditemukan, tanpa
+        # menampung hasil di high_utility_itemsets. Selalu serial; mode top-K baru bisa
+        # mengeluarkan hasil setelah pencarian selesai, begitu pula mode maksimal (disaring di akhir).
+        if self.k is not None or self.mode == 'maksimal':
+            self.jalankan(data_transaksi)
+            for itemset, util in self.high_utility_itemsets:
+                yield tuple(itemset), util
             return
-        
-        utility_lists = self.buat_utility_list(item_terpilih)
-        items_sorted = sorted(item_terpilih, key=lambda x: (self.items_twu[x], x))  # Sort berdasarkan TWU
-        self.efim_recursive([], utility_lists, items_sorted)
+        self._mulai_kendali()
+        alasan = None
+        try:
+            db = self.siapkan(data_transaksi)
+            if db is None:
+                return
+            pencarian = self.cari(db)
+            # Waktu rekursi pada mode streaming ikut memuat waktu konsumen di antara yield
+            mulai = time.perf_counter()
+            try:
+                for simpul, util in pencarian:
+                    yield tuple(self._label_itemset(simpul)), _skalar(util)
+            finally:
+                self._catat_fase('rekursi', mulai, self._memori_jalur_puncak)
+        except PencarianDihentikan as e:
+            alasan = e.alasan
+        finally:
+            self._selesai_kendali(alasan)
+
+    def jalankan(self, data_transaksi):
+        # Menjalankan semua proses EFIM#
+        # Jika dibatalkan atau anggaran habis, high_utility_itemsets berisi hasil parsial sejauh ini
+        self._mulai_kendali()
+        alasan = None
+        try:
+            db = self.siapkan(data_transaksi)
+            if db is None:
+                return
+            self.cek_kendali()
+
+            # Mode top-K dan pencarian terkendali (pembatalan/anggaran) selalu serial: threshold dan
+            # flag kendali hanya berlaku di proses ini
+            n_workers = jumlah_worker(self.n_workers) if self.k is None and not self.terkendali else 1
+            if n_workers > 1:
+                log.info("Mining paralel dengan %d proses", n_workers)
+                mulai = time.perf_counter()
+                try:
+                    tambang_paralel(self, db, n_workers)
+                finally:
+                    self._catat_fase('rekursi', mulai, self._memori_jalur_puncak)
+            else:
+                pencarian = self.cari(db)
+                mulai = time.perf_counter()
+                try:
+                    for simpul, util in pencarian:
+                        self._simpan_itemset(simpul, util)
+                finally:
+                    self._catat_fase('rekursi', mulai, self._memori_jalur_puncak)
+        except PencarianDihentikan as e:
+            alasan = e.alasan
+        finally:
+            self._selesai_kendali(alasan)
+        if self.k is not None:
+            self.high_utility_itemsets = [(itemset, util) for util, _, itemset in sorted(self._heap_topk, reverse=True)]
+        if self.mode == 'maksimal':
+            self.high_utility_itemsets = saring_maksimal(self.high_utility_itemsets)
+        log.info("Mesin %s: %d node dijelajahi, %d itemset ditemukan, %d join dibangun, %d join dipangkas LA-Prune",
+                 self.mesin, self.jumlah_node, len(self.high_utility_itemsets), self.join_dibangun, self.join_dipangkas)
+
+
+    def _ambil_baris(self, baris):
+        # Sub-CSR dari transaksi terpilih di store beserta TU penuh tiap transaksi
+        panjang = np.diff(self.offset)[baris]
+        posisi = indeks_gather(self.offset, baris)
+        nomor = np.repeat(np.arange(len(baris)), panjang)
+        utils = self.util_transaksi[posisi]
+        tu = np.bincount(nomor, weights=utils, minlength=len(baris)).astype(utils.dtype)
+        return nomor, self.item_transaksi[posisi], utils, tu
+
+    def _twu_dari_baris(self, baris, dtype):
+        nomor, items, _, tu = self._ambil_baris(baris)
+        return np.bincount(items, weights=tu[nomor], minlength=len(self.label_item)).astype(dtype)
+
+    def _eucs_dari_baris(self, baris, simpan_item):
+        # EUCS parsial dari transaksi terpilih, hanya atas item dengan simpan_item True.
+        # Memakai TU penuh (bukan TU setelah pruning) agar nilai pasangan tidak bergantung pada item yang
+        # lolos, sehingga EUCS bisa diperbarui per batch dengan penjumlahan/pengurangan saja.
+        nomor, items, _, tu = self._ambil_baris(baris)
+        simpan = simpan_item[items]
+        offset = np.zeros(len(baris) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(nomor[simpan], minlength=len(baris)), out=offset[1:])
+        return EUCS.dari_transaksi(offset, items[simpan], tu)
+
+    def _buffer_store(self):
+        # Buffer ArrayTumbuh untuk store; dibuat ulang jika array store diganti dari luar
+        store = (self.offset, self.item_transaksi, self.util_transaksi)
+        if self._store is None or not all(b.memegang(a) for b, a in zip(self._store, store)):
+            self._store = tuple(ArrayTumbuh(a, 2 * len(a)) for a in store)
+        return self._store
+
+    def _tambah_ke_store(self, offset, items, utils):
+        # Append CSR ke store secara in-place
+        buffer_offset, buffer_item, buffer_util = self._buffer_store()
+        self.offset = buffer_offset.tambah(offset[1:] + self.offset[-1])
+        self.item_transaksi = buffer_item.tambah(items)
+        self.util_transaksi = buffer_util.tambah(utils)
+
+    def _kurangi_hasil(self, nomor, items, utils, jumlah_baris):
+        # Kurangi utilitas itemset hasil dengan kontribusinya di transaksi yang dikeluarkan
+        # (sub-CSR nomor/items/utils); itemset yang turun di bawah min_util dibuang
+        urut = np.argsort(items, kind='stable')
+        items_urut = items[urut]
+        indeks_label = pd.Index(self.label_item)
+        hasil = []
+        for itemset, util in self.high_utility_itemsets:
+            ids = indeks_label.get_indexer(itemset)
+            awal = np.searchsorted(items_urut, ids, 'left')
+            akhir = np.searchsorted(items_urut, ids, 'right')
+            if (awal == akhir).any():
+                hasil.append((itemset, util))  # ada item yang tidak muncul di transaksi yang dikeluarkan
+                continue
+            pos = urut[indeks_rentang(awal, akhir - awal)]
+            jumlah = np.bincount(nomor[pos], minlength=jumlah_baris)
+            termuat = jumlah[nomor[pos]] == len(ids)
+            util = _skalar(util - utils[pos][termuat].sum())
+            if util >= self.min_util:
+                hasil.append((itemset, util))
+        self.high_utility_itemsets = hasil
+
+    def _keluarkan_baris(self, baris):
+        # Keluarkan transaksi (nomor baris store, terurut naik) dari TWU, EUCS, hasil dan store.
+        # Itemset yang tidak termuat di transaksi tersebut utilitasnya tidak berubah.
+        if len(baris) == self.jumlah_transaksi:
+            # Semua transaksi keluar (mis. jendela waktu yang tidak beririsan): cukup kosongkan
+            self.high_utility_itemsets = []
+            self.twu = np.zeros_like(self.twu)
+            self.eucs = EUCS(dtype=self.twu.dtype)
+        else:
+            nomor, items, utils, tu = self._ambil_baris(baris)
+            lolos_lama = self.twu >= self.min_util
+            self.twu = self.twu - np.bincount(items, weights=tu[nomor], minlength=len(self.twu)).astype(self.twu.dtype)
+            if self._eucs_inkremental:
+                self.eucs = self.eucs.gabung(self._eucs_dari_baris(baris, lolos_lama), -1)
+                lolos = self.twu >= self.min_util
+                if (lolos_lama & ~lolos).any():
+                    self.eucs = self.eucs.saring(lolos)
+            self._kurangi_hasil(nomor, items, utils, len(baris))
+        self.items_twu = defaultdict(int, zip(self.label_item.tolist(), self.twu.tolist()))
+
+        if len(baris) and baris[-1] == len(baris) - 1:
+            # Transaksi terdepan (jendela geser): cukup majukan awal buffer tanpa menyalin
+            self._buang_depan(len(baris), int(self.offset[len(baris)]))
+        else:
+            simpan = np.ones(self.jumlah_transaksi, dtype=bool)
+            simpan[baris] = False
+            baris_simpan = np.flatnonzero(simpan)
+            nomor, items, utils, _ = self._ambil_baris(baris_simpan)
+            self.offset = np.zeros(len(baris_simpan) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(nomor, minlength=len(baris_simpan)), out=self.offset[1:])
+            self.item_transaksi, self.util_transaksi = items, utils
+        self.label_transaksi = np.delete(self.label_transaksi, baris)
+
+    def _buang_depan(self, jumlah_baris, jumlah_elemen):
+        # Buang baris terdepan store secara in-place; offset digeser agar kembali mulai dari 0
+        buffer_offset, buffer_item, buffer_util = self._buffer_store()
+        self.offset = buffer_offset.buang_depan(jumlah_baris)
+        self.offset -= jumlah_elemen
+        self.item_transaksi = buffer_item.buang_depan(jumlah_elemen)
+        self.util_transaksi = buffer_util.buang_depan(jumlah_elemen)
+
+    def hapus_transaksi(self, label_transaksi):
+        # Kebalikan tambah_transaksi: keluarkan transaksi (berdasarkan ID transaksi) dan perbarui
+        # TWU, EUCS dan hasil tanpa mining ulang; hanya itemset di transaksi tersebut yang dihitung ulang
+        if self.k is not None or self.mode != 'semua':
+            raise ValueError("Mining inkremental tidak mendukung mode top-K maupun mode tertutup/maksimal")
+        posisi = pd.Index(self.label_transaksi).get_indexer(np.asarray(label_transaksi))
+        baris = np.unique(posisi[posisi >= 0])
+        if len(baris):
+            self._keluarkan_baris(baris)
+        return self.high_utility_itemsets
+
+    def tambah_transaksi(self, batch_transaksi):
+        # Mining inkremental: tambahkan batch transaksi ke store lalu perbarui TWU, EUCS dan hasil.
+        # Karena utilitas tidak negatif, hanya itemset yang muncul di transaksi baru yang utilitasnya
+        # berubah; pencarian ulang dibatasi ke cabang yang memuat transaksi baru dan hasilnya digabung
+        # dengan hasil lama. Hasil akhir sama dengan menjalankan ulang atas seluruh data.
+        # Transaksi lama yang mendapat baris tambahan dikeluarkan lalu dimasukkan kembali sebagai transaksi baru.
+        if self.k is not None or self.mode != 'semua':
+            raise ValueError("Mining inkremental tidak mendukung mode top-K maupun mode tertutup/maksimal")
+        if not len(self.label_transaksi):
+            self.jalankan(batch_transaksi)
+            return self.high_utility_itemsets
+
+        kode_tid, label_tid, kode_item, label_item, utilitas = faktorisasi_transaksi(
+            batch_transaksi, self.kolom_id_transaksi, self.kolom_id_item, self.kolom_utilitas)
+        kode_item, self.label_item = _perluas_label(self.label_item, label_item, kode_item)
+
+        # Transaksi lama yang mendapat baris tambahan: baris lamanya ikut masuk batch lalu transaksi
+        # lama dikeluarkan dari store
+        posisi = pd.Index(self.label_transaksi).get_indexer(label_tid)
+        ada = np.flatnonzero(posisi >= 0)
+        if len(ada):
+            urut = np.argsort(posisi[ada])
+            ada, baris_lama = ada[urut], posisi[ada][urut]
+            nomor, items_lama, utils_lama, _ = self._ambil_baris(baris_lama)
+            kode_tid = np.concatenate([ada[nomor], kode_tid])
+            kode_item = np.concatenate([items_lama, kode_item])
+            utilitas = np.concatenate([utils_lama, utilitas])
+            self._keluarkan_baris(baris_lama)
+
+        dtype = np.result_type(self.util_transaksi.dtype, dtype_utilitas(utilitas))
+        twu = np.zeros(len(self.label_item), dtype=dtype)
+        twu[:len(self.twu)] = self.twu
+        lolos_lama = twu >= self.min_util
+        lolos_lama[len(self.twu):] = False
+
+        # Transaksi batch ditambahkan di akhir store
+        awal_baru = self.jumlah_transaksi
+        self.label_transaksi = np.concatenate([self.label_transaksi, label_tid])
+        offset, items, utils = susun_csr(kode_tid, kode_item, utilitas, len(label_tid))
+        self._tambah_ke_store(offset, items, utils)
+        baris_batch = np.arange(awal_baru, self.jumlah_transaksi)
+        twu += self._twu_dari_baris(baris_batch, dtype)
+        self.twu = twu
+        self.items_twu = defaultdict(int, zip(self.label_item.tolist(), self.twu.tolist()))
+
+        # EUCS: tambah pasangan dari transaksi baru; item yang baru lolos TWU butuh pasangannya
+        # dari transaksi lama juga. EUCS dari mining awal dibangun ulang sekali dengan TU penuh.
+        lolos = twu >= self.min_util
+        if self._eucs_inkremental:
+            if (lolos_lama & ~lolos).any():
+                self.eucs = self.eucs.saring(lolos)
+            self.eucs = self.eucs.gabung(self._eucs_dari_baris(baris_batch, lolos))
+            baru_lolos = lolos & ~lolos_lama
+            if baru_lolos.any():
+                batas = self.offset[awal_baru]
+                baris = np.unique(indeks_baris(self.offset[:awal_baru + 1])[baru_lolos[self.item_transaksi[:batas]]])
+                parsial = self._eucs_dari_baris(baris, lolos)
+                a, b = pasangan_item(parsial.kunci)
+                simpan = baru_lolos[a] | baru_lolos[b]
+                self.eucs = self.eucs.gabung(EUCS(parsial.kunci[simpan], parsial.nilai[simpan]))
+        else:
+            self.eucs = self._eucs_dari_baris(np.arange(self.jumlah_transaksi), lolos)
+            self._eucs_inkremental = True
+
+        # Pencarian delta (selalu mesin utility list, serial): mulai hanya dari item yang muncul di transaksi baru
+        item_terpilih = np.flatnonzero(lolos)
+        self.rank_ke_item = item_terpilih[np.lexsort((item_terpilih, twu[item_terpilih]))]
+        delta = dict()
+        self._reset_penghitung()
+        if len(item_terpilih):
+            baris_baru = np.arange(self.jumlah_transaksi) >= awal_baru
+            db = self.database_terpangkas(self.rank_ke_item, baris_baru)
+            utility_lists = self.buat_utility_list(self.rank_ke_item, db)
+            items_awal = np.array([r for r, ulist in utility_lists.items()
+                                   if len(ulist) and ulist.tids[-1] >= self.tid_baru_awal], dtype=np.int64)
+            try:
+                for simpul, util in self.efim_recursive(None, utility_lists, items_awal):
+                    itemset = self._label_itemset(simpul)
+                    delta[frozenset(itemset)] = (itemset, _skalar(util))
+            finally:
+                self.tid_baru_awal = None
+
+        # Gabungkan: itemset lama diperbarui utilitasnya, itemset baru ditambahkan di akhir
+        posisi = {frozenset(itemset): i for i, (itemset, _) in enumerate(self.high_utility_itemsets)}
+        for kunci, (itemset, util) in delta.items():
+            if kunci in posisi:
+                i = posisi[kunci]
+                self.high_utility_itemsets[i] = (self.high_utility_itemsets[i][0], util)
+            else:
+                self.high_utility_itemsets.append((itemset, util))
+        log.info("Mining inkremental: %d transaksi baru, %d itemset dihitung ulang, %d itemset total",
+                 len(label_tid), len(delta), len(self.high_utility_itemsets))
+        return self.high_utility_itemsets
+
+
+def tulis_itemset(itemsets, berkas, format='ndjson'):
+    # Menulis itemset dari iterable (mis. EFIM.iter_itemset) langsung ke berkas teks satu baris per
+    # itemset, sehingga memori tetap kecil berapa pun jumlah hasilnya. Mengembalikan jumlah baris.
+    import json
+    jumlah = 0
+    for itemset, util in itemsets:
+        if format == 'ndjson':
+            berkas.write(json.dumps({'itemset': list(itemset), 'utility': util}) + '\n')
+        else:
+            berkas.write(','.join(str(item) for item in itemset) + f'\t{util}\n')
+        jumlah += 1
+    return jumlah
+
 
-def jalankan_algoritma_efim(data_transaksi, batas_utilitas_minimum, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG', kolom_utilitas='UTILITY'):
+def jalankan_algoritma_efim(data_transaksi, batas_utilitas_minimum, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG', kolom_utilitas='UTILITY', mesin='utility_list', n_workers=1, k=None, mode='semua'):
+    # k: mode top-K (batas_utilitas_minimum boleh None/0, threshold dinaikkan otomatis)
+    # mode: 'semua', 'tertutup' (closed HUI) atau 'maksimal' (maximal HUI)
     efim = EFIM(
         batas_utilitas_minimum,
         kolom_id_transaksi=kolom_id_transaksi,
         kolom_id_item=kolom_id_item,
-        kolom_utilitas=kolom_utilitas
+        kolom_utilitas=kolom_utilitas,
+        mesin=mesin,
+        n_workers=n_workers,
+        k=k,
+        mode=mode
     )
     efim.jalankan(data_transaksi)
     return efim.high_utility_itemsets
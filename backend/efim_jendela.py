@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from efim import EFIM
+
+# Mining HUI per jendela waktu atas kolom TANGGAL dalam satu lintasan data terurut tanggal.
+# - 'harian', 'mingguan', 'bulanan': jendela tetap yang tidak beririsan (per periode kalender)
+# - 'geser': jendela geser selebar lebar_hari yang maju setiap langkah_hari
+# Satu objek EFIM dipakai sepanjang lintasan: transaksi yang keluar jendela dikeluarkan
+# (hapus_transaksi) dan yang masuk ditambahkan (tambah_transaksi), sehingga TWU, EUCS, store CSR
+# dan hasil jendela sebelumnya diperbarui alih-alih menjalankan EFIM penuh per jendela.
+
+JENIS_JENDELA = ('harian', 'mingguan', 'bulanan', 'geser')
+_PERIODE = {'harian': 'D', 'mingguan': 'W', 'bulanan': 'M'}
+
+
+def urutkan_per_tanggal(data_transaksi, kolom_id_transaksi='ID_PENJUALAN', kolom_tanggal='TANGGAL'):
+    # Tanggal transaksi = tanggal paling awal di baris-barisnya; baris diurutkan (tanggal, transaksi)
+    # sehingga setiap jendela adalah rentang baris yang bersambung
+    tanggal = pd.to_datetime(data_transaksi[kolom_tanggal], errors='coerce')
+    tanggal_transaksi = tanggal.groupby(data_transaksi[kolom_id_transaksi], sort=False, observed=True).transform('min')
+    data = data_transaksi.assign(_TANGGAL_TRANSAKSI=tanggal_transaksi.dt.normalize())
+    data = data[data['_TANGGAL_TRANSAKSI'].notna()]
+    return data.sort_values(['_TANGGAL_TRANSAKSI', kolom_id_transaksi], kind='stable').reset_index(drop=True)
+
+
+def batas_jendela(tanggal, jenis='harian', lebar_hari=7, langkah_hari=1):
+    # Daftar (awal, akhir) jendela setengah terbuka [awal, akhir) dari array tanggal terurut
+    if jenis not in JENIS_JENDELA:
+        raise ValueError(f"Jenis jendela tidak dikenal: {jenis}. Pilihan: {JENIS_JENDELA}")
+    if not len(tanggal):
+        return []
+    if jenis == 'geser':
+        if lebar_hari <= 0 or langkah_hari <= 0:
+            raise ValueError("lebar_hari dan langkah_hari harus lebih besar dari 0")
+        pertama, terakhir = tanggal[0], tanggal[-1]
+        jumlah = max(1, int(np.ceil(((terakhir - pertama).days - lebar_hari + 1) / langkah_hari)) + 1)
+        awal = pd.DatetimeIndex([pertama + pd.Timedelta(days=i * langkah_hari) for i in range(jumlah)])
+        return list(zip(awal, awal + pd.Timedelta(days=lebar_hari)))
+    periode = pd.PeriodIndex(pd.DatetimeIndex(tanggal), freq=_PERIODE[jenis]).unique()
+    return [(p.start_time, (p + 1).start_time) for p in periode]
+
+
+def tambang_per_jendela(data_transaksi, min_util, jenis='harian', lebar_hari=7, langkah_hari=1,
+                        kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG',
+                        kolom_utilitas='UTILITY', kolom_tanggal='TANGGAL'):
+    # Generator: yield dict per jendela berisi awal, akhir, jumlah_transaksi dan itemset (list salinan)
+    data = urutkan_per_tanggal(data_transaksi, kolom_id_transaksi, kolom_tanggal)
+    tanggal = data['_TANGGAL_TRANSAKSI'].to_numpy()
+    kolom = [kolom_id_transaksi, kolom_id_item, kolom_utilitas]
+    efim = EFIM(min_util, kolom_id_transaksi=kolom_id_transaksi, kolom_id_item=kolom_id_item,
+                kolom_utilitas=kolom_utilitas)
+
+    # Pointer baris [kiri, kanan) yang sedang berada di dalam jendela
+    kiri = kanan = 0
+    for awal, akhir in batas_jendela(pd.DatetimeIndex(tanggal), jenis, lebar_hari, langkah_hari):
+        kiri_baru = int(np.searchsorted(tanggal, awal.to_datetime64(), 'left'))
+        kanan_baru = max(kiri_baru, int(np.searchsorted(tanggal, akhir.to_datetime64(), 'left')))
+        if kiri_baru > kiri:
+            # Transaksi yang keluar jendela (hanya yang pernah masuk)
+            keluar = data[kolom_id_transaksi].iloc[kiri:min(kiri_baru, kanan)].unique()
+            efim.hapus_transaksi(keluar)
+        masuk = data.iloc[max(kanan, kiri_baru):kanan_baru]
+        if len(masuk):
+            efim.tambah_transaksi(masuk[kolom])
+        kiri, kanan = kiri_baru, max(kanan, kanan_baru)
+        yield {
+            'awal': awal,
+            'akhir': akhir,
+            'jumlah_transaksi': efim.jumlah_transaksi,
+            'itemset': list(efim.high_utility_itemsets),
+        }
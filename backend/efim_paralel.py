@@ -0,0 +1,117 @@
+import heapq
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from efim_proyeksi import PencarianProyeksi
+from eucs import EUCS
+from toko_transaksi import array_bersama, petakan_array
+
+# Mining paralel: ruang pencarian dibagi berdasarkan item level pertama (urutan items_sorted).
+# Sub-tree tiap item level pertama saling independen, sehingga tiap proses worker cukup
+# memegang database terpangkas + EUCS lalu menambang item-item yang dibagikan kepadanya.
+# Database terpangkas dan EUCS dibagikan sebagai berkas yang dipetakan (toko_transaksi.array_bersama)
+# sehingga tiap worker membacanya tanpa salinan, apa pun metode start proses-nya.
+
+# Jumlah bagian per worker; lebih dari satu agar pool bisa menyeimbangkan beban secara dinamis
+BAGIAN_PER_WORKER = 4
+
+_efim_worker = None
+_konteks_worker = None
+
+
+def jumlah_worker(n_workers):
+    # None atau <= 0 berarti pakai semua core
+    if n_workers is None or n_workers <= 0:
+        return os.cpu_count() or 1
+    return int(n_workers)
+
+
+def bagi_partisi(estimasi, jumlah_bagian):
+    # Longest Processing Time: item dengan estimasi sub-tree terbesar dimasukkan lebih dulu
+    # ke bagian yang bebannya paling kecil. Item di tiap bagian dikembalikan terurut naik.
+    jumlah_bagian = max(1, min(jumlah_bagian, len(estimasi)))
+    beban = [(0.0, k) for k in range(jumlah_bagian)]
+    bagian = [[] for _ in range(jumlah_bagian)]
+    for i in np.argsort(-np.asarray(estimasi, dtype=np.float64), kind='stable').tolist():
+        total, k = heapq.heappop(beban)
+        bagian[k].append(i)
+        heapq.heappush(beban, (total + float(estimasi[i]), k))
+    return [sorted(b) for b in bagian if b]
+
+
+def _inisialisasi_worker(state):
+    # Dijalankan sekali per proses: bangun ulang EFIM, utility list / database akar dari state
+    global _efim_worker, _konteks_worker
+    from efim import EFIM
+    efim = EFIM(state['min_util'], mesin=state['mesin'], mode=state['mode'])
+    efim.label_item = state['label_item']
+    efim.rank_ke_item = state['rank_ke_item']
+    arrays = petakan_array(*state['bersama'])
+    db = arrays['offset'], arrays['rank'], arrays['utils']
+    if efim.mesin == 'proyeksi':
+        pencarian = PencarianProyeksi(efim, len(efim.rank_ke_item))
+        db_akar, _, _ = pencarian.akar(*db)
+        _konteks_worker = (pencarian, db_akar)
+    else:
+        efim.eucs = EUCS(arrays['eucs_kunci'], arrays['eucs_nilai'])
+        _konteks_worker = (efim.buat_utility_list(efim.rank_ke_item, db), np.arange(len(efim.rank_ke_item)))
+    _efim_worker = efim
+
+
+def _tambang_bagian(item_akar):
+    # Menambang sub-tree untuk daftar item level pertama (berupa rank)
+    efim = _efim_worker
+    efim.high_utility_itemsets = []
+    efim._reset_penghitung()
+    efim.utilitas_unit = dict()
+    if efim.mesin == 'proyeksi':
+        pencarian, db_akar = _konteks_worker
+        hasil = pencarian.cari(None, db_akar, np.asarray(item_akar, dtype=np.int64))
+    else:
+        utility_lists, items_sorted = _konteks_worker
+        hasil = efim.efim_recursive(None, utility_lists, items_sorted, indeks=item_akar)
+    for simpul, util in hasil:
+        efim._simpan_itemset(simpul, util)
+    return efim.high_utility_itemsets, efim.utilitas_unit, efim.penghitung(), efim._memori_jalur_puncak
+
+
+def tambang_paralel(efim, db, n_workers):
+    # Menambang dengan process pool lalu menggabungkan hasil secara deterministik:
+    # urutan akhir sama persis dengan urutan DFS pada mode serial.
+    m = len(efim.rank_ke_item)
+    if efim.mesin == 'proyeksi':
+        _, primary, su = PencarianProyeksi(efim, m).akar(*db)
+        item_akar = primary
+        estimasi = su[primary].astype(np.float64) * (m - primary)
+    else:
+        item_akar = np.arange(m)
+        estimasi = efim.twu[efim.rank_ke_item].astype(np.float64) * (m - item_akar)
+    if not len(item_akar):
+        return
+
+    # Estimasi ukuran sub-tree ~ TWU/su item x jumlah item yang masih bisa ditambahkan setelahnya
+    bagian = [item_akar[b].tolist() for b in bagi_partisi(estimasi, n_workers * BAGIAN_PER_WORKER)]
+    state = {
+        'min_util': efim.min_util,
+        'mesin': efim.mesin,
+        'mode': efim.mode,
+        'label_item': efim.label_item,
+        'rank_ke_item': efim.rank_ke_item,
+    }
+    arrays = {'offset': db[0], 'rank': db[1], 'utils': db[2], 'eucs_kunci': efim.eucs.kunci, 'eucs_nilai': efim.eucs.nilai}
+    hasil = []
+    with array_bersama(arrays) as bersama, ProcessPoolExecutor(
+            max_workers=min(n_workers, len(bagian)), initializer=_inisialisasi_worker,
+            initargs=({**state, 'bersama': bersama},)) as pool:
+        for itemsets, utilitas_unit, penghitung, memori_jalur in pool.map(_tambang_bagian, bagian):
+            hasil.extend(itemsets)
+            efim.utilitas_unit.update(utilitas_unit)
+            for nama, nilai in penghitung.items():
+                setattr(efim, nama, getattr(efim, nama) + nilai)
+            # Memori rekursi: puncak jalur DFS per worker (tiap proses memegang jalurnya sendiri)
+            efim._memori_jalur_puncak = max(efim._memori_jalur_puncak, memori_jalur)
+
+    # Item pertama tiap itemset adalah item level pertama; urutkan stabil berdasarkan rank-nya
+    rank_label = {label: r for r, label in enumerate(efim.label_item[efim.rank_ke_item].tolist())}
+    hasil.sort(key=lambda itemset: rank_label[itemset[0][0]])
+    efim.high_utility_itemsets.extend(hasil)
@@ -0,0 +1,117 @@
+import numpy as np
+from csr import indeks_baris, indeks_rentang, gabung_transaksi_identik, sisa_utilitas, buang_baris_kosong
+
+# Mesin pencarian EFIM dengan projected database (Zida dkk.):
+# - High-utility Database Projection: tiap node hanya menyimpan sisa transaksi setelah item terakhir
+#   prefix beserta utilitas prefix (pu) per transaksi.
+# - High-utility Transaction Merging: transaksi proyeksi yang identik digabung di setiap level.
+# - Fast Utility Counting: sub-tree utility (su) dan local utility (lu) dihitung sekaligus ke dalam
+#   utility-bin (array sepanjang jumlah item) dengan satu kali bincount per node.
+
+
+class DatabaseProyeksi:
+    # Database (terproyeksi) dalam bentuk CSR: item berupa rank (TWU naik) dan terurut di tiap transaksi
+    __slots__ = ('offset', 'items', 'utils', 'pu', 'sisa')
+
+    def __init__(self, offset, items, utils, pu):
+        self.offset = offset
+        self.items = items
+        self.utils = utils
+        self.pu = pu                               # utilitas prefix per transaksi
+        self.sisa = sisa_utilitas(offset, utils)   # remaining utility per posisi
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, nama).nbytes for nama in self.__slots__)
+
+    def posisi_per_item(self, jumlah_item):
+        # Posisi kemunculan tiap item, dikelompokkan per item (urut transaksi)
+        urut = np.argsort(self.items, kind='stable')
+        batas = np.zeros(jumlah_item + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.items, minlength=jumlah_item), out=batas[1:])
+        return urut, batas
+
+
+class PencarianProyeksi:
+    def __init__(self, efim, jumlah_item):
+        self.efim = efim
+        self.m = jumlah_item
+
+    def _bin(self, items, bobot, dtype):
+        # Utility-bin: akumulasi bobot per item dalam satu kali bincount
+        return np.bincount(items, weights=bobot, minlength=self.m).astype(dtype)
+
+    def akar(self, offset, items, utils):
+        # Node akar: prefix kosong, su(∅, z) dihitung dari database hasil TWU pruning
+        db = DatabaseProyeksi(offset, items, utils, np.zeros(len(offset) - 1, dtype=utils.dtype))
+        su = self._bin(items, db.sisa + utils, utils.dtype)
+        return db, np.flatnonzero(su >= self.efim.min_util), su
+
+    def mulai(self, offset, items, utils):
+        db, primary, _ = self.akar(offset, items, utils)
+        return self.cari(None, db, primary)
+
+    def cari(self, prefix, db, primary):
+        # Generator: yield (simpul, utilitas); simpul = (rank, simpul_induk) berbagi prefix
+        efim = self.efim
+        dtype = db.utils.dtype
+        urut, batas = db.posisi_per_item(self.m)
+        baris_db = indeks_baris(db.offset)
+
+        for i in primary.tolist():
+            efim.hitung_node()
+            simpul = (i, prefix)
+            pos = urut[batas[i]:batas[i + 1]]
+            if not len(pos):
+                continue
+            baris = baris_db[pos]
+            u_beta = db.pu[baris] + db.utils[pos]
+            total = u_beta.sum()
+            if total >= efim.min_util:
+                yield simpul, total
+
+            # Proyeksi: sisa transaksi setelah item i
+            panjang = db.offset[baris + 1] - pos - 1
+            ada = panjang > 0
+            if not ada.any():
+                continue
+            pos, u_beta, panjang = pos[ada], u_beta[ada], panjang[ada]
+            re = db.sisa[pos]
+            offset_baru = np.zeros(len(pos) + 1, dtype=np.int64)
+            np.cumsum(panjang, out=offset_baru[1:])
+            idx = indeks_rentang(pos + 1, panjang)
+            items_baru = db.items[idx]
+
+            # Fast Utility Counting: lu(β, z) dan su(β, z) untuk semua z sekaligus
+            lu = self._bin(items_baru, np.repeat(u_beta + re, panjang), dtype)
+            su = self._bin(items_baru, np.repeat(u_beta, panjang) + db.sisa[idx] + db.utils[idx], dtype)
+            secondary = lu >= efim.min_util
+            primary_baru = np.flatnonzero(su >= efim.min_util)
+            # Primary ⊆ Secondary karena su <= lu
+            efim.pangkas_lu += int(np.count_nonzero((lu > 0) & ~secondary))
+            efim.pangkas_su += int(np.count_nonzero(secondary)) - len(primary_baru)
+            if not len(primary_baru):
+                continue
+
+            # Buang item di luar Secondary(β) dari database proyeksi
+            simpan = secondary[items_baru]
+            baris_baru = indeks_baris(offset_baru)[simpan]
+            offset_baru = np.zeros(len(pos) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(baris_baru, minlength=len(pos)), out=offset_baru[1:])
+            tidak_kosong = np.diff(offset_baru) > 0
+            offset_baru = buang_baris_kosong(offset_baru)
+            pu_baru = u_beta[tidak_kosong]
+
+            # High-utility Transaction Merging di setiap level
+            offset_baru, items_gabung, utils_gabung, grup = gabung_transaksi_identik(
+                offset_baru, items_baru[simpan], db.utils[idx][simpan], dtype)
+            pu_baru = np.bincount(grup, weights=pu_baru, minlength=len(offset_baru) - 1).astype(dtype)
+
+            db_baru = DatabaseProyeksi(offset_baru, items_gabung, utils_gabung, pu_baru)
+            efim.kedalaman += 1
+            efim.catat_memori_jalur(db_baru.nbytes)
+            try:
+                yield from self.cari(simpul, db_baru, primary_baru)
+            finally:
+                efim.catat_memori_jalur(-db_baru.nbytes)
+            efim.kedalaman -= 1
@@ -0,0 +1,97 @@
+import numpy as np
+from csr import indeks_baris, indeks_rentang
+
+# Batas jumlah pasangan per blok saat membangun EUCS agar memori puncak tetap kecil
+PASANGAN_PER_BLOK = 4_000_000
+
+
+def kunci_pasangan(a, b):
+    # Kunci int64 untuk pasangan tak berurut {a, b}: id kecil di 32 bit atas, id besar di 32 bit bawah
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    return (np.minimum(a, b) << 32) | np.maximum(a, b)
+
+
+def pasangan_item(kunci):
+    # Kebalikan kunci_pasangan: (id kecil, id besar)
+    return kunci >> 32, kunci & 0xFFFFFFFF
+
+
+class EUCS:
+    # Estimated Utility Co-occurrence Structure versi sparse.
+    # Tiap pasangan item disimpan sekali sebagai kunci int64 terurut + nilai TWU pasangan,
+    # sehingga lookup cukup searchsorted tanpa hashing tuple.
+
+    def __init__(self, kunci=None, nilai=None, dtype=np.int64):
+        self.kunci = np.empty(0, dtype=np.int64) if kunci is None else kunci
+        self.nilai = np.empty(0, dtype=dtype) if nilai is None else nilai
+
+    def __len__(self):
+        return len(self.kunci)
+
+    def __getitem__(self, pasangan):
+        a, b = pasangan
+        return self.ambil(a, np.array([b]))[0]
+
+    @staticmethod
+    def _agregasi(kunci, bobot, dtype):
+        unik, invers = np.unique(kunci, return_inverse=True)
+        return unik, np.bincount(invers, weights=bobot, minlength=len(unik)).astype(dtype)
+
+    @classmethod
+    def dari_transaksi(cls, offset, items, tu):
+        # Bangun EUCS dalam batch dari CSR (offset, id item) dan utilitas transaksi tu.
+        # Pasangan dibentuk per posisi p dengan seluruh posisi setelahnya di transaksi yang sama.
+        dtype = tu.dtype
+        n = len(offset) - 1
+        panjang = np.diff(offset)
+        kumulatif = np.cumsum(panjang * (panjang - 1) // 2)
+
+        bagian_kunci, bagian_nilai = [], []
+        awal = 0
+        while awal < n:
+            # Satu blok berisi transaksi sebanyak mungkin selama jumlah pasangannya <= PASANGAN_PER_BLOK
+            sebelum = kumulatif[awal - 1] if awal else 0
+            akhir = min(n, max(awal + 1, int(np.searchsorted(kumulatif, sebelum + PASANGAN_PER_BLOK, 'right'))))
+            posisi = np.arange(offset[awal], offset[akhir], dtype=np.int64)
+            baris = indeks_baris(offset[awal:akhir + 1] - offset[awal]) + awal
+            sisa = offset[baris + 1] - posisi - 1
+            awal = akhir
+            kiri = np.repeat(posisi, sisa)
+            if not len(kiri):
+                continue
+            kanan = indeks_rentang(posisi + 1, sisa)
+            k, v = cls._agregasi(kunci_pasangan(items[kiri], items[kanan]), np.repeat(tu[baris], sisa), dtype)
+            bagian_kunci.append(k)
+            bagian_nilai.append(v)
+
+        if not bagian_kunci:
+            return cls(dtype=dtype)
+        if len(bagian_kunci) == 1:
+            return cls(bagian_kunci[0], bagian_nilai[0])
+        return cls(*cls._agregasi(np.concatenate(bagian_kunci), np.concatenate(bagian_nilai), dtype))
+
+    def ambil(self, a, bs):
+        # Nilai EUCS untuk pasangan (a, b) bagi setiap b di bs; pasangan yang tidak pernah muncul bernilai 0
+        kunci = kunci_pasangan(a, bs)
+        if not len(self.kunci):
+            return np.zeros(len(kunci), dtype=self.nilai.dtype)
+        posisi = np.searchsorted(self.kunci, kunci)
+        np.minimum(posisi, len(self.kunci) - 1, out=posisi)
+        return np.where(self.kunci[posisi] == kunci, self.nilai[posisi], 0)
+
+    def gabung(self, lain, tanda=1):
+        # EUCS baru = self + tanda * lain; dipakai saat transaksi ditambah (tanda 1) atau dikeluarkan (-1)
+        if not len(lain):
+            return self
+        dtype = np.result_type(self.nilai.dtype, lain.nilai.dtype)
+        kunci, nilai = self._agregasi(np.concatenate([self.kunci, lain.kunci]),
+                                      np.concatenate([self.nilai, tanda * lain.nilai]), dtype)
+        simpan = nilai != 0
+        return EUCS(kunci[simpan], nilai[simpan])
+
+    def saring(self, simpan_item):
+        # Hanya pasangan yang kedua itemnya bernilai True di simpan_item (mask per id item)
+        a, b = pasangan_item(self.kunci)
+        simpan = simpan_item[a] & simpan_item[b]
+        return EUCS(self.kunci[simpan], self.nilai[simpan])
@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from pipeline_preprocessing import kelompokkan
+
+# Paginasi hasil besar (itemset EFIM, transaksi yang dikelompokkan). Hasil diurutkan sekali secara
+# deterministik lalu dipotong per halaman; cursor adalah posisi awal halaman berikutnya di urutan
+# tersebut sehingga stabil selama dataset dan parameter sama. Hanya baris di halaman yang diformat
+# menjadi JSON, sehingga respons dan memori puncak dibatasi ukuran halaman, bukan ukuran hasil.
+
+UKURAN_HALAMAN = 100
+MAKS_UKURAN_HALAMAN = 5000
+# 'utility': utilitas menurun, 'utility_asc': menaik, 'id': urutan asli (itemset: urutan ditemukan,
+# transaksi: urut id seperti grouped_data /preprocess)
+URUTAN = ('utility', 'utility_asc', 'id')
+
+
+def parameter_halaman(sumber, ukuran_bawaan=UKURAN_HALAMAN):
+    # (offset, ukuran, urut) dari dict parameter request; ValueError jika tidak valid
+    cursor = sumber.get('cursor')
+    offset = int(cursor) if cursor not in (None, '') else 0
+    ukuran = int(sumber['page_size']) if sumber.get('page_size') not in (None, '') else ukuran_bawaan
+    urut = sumber.get('urut') or 'utility'
+    if offset < 0:
+        raise ValueError('cursor tidak valid')
+    if not 1 <= ukuran <= MAKS_UKURAN_HALAMAN:
+        raise ValueError(f'page_size harus antara 1 dan {MAKS_UKURAN_HALAMAN}')
+    if urut not in URUTAN:
+        raise ValueError(f'urut harus salah satu dari {URUTAN}')
+    return offset, ukuran, urut
+
+
+def info_halaman(total, offset, ukuran, urut):
+    # Metadata halaman untuk respons; next_cursor None berarti halaman terakhir
+    akhir = offset + ukuran
+    return {
+        'total': total,
+        'cursor': str(offset),
+        'next_cursor': str(akhir) if akhir < total else None,
+        'page_size': ukuran,
+        'urut': urut,
+    }
+
+
+def urutkan_itemset(itemsets, urut):
+    # Urutan deterministik: utilitas, lalu itemset lebih pendek, lalu label item
+    if urut == 'id':
+        return list(itemsets)
+    tanda = -1 if urut == 'utility' else 1
+    return sorted(itemsets, key=lambda x: (tanda * x[1], len(x[0]), [str(item) for item in x[0]]))
+
+
+def urutan_transaksi(df, urut, kolom_id_transaksi='ID_PENJUALAN', kolom_utilitas='UTILITY'):
+    # Array id transaksi dalam urutan halaman; urut utility memakai total utilitas per transaksi
+    # (utilitas sama: urut id)
+    if urut == 'id' or kolom_utilitas not in df.columns:
+        return df.groupby(kolom_id_transaksi, observed=True).size().index.to_numpy()
+    tu = df.groupby(kolom_id_transaksi, observed=True)[kolom_utilitas].sum()
+    return urutan_dari_total(tu.index.to_numpy(), tu.to_numpy(), urut)
+
+
+def urutan_dari_total(ids, total, urut):
+    # Seperti urutan_transaksi, dari id transaksi terurut dan total utilitasnya yang sudah dihitung
+    # (mis. ringkasan transaksi preprocessing streaming)
+    if urut == 'id':
+        return ids
+    urutan = np.argsort(-total if urut == 'utility' else total, kind='stable')
+    return ids[urutan]
+
+
+def _ikuti_urutan(grouped, ids, kolom_id_transaksi):
+    # kelompokkan() mengurutkan per id; kembalikan ke urutan ids
+    posisi = pd.Index(ids).get_indexer(grouped[kolom_id_transaksi].to_numpy())
+    return grouped.iloc[np.argsort(posisi, kind='stable')].reset_index(drop=True)
+
+
+def kelompokkan_transaksi(df, ids, kolom_id_transaksi='ID_PENJUALAN'):
+    # kelompokkan() hanya untuk transaksi ids, dengan urutan baris mengikuti ids
+    return _ikuti_urutan(kelompokkan(df[df[kolom_id_transaksi].isin(ids)]), ids, kolom_id_transaksi)
+
+
+def iter_blok_transaksi(df, urut, ukuran_blok=1000, kolom_id_transaksi='ID_PENJUALAN'):
+    # Generator DataFrame kelompok per blok transaksi (untuk respons NDJSON)
+    ids = urutan_transaksi(df, urut, kolom_id_transaksi)
+    if len(ids) == 0:
+        return
+    # Baris diurutkan sekali per posisi transaksi agar tiap blok cukup diiris
+    posisi = pd.Index(ids).get_indexer(df[kolom_id_transaksi].to_numpy())
+    urutan = np.argsort(posisi, kind='stable')
+    batas = np.searchsorted(posisi[urutan], np.arange(0, len(ids) + ukuran_blok, ukuran_blok))
+    for i, (awal, akhir) in enumerate(zip(batas[:-1], batas[1:])):
+        if awal < akhir:
+            blok = ids[i * ukuran_blok:(i + 1) * ukuran_blok]
+            yield _ikuti_urutan(kelompokkan(df.iloc[urutan[awal:akhir]]), blok, kolom_id_transaksi)
+
+
+class CacheKecil:
+    # LRU kecil thread-safe untuk turunan hasil yang mahal dihitung ulang per halaman
+    # (daftar itemset terurut, indeks item, urutan transaksi)
+
+    def __init__(self, maks_entri=8):
+        self.maks_entri = maks_entri
+        self._entri = OrderedDict()
+        self._kunci = threading.Lock()
+
+    def ambil(self, kunci, hitung):
+        with self._kunci:
+            if kunci in self._entri:
+                self._entri.move_to_end(kunci)
+                return self._entri[kunci]
+        nilai = hitung()
+        with self._kunci:
+            self._entri[kunci] = nilai
+            self._entri.move_to_end(kunci)
+            while len(self._entri) > self.maks_entri:
+                self._entri.popitem(last=False)
+        return nilai
@@ -0,0 +1,51 @@
+import numpy as np
+from collections import defaultdict
+
+# Mode keluaran EFIM selain 'semua' (semua high utility itemset / HUI):
+# - 'tertutup': closed HUI, yaitu HUI tanpa superset sejati dengan tidset yang sama. Cabang yang tidak
+#   mungkin memuat itemset tertutup dipangkas saat pencarian (lihat EFIM._efim_tertutup). Tiap closed
+#   HUI membawa utilitas per item (utility unit array) di tidset-nya sehingga semua HUI bisa dibangun
+#   ulang tanpa mining: utilitas X = maksimum, atas closed HUI C yang memuat X, dari jumlah utilitas
+#   item X di C (closure X memberi nilai tepat, closed superset lain tidset-nya lebih kecil).
+# - 'maksimal': HUI tanpa superset sejati yang juga HUI; selalu tertutup, jadi didapat dari pencarian
+#   tertutup lalu disaring superset-nya.
+
+MODE_HASIL = ('semua', 'tertutup', 'maksimal')
+# Batas panjang closed HUI yang subset-nya dijabarkan saat membangun ulang (2^n subset)
+MAKS_PANJANG_PULIHKAN = 24
+
+
+def saring_maksimal(itemsets):
+    # Itemset (itemset, utilitas, ...) yang tidak punya superset sejati di itemsets; urutan asal dipertahankan.
+    # Diproses dari yang terpanjang dengan indeks terbalik item -> nomor itemset maksimal yang memuatnya.
+    pemuat = defaultdict(set)
+    maksimal = []
+    for i in sorted(range(len(itemsets)), key=lambda i: -len(itemsets[i][0])):
+        itemset = itemsets[i][0]
+        himpunan = sorted((pemuat.get(item, set()) for item in itemset), key=len)
+        if himpunan and himpunan[0] and set.intersection(*himpunan):
+            continue
+        for item in itemset:
+            pemuat[item].add(i)
+        maksimal.append(i)
+    return [itemsets[i] for i in sorted(maksimal)]
+
+
+def pulihkan_hui(tertutup, min_util):
+    # Semua HUI (itemset, utilitas) >= min_util dari closed HUI (itemset, utilitas, utilitas per item)
+    hasil = {}
+    for itemset, _, unit in tertutup:
+        n = len(itemset)
+        if n > MAKS_PANJANG_PULIHKAN:
+            raise ValueError(f'Closed HUI terlalu panjang untuk dibangun ulang ({n} item)')
+        # Jumlah utilitas tiap subset (bit j = item ke-j) dibangun bertahap per item
+        jumlah = np.zeros(1 << n, dtype=np.result_type(np.asarray(unit).dtype, np.int64))
+        for j in range(n):
+            jumlah[1 << j:1 << (j + 1)] = jumlah[:1 << j] + unit[j]
+        # Subset di bawah min_util di C mungkin HUI lewat closure-nya sendiri, yang juga ada di tertutup
+        for subset in (np.flatnonzero(jumlah[1:] >= min_util) + 1).tolist():
+            kunci = tuple(itemset[j] for j in range(n) if subset >> j & 1)
+            util = jumlah[subset].item()
+            if kunci not in hasil or util > hasil[kunci]:
+                hasil[kunci] = util
+    return [(list(itemset), util) for itemset, util in hasil.items()]
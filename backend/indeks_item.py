@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# Indeks statistik per item (nama, tanggal pertama/terakhir, total terjual, TWU) yang dihitung sekali
+# dengan satu groupby vektor, sehingga memformat itemset hasil EFIM cukup O(|itemset|) lookup
+# alih-alih memindai DataFrame per item per itemset.
+
+
+def twu_per_item(df, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG', kolom_utilitas='UTILITY'):
+    # TWU vektor: TU per transaksi disebar ke tiap item unik di transaksi tersebut
+    tu = df.groupby(kolom_id_transaksi, sort=False, observed=True)[kolom_utilitas].transform('sum')
+    unik = ~df.duplicated([kolom_id_transaksi, kolom_id_item]).to_numpy()
+    return tu[unik].groupby(df[kolom_id_item].to_numpy()[unik], sort=False).sum()
+
+
+class IndeksItem:
+    def __init__(self, df, efim=None, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG',
+                 kolom_utilitas='UTILITY', kolom_nama='NAMA_BARANG', kolom_tanggal='TANGGAL', kolom_qty='QTY'):
+        # efim: instance EFIM yang sudah menghitung TWU; TWU-nya dipakai ulang tanpa dihitung lagi
+        agregasi = {}
+        if kolom_nama in df.columns:
+            agregasi['nama'] = (kolom_nama, 'last')
+        if kolom_tanggal in df.columns:
+            df = df.assign(**{kolom_tanggal: pd.to_datetime(df[kolom_tanggal], errors='coerce')})
+            agregasi['tanggal_awal'] = (kolom_tanggal, 'min')
+            agregasi['tanggal_akhir'] = (kolom_tanggal, 'max')
+        if kolom_qty in df.columns:
+            agregasi['terjual'] = (kolom_qty, 'sum')
+        grup = df.groupby(kolom_id_item, sort=False, observed=True)
+        statistik = grup.agg(**agregasi) if agregasi else pd.DataFrame(index=grup.size().index)
+
+        if efim is not None and len(efim.twu):
+            twu = pd.Series(efim.twu, index=efim.label_item)
+        else:
+            twu = twu_per_item(df, kolom_id_transaksi, kolom_id_item, kolom_utilitas)
+        statistik['twu'] = twu.reindex(statistik.index, fill_value=0).to_numpy()
+
+        if 'tanggal_awal' in statistik:
+            rentang = (statistik['tanggal_akhir'] - statistik['tanggal_awal']).dt.days
+            statistik['rentang_waktu'] = rentang.fillna(0).astype(np.int64)
+        self.statistik = statistik
+        # Kolom -> dict kode item -> nilai Python, agar lookup per itemset tanpa overhead pandas
+        self._nama = statistik['nama'].to_dict() if 'nama' in statistik else {}
+        self._rentang = dict(zip(statistik.index, statistik['rentang_waktu'].tolist())) if 'rentang_waktu' in statistik else {}
+        self._terjual = dict(zip(statistik.index, statistik['terjual'].tolist())) if 'terjual' in statistik else {}
+        self.twu = dict(zip(statistik.index, statistik['twu'].tolist()))
+
+    def __len__(self):
+        return len(self.statistik)
+
+    def format_itemset(self, itemset, total_utility):
+        # Format satu itemset hasil EFIM untuk respons API
+        itemset_list = list(itemset)
+        return {
+            'kode_barang': itemset_list,
+            'nama_barang': [self._nama.get(kode, f'Produk {kode}') for kode in itemset_list],
+            'total_utility': total_utility,
+            'rentang_waktu': max((self._rentang.get(kode, 0) for kode in itemset_list), default=0),
+            'total_terjual': sum(self._terjual.get(kode, 0) for kode in itemset_list)
+        }
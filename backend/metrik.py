@@ -0,0 +1,121 @@
+import bisect
+import threading
+
+# Registri metrik dalam format teks Prometheus (exposition format 0.0.4) untuk endpoint /metrics.
+# Sengaja ditulis sendiri (counter dan histogram berlabel saja) agar tidak menambah dependensi.
+# Metrik disimpan per proses: di bawah beberapa worker, tiap worker melaporkan angkanya sendiri.
+
+TIPE_KONTEN = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Batas bucket histogram (detik)
+BUCKET_LATENSI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BUCKET_FASE = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_label(nama_label, nilai_label):
+    if not nama_label:
+        return ''
+    isi = ','.join('{}="{}"'.format(nama, str(nilai).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                   for nama, nilai in zip(nama_label, nilai_label))
+    return '{' + isi + '}'
+
+
+def _format_angka(nilai):
+    if nilai == float('inf'):
+        return '+Inf'
+    return repr(float(nilai)) if isinstance(nilai, float) else str(nilai)
+
+
+class RegistriMetrik:
+    def __init__(self):
+        self._kunci = threading.Lock()
+        self._metrik = dict()  # nama -> (jenis, bantuan, nama_label, bucket, {nilai_label: nilai})
+
+    def daftar(self, nama, jenis, bantuan, label=(), bucket=None):
+        # jenis: 'counter' atau 'histogram' (histogram wajib punya bucket)
+        if jenis not in ('counter', 'histogram'):
+            raise ValueError(f"Jenis metrik tidak dikenal: {jenis}")
+        self._metrik[nama] = (jenis, bantuan, tuple(label), tuple(bucket or ()), dict())
+
+    def _seri(self, nama, label):
+        jenis, _, nama_label, bucket, seri = self._metrik[nama]
+        if set(label) != set(nama_label):
+            raise ValueError(f"Label {nama} harus {nama_label}, bukan {tuple(label)}")
+        kunci = tuple(str(label[n]) for n in nama_label)
+        if kunci not in seri:
+            # Histogram: [jumlah per bucket (non-kumulatif, + bucket +Inf), total, banyak observasi]
+            seri[kunci] = 0 if jenis == 'counter' else [[0] * (len(bucket) + 1), 0.0, 0]
+        return seri, kunci
+
+    def tambah(self, nama, nilai=1, **label):
+        with self._kunci:
+            seri, kunci = self._seri(nama, label)
+            seri[kunci] += nilai
+
+    def amati(self, nama, nilai, **label):
+        bucket = self._metrik[nama][3]
+        with self._kunci:
+            seri, kunci = self._seri(nama, label)
+            isi = seri[kunci]
+            isi[0][bisect.bisect_left(bucket, nilai)] += 1
+            isi[1] += nilai
+            isi[2] += 1
+
+    def teks(self):
+        baris = []
+        with self._kunci:
+            for nama, (jenis, bantuan, nama_label, bucket, seri) in self._metrik.items():
+                baris.append(f'# HELP {nama} {bantuan}')
+                baris.append(f'# TYPE {nama} {jenis}')
+                for kunci, isi in seri.items():
+                    if jenis == 'counter':
+                        baris.append(f'{nama}{_format_label(nama_label, kunci)} {_format_angka(isi)}')
+                        continue
+                    kumulatif = 0
+                    for batas, jumlah in zip(bucket + (float('inf'),), isi[0]):
+                        kumulatif += jumlah
+                        label = _format_label(nama_label + ('le',), kunci + (_format_angka(batas),))
+                        baris.append(f'{nama}_bucket{label} {kumulatif}')
+                    baris.append(f'{nama}_sum{_format_label(nama_label, kunci)} {_format_angka(isi[1])}')
+                    baris.append(f'{nama}_count{_format_label(nama_label, kunci)} {isi[2]}')
+        return '\n'.join(baris) + '\n'
+
+
+class MetrikEfim(RegistriMetrik):
+    # Metrik aplikasi: latensi per route Flask dan agregat instrumentasi mining (EFIM.statistik)
+    def __init__(self):
+        super().__init__()
+        self.daftar('efim_http_request_duration_seconds', 'histogram', 'Latensi request HTTP per route.',
+                    ('route', 'method', 'status'), BUCKET_LATENSI)
+        self.daftar('efim_mining_total', 'counter', 'Jumlah run mining yang selesai.',
+                    ('mesin', 'mode', 'dihentikan'))
+        self.daftar('efim_mining_fase_seconds', 'histogram', 'Waktu dinding per fase mining.',
+                    ('mesin', 'fase'), BUCKET_FASE)
+        self.daftar('efim_mining_node_total', 'counter', 'Node pencarian yang dijelajahi.', ('mesin',))
+        self.daftar('efim_mining_join_total', 'counter', 'Join utility list per hasil.', ('hasil',))
+        self.daftar('efim_mining_pangkas_total', 'counter', 'Kandidat yang dipangkas per jenis pruning.',
+                    ('mesin', 'jenis'))
+        self.daftar('efim_mining_itemset_total', 'counter', 'Itemset yang dihasilkan mining.', ('mesin',))
+        self.daftar('efim_cache_hasil_total', 'counter', 'Permintaan mining yang dilayani cache hasil.',
+                    ('hasil',))
+
+    def catat_request(self, route, method, status, detik):
+        self.amati('efim_http_request_duration_seconds', detik, route=route, method=method, status=status)
+
+    def catat_cache(self, kena):
+        self.tambah('efim_cache_hasil_total', hasil='hit' if kena else 'miss')
+
+    def catat_mining(self, statistik):
+        mesin = statistik['mesin']
+        self.tambah('efim_mining_total', mesin=mesin, mode=statistik['mode'],
+                    dihentikan=statistik['dihentikan'] or 'tidak')
+        for fase, nilai in statistik['fase'].items():
+            self.amati('efim_mining_fase_seconds', nilai['detik'], mesin=mesin, fase=fase)
+        self.tambah('efim_mining_node_total', statistik['jumlah_node'], mesin=mesin)
+        self.tambah('efim_mining_itemset_total', statistik['jumlah_itemset'], mesin=mesin)
+        self.tambah('efim_mining_join_total', statistik['join_dibangun'], hasil='dibangun')
+        self.tambah('efim_mining_join_total', statistik['join_dipangkas'], hasil='dipangkas_la')
+        self.tambah('efim_mining_join_total', statistik['join_dilewati'], hasil='dilewati_irisan')
+        for jenis in ('twu', 'eucs', 'lu', 'su'):
+            self.tambah('efim_mining_pangkas_total', statistik[f'pangkas_{jenis}'], mesin=mesin, jenis=jenis)
+        self.tambah('efim_mining_pangkas_total', statistik['cabang_tidak_tertutup'], mesin=mesin, jenis='tidak_tertutup')
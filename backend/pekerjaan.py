@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Job mining asinkron: job dijalankan di thread pool berukuran tetap sehingga request Flask langsung
+# kembali dengan id job. Progres dibaca dari EFIM milik job (efim.progres()) selama pencarian,
+# dan pembatalan cukup menyalakan flag yang dicek pencarian tiap INTERVAL_CEK node.
+
+log = logging.getLogger('efim.job')
+
+STATUS_SELESAI = ('selesai', 'dibatalkan', 'gagal')
+
+
+class Job:
+    def __init__(self, efim):
+        self.id = uuid.uuid4().hex
+        self.efim = efim
+        self.batal = threading.Event()
+        efim.batal = self.batal
+        self.status = 'menunggu'   # menunggu -> berjalan -> selesai / dibatalkan / gagal
+        self.hasil = None
+        self.error = None
+        self.dibuat = time.time()
+        self.mulai = None
+        self.selesai = None
+        self.future = None
+
+    def ringkasan(self):
+        info = {
+            'job_id': self.id,
+            'status': self.status,
+            'progres': self.efim.progres(),
+            'dihentikan': self.efim.dihentikan,
+            'dibuat': self.dibuat,
+            'mulai': self.mulai,
+            'selesai': self.selesai,
+        }
+        if self.mulai is not None:
+            info['durasi'] = (self.selesai or time.time()) - self.mulai
+        if self.hasil is not None:
+            info['hasil'] = self.hasil
+        if self.error is not None:
+            info['error'] = self.error
+        return info
+
+
+class PengelolaJob:
+    def __init__(self, maks_worker=2, maks_riwayat=100):
+        self.maks_riwayat = maks_riwayat   # job yang sudah selesai disimpan paling banyak sebanyak ini
+        self._pool = ThreadPoolExecutor(max_workers=maks_worker, thread_name_prefix='efim-job')
+        self._job = OrderedDict()          # id -> Job, urut waktu kirim
+        self._kunci = threading.Lock()
+
+    def __len__(self):
+        return len(self._job)
+
+    def kirim(self, fungsi, efim):
+        # fungsi(efim) dijalankan di pool; nilai kembaliannya menjadi hasil job
+        job = Job(efim)
+        with self._kunci:
+            self._job[job.id] = job
+            self._buang_riwayat()
+        job.future = self._pool.submit(self._jalankan, job, fungsi)
+        return job
+
+    def _jalankan(self, job, fungsi):
+        if job.batal.is_set():
+            self._tandai_batal(job)
+            return
+        job.status = 'berjalan'
+        job.mulai = time.time()
+        try:
+            job.hasil = fungsi(job.efim)
+            job.status = 'dibatalkan' if job.efim.dihentikan == 'dibatalkan' else 'selesai'
+        except Exception as e:
+            log.exception("Job %s gagal", job.id)
+            job.error = str(e)
+            job.status = 'gagal'
+        finally:
+            job.selesai = time.time()
+
+    def ambil(self, job_id):
+        with self._kunci:
+            return self._job.get(job_id)
+
+    def batalkan(self, job_id):
+        # Job yang belum berjalan langsung dibatalkan; yang sedang berjalan berhenti di pengecekan
+        # berikutnya dengan hasil parsial
+        job = self.ambil(job_id)
+        if job is None:
+            return None
+        job.batal.set()
+        if job.future.cancel():
+            self._tandai_batal(job)
+        return job
+
+    def _tandai_batal(self, job):
+        job.status = 'dibatalkan'
+        job.efim.dihentikan = 'dibatalkan'
+        job.selesai = time.time()
+
+    def _buang_riwayat(self):
+        selesai = [job_id for job_id, job in self._job.items() if job.status in STATUS_SELESAI]
+        for job_id in selesai[:max(0, len(selesai) - self.maks_riwayat)]:
+            del self._job[job_id]
+
@@ -0,0 +1,83 @@
+import hashlib
+import logging
+import os
+
+# Penyimpanan kolumnar (Feather/Arrow IPC tanpa kompresi) untuk upload dan hasil preprocessing.
+# Upload diubah sekali ke Feather dengan kunci hash isi berkas, sehingga upload ulang berkas yang
+# sama, restart worker, atau worker lain cukup membaca berkas Feather (memory_map) alih-alih
+# mem-parsing ulang CSV/XLSX. Konversi ke pandas tetap menyalin kolom ke memori proses; yang dihemat
+# adalah parsing teks, bukan salinannya. pyarrow opsional: tanpa pyarrow semua operasi menjadi no-op
+# dan pemanggil kembali ke berkas teks.
+
+UKURAN_BLOK_HASH = 1 << 20
+
+log = logging.getLogger('efim.kolom')
+
+
+def hash_berkas(path):
+    # Sidik jari isi berkas (bukan nama), dibaca per blok agar memori tetap kecil
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as berkas:
+        for blok in iter(lambda: berkas.read(UKURAN_BLOK_HASH), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def _feather():
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+class PenyimpananKolom:
+    def __init__(self, direktori):
+        self.direktori = direktori
+        self.tersedia = _feather() is not None
+        if self.tersedia and not os.path.exists(direktori):
+            os.makedirs(direktori)
+
+    def path(self, kunci):
+        return os.path.join(self.direktori, f'{kunci}.feather')
+
+    def ada(self, kunci):
+        return self.tersedia and os.path.exists(self.path(kunci))
+
+    def simpan(self, kunci, df):
+        # Tulis ke berkas sementara lalu rename (atomik). Mengembalikan path, atau None jika pyarrow
+        # tidak tersedia / frame tidak bisa direpresentasikan di Arrow (mis. kolom bertipe campuran).
+        feather = _feather()
+        if feather is None:
+            return None
+        path = self.path(kunci)
+        sementara = f'{path}.{os.getpid()}.tmp'
+        try:
+            feather.write_feather(df.reset_index(drop=True), sementara, compression='uncompressed')
+            os.replace(sementara, path)
+        except Exception as e:
+            log.warning("Gagal menyimpan %s ke Feather, tetap memakai berkas teks: %s", kunci, e)
+            if os.path.exists(sementara):
+                os.remove(sementara)
+            return None
+        return path
+
+    def baca(self, kunci):
+        return baca_feather(self.path(kunci))
+
+    def muat_upload(self, path, baca_teks):
+        # (kunci, df) untuk berkas upload: Feather dipakai jika isi berkas pernah dikonversi,
+        # jika belum berkas diparse sekali dengan baca_teks lalu disimpan sebagai Feather
+        kunci = hash_berkas(path)
+        if self.ada(kunci):
+            log.info("Upload %s dibaca dari penyimpanan kolumnar", kunci)
+            return kunci, self.baca(kunci)
+        df = baca_teks(path)
+        self.simpan(kunci, df)
+        return kunci, df
+
+
+def baca_feather(path):
+    # Dibaca lewat memory map (tanpa parsing dan tanpa buffer baca terpisah); to_pandas menyalin
+    # kolom ke array NumPy/objek milik DataFrame, sehingga frame tidak bergantung pada berkasnya
+    return _feather().read_table(path, memory_map=True).to_pandas()
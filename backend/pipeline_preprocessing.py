@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import threading
+import weakref
+from collections import Counter, OrderedDict
+import pandas as pd
+from tipe_ringkas import ringkas_tipe, turunkan_numerik, perkalian_lebar
+
+# Pipeline preprocessing sebagai rangkaian tahap eksplisit. Tiap tahap adalah fungsi murni
+# (df, **parameter) -> df baru yang tidak mengubah input (copy-on-write pandas membuat salinan hanya
+# untuk kolom yang benar-benar diubah). Keluaran tiap tahap di-cache dengan kunci sidik jari:
+# hash(kunci input, nama tahap, parameter), dengan kunci input tahap pertama = dataset_id (hash isi
+# upload). Karena kunci dihitung dari kunci sebelumnya, cek cache tidak perlu meng-hash isi frame,
+# dan /preprocess ulang untuk berkas yang sama langsung memakai keluaran tahap terakhir.
+# Cache memori pipeline hanya memegang weak reference: frame dimiliki registri dataset (yang membatasi
+# memorinya), sehingga frame yang dilepas registri tidak tertahan di sini dan dibaca ulang dari
+# penyimpanan kolumnar atau dihitung ulang saat dibutuhkan lagi.
+
+# Naikkan jika logika tahap berubah agar cache lama tidak terpakai
+VERSI_PIPELINE = 2
+
+log = logging.getLogger('efim.preprocessing')
+
+KOLOM_WAJIB = ['ID_PENJUALAN', 'KODE_BARANG', 'NAMA_BARANG', 'QTY', 'HARGASATUAN', 'TANGGAL']
+
+
+def _nama_standar(col):
+    return col.upper().strip().replace(' ', '_')
+
+
+def bersihkan(df, batas_kosong=0.5, tanggal_default='2010-06-02', kolom_dibuang=('NOMORREF', 'SATUAN'), profil=None):
+    # Standarisasi nama kolom, buang baris/kolom kosong, NaN dan duplikat, konversi TANGGAL,
+    # lalu ringkas tipe (identitas categorical, numerik diturunkan) untuk tahap-tahap berikutnya.
+    # profil: ProfilData milik df (opsional); jumlah nilai kosong diambil dari situ tanpa dihitung ulang.
+    df = df.rename(columns=_nama_standar)
+    log.debug("Kolom setelah standarisasi: %s", df.columns.tolist())
+
+    rows_before = len(df)
+    df = df.dropna(how='all')
+    log.debug("Baris setelah hapus kosong: %d (dihapus %d)", len(df), rows_before - len(df))
+
+    if profil is not None and profil.jumlah_baris == rows_before:
+        jumlah, kosong = profil.kosong_tanpa_baris_kosong()
+        missing_fraction = pd.Series(kosong).rename(index=_nama_standar) / max(jumlah, 1)
+    else:
+        missing_fraction = df.isnull().mean()
+    cols_to_drop = missing_fraction[missing_fraction > batas_kosong].index.tolist()
+    if cols_to_drop:
+        log.info("Menghapus kolom dengan banyak nilai kosong: %s", cols_to_drop)
+        df = df.drop(columns=cols_to_drop)
+
+    rows_before = len(df)
+    df = df.dropna()
+    log.debug("Baris setelah hapus NaN: %d (dihapus %d)", len(df), rows_before - len(df))
+    rows_before = len(df)
+    df = df.drop_duplicates()
+    log.debug("Baris setelah hapus duplikat: %d (dihapus %d)", len(df), rows_before - len(df))
+
+    if 'TANGGAL' in df.columns:
+        # Tanggal tidak valid (NaT) diganti tanggal default
+        tanggal = pd.to_datetime(df['TANGGAL'], errors='coerce')
+        log.debug("Jumlah tanggal tidak valid: %d", tanggal.isna().sum())
+        df = df.assign(TANGGAL=tanggal.fillna(pd.Timestamp(tanggal_default)))
+
+    dropped = [col for col in kolom_dibuang if col in df.columns]
+    if dropped:
+        log.debug("Kolom yang dihapus: %s", dropped)
+        df = df.drop(columns=dropped)
+    log.info("Ukuran data setelah cleaning: %s", df.shape)
+    return ringkas_tipe(df)
+
+
+def buang_outlier(df, faktor_iqr=1.5):
+    # Buang baris dengan nilai numerik di luar [Q1 - f*IQR, Q3 + f*IQR], lalu lengkapi kolom wajib
+    df_numeric = df.select_dtypes(include=['number'])
+    if 'ID_PENJUALAN' in df_numeric.columns:
+        df_numeric = df_numeric.drop(columns=['ID_PENJUALAN'])
+
+    if not df_numeric.empty:
+        log.debug("Kolom numerik untuk deteksi outlier: %s", df_numeric.columns.tolist())
+        Q1 = df_numeric.quantile(0.25)
+        Q3 = df_numeric.quantile(0.75)
+        IQR = Q3 - Q1
+        filter_outlier = ~((df_numeric < (Q1 - faktor_iqr * IQR)) | (df_numeric > (Q3 + faktor_iqr * IQR))).any(axis=1)
+        hasil = df[filter_outlier]
+        log.info("Baris setelah penghapusan outlier: %d (dihapus %d)", len(hasil), len(df) - len(hasil))
+    else:
+        log.info("Tidak ada kolom numerik untuk deteksi outlier")
+        hasil = df
+
+    default = {
+        'ID_PENJUALAN': lambda: range(1, len(hasil) + 1),
+        'QTY': lambda: 1,
+        'HARGASATUAN': lambda: 0,
+        'TANGGAL': lambda: pd.Timestamp.now(),
+    }
+    tambahan = {col: default.get(col, lambda: "Data Tidak Tersedia")() for col in KOLOM_WAJIB if col not in hasil.columns}
+    if tambahan:
+        log.info("Kolom %s tidak ditemukan - membuat kolom dengan nilai default", list(tambahan))
+        hasil = hasil.assign(**tambahan)
+    return hasil.copy(deep=False)
+
+
+def tambah_utilitas(df):
+    # UTILITY = QTY * HARGASATUAN
+    if all(col in df.columns for col in ['QTY', 'HARGASATUAN']):
+        return df.assign(UTILITY=turunkan_numerik(perkalian_lebar(df['QTY'], df['HARGASATUAN'])))
+    log.info("Dibuat kolom UTILITY dengan nilai 0")
+    return df.assign(UTILITY=0)
+
+
+def kelompokkan(df):
+    # Ringkasan per transaksi: list nilai tiap kolom
+    kolom = [col for col in ['KODE_BARANG', 'NAMA_BARANG', 'QTY', 'HARGASATUAN', 'UTILITY', 'TANGGAL'] if col in df.columns]
+    teks = {'KODE_BARANG', 'NAMA_BARANG'}
+    sumber = df.assign(**{col: df[col].astype(str) for col in teks if col in df.columns})
+    grouped = sumber.groupby('ID_PENJUALAN', observed=True)[kolom].agg(list).reset_index()
+    log.debug("Berhasil melakukan groupby, jumlah grup: %d", len(grouped))
+    return grouped
+
+
+# (nama tahap, fungsi, parameter default, tahap registri yang diwakili, disimpan ke disk).
+# Keluaran 'grup' berisi sel list yang tidak kembali utuh dari Arrow, jadi hanya di-cache di memori.
+TAHAP_PIPELINE = (
+    ('bersihkan', bersihkan, {}, 'cleaned', True),
+    ('outlier', buang_outlier, {}, None, True),
+    ('utilitas', tambah_utilitas, {}, 'processed', True),
+    ('grup', kelompokkan, {}, None, False),
+)
+
+
+def _sidik_jari_tahap(kunci_input, nama, parameter):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f'{VERSI_PIPELINE}|{kunci_input}|{nama}|{sorted(parameter.items())!r}'.encode())
+    return h.hexdigest()
+
+
+class PipelinePreprocessing:
+    def __init__(self, penyimpanan=None, maks_cache=64, parameter=None):
+        # parameter: {nama tahap: {parameter}} yang menimpa parameter default
+        self.penyimpanan = penyimpanan      # PenyimpananKolom (opsional) untuk persistensi keluaran
+        self.maks_cache = maks_cache        # jumlah kunci tahap yang diingat (LRU)
+        self.tahap = [(nama, fungsi, {**bawaan, **(parameter or {}).get(nama, {})}, alias, disimpan)
+                      for nama, fungsi, bawaan, alias, disimpan in TAHAP_PIPELINE]
+        self._cache = OrderedDict()         # kunci tahap -> weakref DataFrame
+        self._kunci = threading.Lock()
+        self.dihitung = Counter()           # berapa kali tiap tahap benar-benar dijalankan
+
+    def kunci(self, dataset_id, streaming=False):
+        # {nama tahap: sidik jari keluaran}; rantai dari dataset_id. Keluaran mode streaming
+        # (preprocessing_streaming, batas outlier dari sketsa kuantil) punya kunci sendiri.
+        hasil = {}
+        kunci_input = f'{dataset_id}|streaming' if streaming else dataset_id
+        for nama, _, parameter, _, _ in self.tahap:
+            kunci_input = hasil[nama] = _sidik_jari_tahap(kunci_input, nama, parameter)
+        return hasil
+
+    def kunci_tahap(self, dataset_id, tahap_registri):
+        # Kunci berkas kolumnar untuk tahap registri ('raw', 'cleaned', 'processed')
+        if tahap_registri == 'raw':
+            return dataset_id
+        for nama, _, _, alias, _ in self.tahap:
+            if alias == tahap_registri:
+                # Keluaran streaming dipakai jika hanya varian itu yang ada di disk
+                kunci = self.kunci(dataset_id)[nama]
+                kunci_streaming = self.kunci(dataset_id, streaming=True)[nama]
+                if (self.penyimpanan is not None and not self.penyimpanan.ada(kunci)
+                        and self.penyimpanan.ada(kunci_streaming)):
+                    return kunci_streaming
+                return kunci
+        return f'{dataset_id}_{tahap_registri}'
+
+    def _ambil_cache(self, kunci):
+        with self._kunci:
+            ref = self._cache.get(kunci)
+            df = ref() if ref is not None else None
+            if df is not None:
+                self._cache.move_to_end(kunci)
+                return df
+            self._cache.pop(kunci, None)
+        if self.penyimpanan is not None and self.penyimpanan.ada(kunci):
+            df = self.penyimpanan.baca(kunci)
+            self._simpan_cache(kunci, df)
+            return df
+        return None
+
+    def _simpan_cache(self, kunci, df):
+        with self._kunci:
+            self._cache[kunci] = weakref.ref(df)
+            self._cache.move_to_end(kunci)
+            while len(self._cache) > self.maks_cache:
+                self._cache.popitem(last=False)
+
+    def keluaran(self, dataset_id, nama, ambil_raw, profil=None):
+        # Keluaran tahap: cache memori -> penyimpanan kolumnar -> hitung dari keluaran tahap sebelumnya.
+        # ambil_raw() hanya dipanggil jika tahap pertama harus dihitung. profil (ProfilData data mentah)
+        # diteruskan ke tahap pertama; tidak masuk sidik jari karena hanya turunan dari input.
+        kunci = self.kunci(dataset_id)[nama]
+        df = self._ambil_cache(kunci)
+        if df is not None:
+            return df
+        posisi = [t[0] for t in self.tahap].index(nama)
+        _, fungsi, parameter, _, disimpan = self.tahap[posisi]
+        if posisi == 0:
+            df_input = ambil_raw()
+            if profil is not None:
+                parameter = {**parameter, 'profil': profil}
+        else:
+            df_input = self.keluaran(dataset_id, self.tahap[posisi - 1][0], ambil_raw, profil)
+        log.info("Menjalankan tahap preprocessing: %s", nama)
+        df = fungsi(df_input, **parameter)
+        self.dihitung[nama] += 1
+        if disimpan and self.penyimpanan is not None:
+            self.penyimpanan.simpan(kunci, df)
+        self._simpan_cache(kunci, df)
+        return df
+
+    def path(self, dataset_id, nama):
+        # Berkas kolumnar keluaran tahap, atau None jika tidak tersimpan di disk
+        kunci = self.kunci(dataset_id)[nama]
+        if self.penyimpanan is not None and self.penyimpanan.ada(kunci):
+            return self.penyimpanan.path(kunci)
+        return None
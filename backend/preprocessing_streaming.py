@@ -0,0 +1,426 @@
+import logging
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from pipeline_preprocessing import KOLOM_WAJIB
+from tipe_ringkas import perkalian_lebar
+
+# Preprocessing out-of-core untuk CSV yang lebih besar dari RAM. Berkas dibaca per chunk dan tiap
+# langkah dibuat inkremental sehingga memori puncak dibatasi ukuran chunk:
+# 1. Lintasan statistik: jumlah nilai kosong per kolom (untuk membuang kolom > batas_kosong) dan
+#    dtype gabungan per kolom agar semua chunk ditulis dengan skema yang sama, serta format TANGGAL
+#    yang ditebak sekali agar semua chunk di-parse dengan format yang sama.
+# 2. Dedup out-of-core: baris yang sudah dibersihkan ditulis ke partisi hash di disk (PartisiBaris),
+#    lalu tiap partisi dibaca sendiri dan duplikatnya dicari dengan membandingkan isi baris, bukan
+#    hanya hash 64-bit. Hasilnya daftar nomor baris yang dibuang.
+# 3. Lintasan pembersihan dengan urutan yang sama seperti bersihkan: kolom terlalu kosong, baris NaN,
+#    duplikat (dari langkah 2), TANGGAL, lalu kolom tak terpakai. Kolom numerik dimasukkan ke sketsa
+#    kuantil KLL untuk batas IQR, dan chunk bersih ditulis langsung ke berkas Arrow IPC (Feather)
+#    tahap 'bersihkan'.
+# 4. Lintasan outlier: berkas bersih dibaca per batch (memory map), outlier dibuang dengan batas dari
+#    sketsa, kolom wajib dilengkapi, UTILITY dihitung, lalu ditulis ke berkas tahap 'utilitas' yang
+#    langsung dimuat EFIM. Ringkasan per transaksi (jumlah baris, total UTILITY) dikumpulkan di
+#    lintasan yang sama sehingga grouped_data berhalaman tidak perlu memuat seluruh hasil.
+#
+# Batas memori sebenarnya: satu chunk, satu partisi dedup (~ukuran berkas / jumlah partisi), 8 byte per
+# baris duplikat, dan ringkasan per transaksi (~24 byte per ID_PENJUALAN unik, ditambah ukuran ID teks).
+# Ringkasan transaksi adalah keluaran tahap 'grup' sehingga tumbuh dengan jumlah transaksi, bukan
+# dengan jumlah baris atau chunk; ukurannya dilaporkan di respons /preprocess.
+
+UKURAN_CHUNK = 100_000
+# Partisi dedup: satu per BYTE_PER_PARTISI berkas CSV, paling banyak MAKS_PARTISI (berkas terbuka)
+BYTE_PER_PARTISI = 32 << 20
+MAKS_PARTISI = 256
+KOLOM_BARIS = '__BARIS__'
+
+log = logging.getLogger('efim.preprocessing')
+
+
+class SketsaKuantil:
+    # Sketsa kuantil KLL: kompaktor per level berkapasitas k, elemen di level h berbobot 2^h.
+    # Saat level penuh, isinya diurutkan dan separuh (posisi ganjil/genap acak) naik ke level
+    # berikutnya. Galat rank ~ O(1/k) dengan memori O(k log n). Selama belum ada kompaksi hasilnya
+    # sama persis dengan kuantil linear pandas.
+
+    def __init__(self, k=4096, seed=0):
+        self.k = k
+        self.level = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def tambah(self, nilai):
+        nilai = np.asarray(nilai, dtype=np.float64)
+        nilai = nilai[~np.isnan(nilai)]
+        self.n += len(nilai)
+        self.level[0] = np.concatenate([self.level[0], nilai])
+        h = 0
+        while h < len(self.level):
+            if len(self.level[h]) > self.k:
+                buffer = np.sort(self.level[h])
+                tetap, buffer = buffer[:len(buffer) % 2], buffer[len(buffer) % 2:]
+                if h + 1 == len(self.level):
+                    self.level.append(np.empty(0))
+                self.level[h + 1] = np.concatenate([self.level[h + 1], buffer[self._rng.integers(2)::2]])
+                self.level[h] = tetap
+            h += 1
+
+    def kuantil(self, q):
+        if self.n == 0:
+            return np.nan
+        if len(self.level) == 1:
+            return float(np.quantile(self.level[0], q))
+        nilai = np.concatenate(self.level)
+        bobot = np.concatenate([np.full(len(isi), 2.0 ** h) for h, isi in enumerate(self.level)])
+        urut = np.argsort(nilai, kind='stable')
+        kumulatif = np.cumsum(bobot[urut])
+        posisi = np.searchsorted(kumulatif, q * kumulatif[-1], 'left')
+        return float(nilai[urut][min(posisi, len(nilai) - 1)])
+
+
+class PartisiBaris:
+    # Dedup out-of-core. Tiap baris ditulis sebagai teks CSV bersama nomor baris globalnya ke partisi
+    # hash_baris % jumlah_partisi. Baris yang isinya sama selalu masuk partisi yang sama, jadi duplikat
+    # dicari per partisi dengan membandingkan isi baris; tabrakan hash hanya membuat dua baris berbeda
+    # berbagi partisi. Memori yang dipakai sebesar satu partisi.
+
+    def __init__(self, direktori, jumlah_partisi):
+        self.direktori = tempfile.mkdtemp(prefix='partisi_', dir=direktori)
+        self.jumlah_partisi = jumlah_partisi
+        self.n = 0
+
+    def _path(self, p):
+        return os.path.join(self.direktori, f'{p}.csv')
+
+    def tambah(self, chunk):
+        # chunk harus sudah berdtype seragam antar chunk (_seragamkan) agar baris sama ter-hash sama
+        bagian = (_hash_baris(chunk) % np.uint64(self.jumlah_partisi)).astype(np.int64)
+        chunk = chunk.copy(deep=False)
+        chunk.insert(0, KOLOM_BARIS, np.arange(self.n, self.n + len(chunk)))
+        self.n += len(chunk)
+        urut = np.argsort(bagian, kind='stable')
+        batas = np.searchsorted(bagian[urut], np.arange(self.jumlah_partisi + 1))
+        for p in np.flatnonzero(np.diff(batas)).tolist():
+            chunk.iloc[urut[batas[p]:batas[p + 1]]].to_csv(self._path(p), mode='a', header=False, index=False)
+
+    def baris_duplikat(self, keep='first'):
+        # Nomor baris global (terurut) yang duplikat menurut DataFrame.duplicated(keep=keep) atas semua baris.
+        # Dalam satu partisi baris tersimpan urut nomor, jadi keep='first' mempertahankan kemunculan pertama.
+        hasil = []
+        for p in range(self.jumlah_partisi):
+            if not os.path.exists(self._path(p)):
+                continue
+            bagian = pd.read_csv(self._path(p), header=None, dtype=str, keep_default_na=False)
+            ganda = bagian.iloc[:, 1:].duplicated(keep=keep).to_numpy()
+            hasil.append(bagian[0].to_numpy()[ganda].astype(np.int64))
+        return np.sort(np.concatenate(hasil)) if hasil else np.empty(0, dtype=np.int64)
+
+    def hapus(self):
+        shutil.rmtree(self.direktori, ignore_errors=True)
+
+
+def _jumlah_partisi(path):
+    return int(min(MAKS_PARTISI, max(1, -(-os.path.getsize(path) // BYTE_PER_PARTISI))))
+
+
+def _cari_duplikat(chunks, direktori, jumlah_partisi, keep=('first',)):
+    # Nomor baris duplikat per nilai keep; partisi sementara dihapus setelahnya
+    partisi = PartisiBaris(direktori, jumlah_partisi)
+    try:
+        for chunk in chunks:
+            partisi.tambah(chunk)
+        return [partisi.baris_duplikat(k) for k in keep]
+    finally:
+        partisi.hapus()
+
+
+def _standarkan(chunk):
+    chunk = chunk.rename(columns=lambda col: col.upper().strip().replace(' ', '_'))
+    return chunk.dropna(how='all')
+
+
+def _hash_baris(chunk):
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+def _seragamkan(chunk, dtypes):
+    # Cast chunk ke dtype gabungan; kolom teks/campuran menjadi str (nilai kosong tetap kosong)
+    chunk = chunk.astype({col: dtypes[col] for col in chunk.columns if chunk[col].dtype != dtypes[col]})
+    for col in chunk.columns:
+        if dtypes[col] is object and chunk[col].dtype == object:
+            kosong = chunk[col].isna()
+            chunk[col] = chunk[col].astype(str).mask(kosong) if kosong.any() else chunk[col].astype(str)
+    return chunk
+
+
+def _dtype_gabungan(dtypes):
+    # dtype yang menampung semua chunk; campuran numerik/teks menjadi teks
+    if all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in dtypes):
+        return np.result_type(*dtypes)
+    return object
+
+
+def baca_chunk(path, ukuran_chunk=UKURAN_CHUNK, **opsi):
+    if not path.endswith('.csv'):
+        raise ValueError('Mode streaming hanya mendukung berkas CSV')
+    return pd.read_csv(path, chunksize=ukuran_chunk, **opsi)
+
+
+def hitung_baris(path, ukuran_chunk=UKURAN_CHUNK):
+    # Jumlah baris data CSV; hanya kolom pertama yang diparse
+    return sum(len(chunk) for chunk in baca_chunk(path, ukuran_chunk, usecols=[0]))
+
+
+def _format_tanggal(contoh):
+    # Format TANGGAL ditebak sekali dari nilai tak kosong pertama (seperti to_datetime pada seluruh
+    # kolom) lalu dipakai di semua chunk; jika tidak bisa ditebak, tiap nilai di-parse sendiri
+    from pandas.tseries.api import guess_datetime_format
+    if isinstance(contoh, str):
+        return guess_datetime_format(contoh) or 'mixed'
+    return None
+
+
+def statistik_kolom(path, ukuran_chunk=UKURAN_CHUNK):
+    # Lintasan 1: (jumlah baris, jumlah kosong per kolom, dtype gabungan per kolom, format TANGGAL)
+    jumlah, kosong, dtypes, contoh_tanggal = 0, None, {}, None
+    for chunk in baca_chunk(path, ukuran_chunk):
+        chunk = _standarkan(chunk)
+        jumlah += len(chunk)
+        kosong = chunk.isnull().sum() if kosong is None else kosong.add(chunk.isnull().sum(), fill_value=0)
+        for col, dtype in chunk.dtypes.items():
+            dtypes.setdefault(col, set()).add(dtype)
+        if contoh_tanggal is None and 'TANGGAL' in chunk.columns:
+            tanggal = chunk['TANGGAL'].dropna()
+            contoh_tanggal = tanggal.iloc[0] if len(tanggal) else None
+    dtypes = {col: _dtype_gabungan(list(d)) for col, d in dtypes.items()}
+    return jumlah, kosong, dtypes, _format_tanggal(contoh_tanggal)
+
+
+def periksa_missing_dan_duplikat(path, ukuran_chunk=UKURAN_CHUNK, jumlah_partisi=None):
+    # Versi chunked /check_missing_and_duplicates: jumlah kosong per kolom dan jumlah duplikat
+    # (keep=False dan keep='first') tanpa memuat seluruh berkas. Lintasan pertama menghitung nilai kosong
+    # dan dtype gabungan, lintasan kedua mengisi partisi dedup (isi baris dibandingkan per partisi).
+    kosong, dtypes = None, {}
+    for chunk in baca_chunk(path, ukuran_chunk):
+        kosong = chunk.isnull().sum() if kosong is None else kosong.add(chunk.isnull().sum(), fill_value=0)
+        for col, dtype in chunk.dtypes.items():
+            dtypes.setdefault(col, set()).add(dtype)
+    dtypes = {col: _dtype_gabungan(list(d)) for col, d in dtypes.items()}
+    chunks = (_seragamkan(chunk, dtypes) for chunk in baca_chunk(path, ukuran_chunk))
+    berulang, semua = _cari_duplikat(chunks, os.path.dirname(os.path.abspath(path)),
+                                     jumlah_partisi or _jumlah_partisi(path), keep=('first', False))
+    return kosong, len(semua), len(berulang)
+
+
+class _PenulisIpc:
+    # Berkas Arrow IPC dibuka saat chunk pertama ditulis; chunk berikutnya di-cast ke skema chunk pertama
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.skema = None
+
+    def tulis(self, df):
+        import pyarrow as pa
+        tabel = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.skema = tabel.schema
+            self.writer = pa.ipc.new_file(self.path, self.skema)
+        else:
+            tabel = tabel.cast(self.skema)
+        self.writer.write_table(tabel)
+
+    def tutup(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _tulis_atomik(path, tulis):
+    # tulis(path_sementara) lalu rename agar berkas tahap tidak pernah setengah jadi
+    sementara = f'{path}.{os.getpid()}.tmp'
+    try:
+        tulis(sementara)
+        os.replace(sementara, path)
+    finally:
+        if os.path.exists(sementara):
+            os.remove(sementara)
+
+
+def _batch_berkas(path):
+    # Iterasi DataFrame per record batch dari berkas Arrow IPC secara memory map
+    import pyarrow as pa
+    with pa.memory_map(path) as sumber:
+        reader = pa.ipc.open_file(sumber)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).to_pandas()
+
+
+def _agregat_transaksi(chunk):
+    return chunk.groupby('ID_PENJUALAN', observed=True)['UTILITY'].agg(['size', 'sum'])
+
+
+def _lipat_agregat(bagian):
+    # Agregat per chunk digabung begitu bagian yang belum digabung melebihi gabungan sebelumnya
+    # (biaya teramortisasi linear); memori sebanding jumlah transaksi unik, bukan jumlah chunk
+    if len(bagian) > 1 and sum(len(b) for b in bagian[1:]) > len(bagian[0]):
+        return [pd.concat(bagian).groupby(level=0, observed=True).sum()]
+    return bagian
+
+
+def _gabung_agregat(bagian):
+    # Ringkasan per transaksi (ID_PENJUALAN terurut, JUMLAH_BARIS, UTILITY) dari agregat per chunk;
+    # transaksi yang terpecah di beberapa chunk dijumlahkan
+    if not bagian:
+        return pd.DataFrame({'ID_PENJUALAN': [], 'JUMLAH_BARIS': np.empty(0, dtype=np.int64), 'UTILITY': []})
+    gabung = pd.concat(bagian).groupby(level=0, observed=True).sum()
+    return pd.DataFrame({'ID_PENJUALAN': gabung.index.to_numpy(), 'JUMLAH_BARIS': gabung['size'].to_numpy(),
+                         'UTILITY': gabung['sum'].to_numpy()})
+
+
+def ringkasan_transaksi(path_hasil):
+    # Ringkasan per transaksi dari berkas hasil, dibaca per batch
+    agregat = []
+    for chunk in _batch_berkas(path_hasil):
+        agregat = _lipat_agregat(agregat + [_agregat_transaksi(chunk)])
+    return _gabung_agregat(agregat)
+
+
+def baris_transaksi(path_hasil, ids):
+    # Baris berkas hasil milik transaksi ids (urutan berkas), dibaca per batch
+    bagian = [chunk[chunk['ID_PENJUALAN'].isin(ids)] for chunk in _batch_berkas(path_hasil)]
+    return pd.concat(bagian, ignore_index=True)
+
+
+def ringkasan_berkas(path, n=20):
+    # (jumlah baris, nama kolom, head(n)) tanpa memuat seluruh berkas
+    import pyarrow as pa
+    with pa.memory_map(path) as sumber:
+        reader = pa.ipc.open_file(sumber)
+        jumlah = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        head = reader.get_batch(0).slice(0, n).to_pandas() if reader.num_record_batches else reader.schema.empty_table().to_pandas()
+    return jumlah, list(reader.schema.names), head
+
+
+def preprocess_streaming(path, path_bersih, path_hasil, ukuran_chunk=UKURAN_CHUNK, batas_kosong=0.5,
+                         tanggal_default='2010-06-02', kolom_dibuang=('NOMORREF', 'SATUAN'), faktor_iqr=1.5,
+                         jumlah_partisi=None):
+    # Preprocessing CSV per chunk; keluaran tahap bersih dan hasil akhir (dengan UTILITY) ditulis
+    # sebagai berkas Arrow IPC/Feather di path_bersih dan path_hasil. Mengembalikan statistik ringkas.
+    # jumlah_partisi: partisi dedup (bawaan dari ukuran berkas, lihat BYTE_PER_PARTISI)
+
+    jumlah, kosong, dtypes, format_tanggal = statistik_kolom(path, ukuran_chunk)
+    fraksi_kosong = kosong / max(jumlah, 1)
+    # Kolom terlalu kosong dibuang sebelum dropna; kolom_dibuang baru setelah dedup (seperti bersihkan),
+    # sehingga baris dengan NOMORREF kosong atau yang hanya berbeda NOMORREF ikut menentukan hasil
+    kolom_hapus = set(fraksi_kosong[fraksi_kosong > batas_kosong].index)
+    if kolom_hapus:
+        log.info("Menghapus kolom dengan banyak nilai kosong: %s", sorted(kolom_hapus))
+
+    def chunk_bersih():
+        # Chunk setelah kolom terlalu kosong dibuang, dropna dan dtype diseragamkan; urutan dan isi baris
+        # sama di lintasan dedup dan lintasan pembersihan, jadi nomor baris globalnya cocok
+        for chunk in baca_chunk(path, ukuran_chunk):
+            chunk = _standarkan(chunk)
+            chunk = chunk.drop(columns=[col for col in chunk.columns if col in kolom_hapus]).dropna()
+            yield _seragamkan(chunk, dtypes)
+
+    # Lintasan 2: dedup out-of-core (isi baris dibandingkan per partisi hash di disk)
+    duplikat, = _cari_duplikat(chunk_bersih(), os.path.dirname(os.path.abspath(path_bersih)),
+                               jumlah_partisi or _jumlah_partisi(path))
+
+    # Lintasan 3: pembersihan + sketsa kuantil
+    sketsa = {}
+    statistik = {'baris_awal': jumlah, 'baris_duplikat': len(duplikat), 'baris_bersih': 0, 'baris_hasil': 0}
+    agregat = []
+
+    def tulis_bersih(tujuan):
+        penulis = _PenulisIpc(tujuan)
+        awal = 0
+        try:
+            for chunk in chunk_bersih():
+                kiri, kanan = np.searchsorted(duplikat, [awal, awal + len(chunk)])
+                simpan = np.ones(len(chunk), dtype=bool)
+                simpan[duplikat[kiri:kanan] - awal] = False
+                awal += len(chunk)
+                chunk = chunk[simpan]
+                if 'TANGGAL' in chunk.columns:
+                    tanggal = pd.to_datetime(chunk['TANGGAL'], errors='coerce', format=format_tanggal)
+                    chunk = chunk.assign(TANGGAL=tanggal.fillna(pd.Timestamp(tanggal_default)))
+                chunk = chunk.drop(columns=[col for col in kolom_dibuang if col in chunk.columns])
+                if not len(chunk):
+                    continue
+                numerik = chunk.select_dtypes(include=['number']).drop(columns=['ID_PENJUALAN'], errors='ignore')
+                for col in numerik.columns:
+                    sketsa.setdefault(col, SketsaKuantil()).tambah(numerik[col].to_numpy())
+                penulis.tulis(chunk)
+                statistik['baris_bersih'] += len(chunk)
+            if penulis.writer is None:
+                raise ValueError('Tidak ada baris yang tersisa setelah pembersihan')
+        finally:
+            penulis.tutup()
+
+    _tulis_atomik(path_bersih, tulis_bersih)
+    log.info("Baris setelah pembersihan: %d dari %d (duplikat: %d)", statistik['baris_bersih'], jumlah, len(duplikat))
+
+    # Batas IQR dari sketsa (perkiraan; eksak selama kolom muat dalam satu kompaktor)
+    batas = {}
+    for col, s in sketsa.items():
+        q1, q3 = s.kuantil(0.25), s.kuantil(0.75)
+        batas[col] = (q1 - faktor_iqr * (q3 - q1), q3 + faktor_iqr * (q3 - q1))
+        log.debug("Batas outlier %s: [%s, %s]", col, batas[col][0], batas[col][1])
+    statistik['batas_outlier'] = batas
+
+    # Lintasan 4: outlier, kolom wajib, UTILITY
+    def tulis_hasil(tujuan):
+        penulis = _PenulisIpc(tujuan)
+        try:
+            for chunk in _batch_berkas(path_bersih):
+                simpan = np.ones(len(chunk), dtype=bool)
+                for col, (bawah, atas) in batas.items():
+                    nilai = chunk[col].to_numpy()
+                    simpan &= ~((nilai < bawah) | (nilai > atas))
+                chunk = chunk[simpan]
+                tambahan = {}
+                for col in KOLOM_WAJIB:
+                    if col not in chunk.columns:
+                        if col == 'ID_PENJUALAN':
+                            awal = statistik['baris_hasil'] + 1
+                            tambahan[col] = np.arange(awal, awal + len(chunk))
+                        else:
+                            tambahan[col] = {'QTY': 1, 'HARGASATUAN': 0, 'TANGGAL': pd.Timestamp.now()}.get(col, "Data Tidak Tersedia")
+                chunk = chunk.assign(**tambahan)
+                chunk = chunk.assign(UTILITY=perkalian_lebar(chunk['QTY'], chunk['HARGASATUAN']))
+                penulis.tulis(chunk)
+                agregat[:] = _lipat_agregat(agregat + [_agregat_transaksi(chunk)])
+                statistik['baris_hasil'] += len(chunk)
+        finally:
+            penulis.tutup()
+
+    _tulis_atomik(path_hasil, tulis_hasil)
+    statistik['transaksi'] = _gabung_agregat(agregat)
+    log.info("Baris setelah penghapusan outlier: %d", statistik['baris_hasil'])
+    return statistik
+
+
+def jalankan_streaming(pipeline, dataset_id, path, ukuran_chunk=UKURAN_CHUNK):
+    # (path bersih, path hasil, ringkasan per transaksi) untuk upload streaming; parameter tahap diambil
+    # dari pipeline dan berkas memakai kunci streaming pipeline sehingga upload ulang berkas yang sama
+    # tidak diproses ulang. Ringkasan transaksi disimpan di kunci tahap 'grup' varian streaming.
+    penyimpanan = pipeline.penyimpanan
+    if penyimpanan is None or not penyimpanan.tersedia:
+        raise ValueError('Mode streaming membutuhkan pyarrow')
+    kunci = pipeline.kunci(dataset_id, streaming=True)
+    path_bersih, path_hasil = penyimpanan.path(kunci['bersihkan']), penyimpanan.path(kunci['utilitas'])
+    if penyimpanan.ada(kunci['bersihkan']) and penyimpanan.ada(kunci['utilitas']):
+        log.info("Hasil preprocessing streaming %s dibaca dari penyimpanan kolumnar", dataset_id)
+        if penyimpanan.ada(kunci['grup']):
+            return path_bersih, path_hasil, penyimpanan.baca(kunci['grup'])
+        transaksi = ringkasan_transaksi(path_hasil)
+    else:
+        parameter = {nama: p for nama, _, p, _, _ in pipeline.tahap}
+        transaksi = preprocess_streaming(path, path_bersih, path_hasil, ukuran_chunk,
+                                         **parameter['bersihkan'], **parameter['outlier'])['transaksi']
+        pipeline.dihitung['streaming'] += 1
+    penyimpanan.simpan(kunci['grup'], transaksi)
+    return path_bersih, path_hasil, transaksi
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+# Profil data mentah yang dihitung sekali saat upload dan disimpan bersama entri dataset:
+# jumlah nilai kosong, dtype, kardinalitas dan kuantil kolom numerik, serta duplikat baris.
+# Duplikat dicari dari hash 64-bit per baris (satu lintasan vektor) alih-alih df.duplicated() dan
+# groupby semua kolom; yang disimpan hanya posisi baris duplikat beserta nomor grupnya sehingga
+# grup duplikat bisa disajikan per halaman. /check_missing_and_duplicates dan tahap 'bersihkan'
+# /preprocess memakai profil ini tanpa menghitung ulang.
+
+KUANTIL = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+class ProfilData:
+    def __init__(self, df):
+        self.jumlah_baris = len(df)
+        self.kolom = list(df.columns)
+        self.dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        kosong = df.isnull()
+        self.kosong = {col: int(n) for col, n in kosong.sum().items()}
+        # Baris yang seluruh kolomnya kosong (dibuang pertama kali oleh tahap 'bersihkan')
+        self.baris_kosong = int(kosong.all(axis=1).sum()) if len(df.columns) else 0
+        self.kardinalitas = {col: int(df[col].nunique()) for col in df.columns}
+        numerik = df.select_dtypes(include=['number'])
+        self.kuantil = {col: {str(q): (None if pd.isna(v) else float(v)) for q, v in nilai.items()}
+                        for col, nilai in numerik.quantile(list(KUANTIL)).items()} if len(numerik.columns) else {}
+
+        # Duplikat: kode per hash baris (pd.factorize: urut kemunculan pertama) -> jumlah kemunculan.
+        # Nomor grup = urutan kode, jadi grup juga dinomori menurut kemunculan pertamanya.
+        kode, unik = pd.factorize(pd.util.hash_pandas_object(df, index=False).to_numpy())
+        jumlah = np.bincount(kode, minlength=len(unik))
+        posisi = np.flatnonzero(jumlah[kode] > 1)
+        _, grup = np.unique(kode[posisi], return_inverse=True)
+        urutan = np.argsort(grup, kind='stable')
+        self.posisi_duplikat = posisi[urutan]
+        self.grup_duplikat = grup[urutan]
+        self.jumlah_duplikat = int(len(posisi))                    # duplicated(keep=False)
+        self.jumlah_duplikat_unik = int(len(kode) - len(unik))     # duplicated()
+
+    def kosong_tanpa_baris_kosong(self):
+        # (jumlah baris, {kolom: jumlah kosong}) setelah baris yang seluruhnya kosong dibuang
+        return (self.jumlah_baris - self.baris_kosong,
+                {col: n - self.baris_kosong for col, n in self.kosong.items()})
+
+    def halaman_duplikat(self, df, offset, ukuran):
+        # Baris duplikat (dengan Duplicate_Group) untuk posisi [offset, offset + ukuran) urutan grup
+        posisi = self.posisi_duplikat[offset:offset + ukuran]
+        baris = df.iloc[posisi].assign(Duplicate_Group=self.grup_duplikat[offset:offset + ukuran])
+        return [{k: (None if pd.isna(v) else v) for k, v in rekaman.items()}
+                for rekaman in baris.to_dict(orient='records')]
+
+    def ringkasan(self):
+        return {
+            'jumlah_baris': self.jumlah_baris,
+            'kolom': self.kolom,
+            'dtypes': self.dtypes,
+            'missing_values': self.kosong,
+            'baris_kosong': self.baris_kosong,
+            'kardinalitas': self.kardinalitas,
+            'kuantil': self.kuantil,
+            'num_duplicates': self.jumlah_duplikat,
+            'num_unique_duplicates': self.jumlah_duplikat_unik,
+        }
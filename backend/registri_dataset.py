@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import pandas as pd
+from penyimpanan_kolom import baca_feather
+
+# Registri dataset per upload: tiap upload mendapat dataset_id dan menyimpan hasil tiap tahap
+# ('raw', 'cleaned', 'processed'). DataFrame dibagikan apa adanya (read-only) ke semua endpoint;
+# dengan copy-on-write pandas (diaktifkan app saat start di pandas 2), turunan yang diubah otomatis
+# menjadi salinan sehingga tidak perlu .copy() di awal endpoint. Jika total memori melewati batas, tahap milik dataset yang paling lama
+# tidak diakses dilepas dari memori dan dibaca ulang dari berkasnya saat dibutuhkan lagi.
+# Dengan penyimpanan kolumnar, dataset_id adalah hash isi upload dan tahap 'raw'/'processed' disimpan
+# sebagai Feather, sehingga dataset_id yang tidak dikenal (restart / worker lain) dipulihkan dari disk.
+# Request tanpa dataset_id hanya dilayani dengan upload terakhir pada mode satu pengguna/pengembangan
+# (pakai_terakhir=True): upload terakhir bersifat global per server, jadi pengguna bersamaan akan saling
+# menimpa dataset "aktif" masing-masing. Pada mode itu upload terakhir dicatat di berkas_terakhir agar
+# semua worker sepakat; tanpa berkas itu tiap proses hanya mengenal upload yang diterimanya sendiri.
+
+log = logging.getLogger('efim.registri')
+
+TAHAP = ('raw', 'cleaned', 'processed')
+
+
+def baca_berkas(path):
+    if path.endswith('.feather'):
+        return baca_feather(path)
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    if path.endswith('.xlsx'):
+        return pd.read_excel(path)
+    raise ValueError(f'Format file tidak dikenali: {path}')
+
+
+def kunci_tahap(dataset_id, tahap):
+    # Kunci berkas kolumnar untuk tahap dataset
+    return dataset_id if tahap == 'raw' else f'{dataset_id}_{tahap}'
+
+
+def ukuran_frame(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class EntriDataset:
+    def __init__(self, path, dataset_id=None):
+        self.id = dataset_id or uuid.uuid4().hex
+        self.path = path
+        self.berkas = {'raw': path}   # tahap -> berkas untuk membaca ulang setelah dilepas
+        self.tahap = {}               # tahap -> DataFrame yang ada di memori
+        self.ukuran = {}              # tahap -> byte
+        self.streaming = False        # upload besar: raw tidak dimuat, preprocessing per chunk
+        self.profil = None            # ProfilData data mentah, dihitung sekali saat upload
+        self.jumlah_baris = None      # jumlah baris data mentah upload streaming, dihitung sekali
+        self.dibuat = time.time()
+
+    def ringkasan(self):
+        return {
+            'dataset_id': self.id,
+            'file_path': self.path,
+            'dibuat': self.dibuat,
+            'tahap': {nama: nama in self.tahap or nama in self.berkas for nama in TAHAP},
+            'memori': sum(self.ukuran.values()),
+            'streaming': self.streaming,
+        }
+
+
+class RegistriDataset:
+    def __init__(self, batas_memori=1 << 30, maks_dataset=100, penyimpanan=None, kunci_tahap=kunci_tahap,
+                 berkas_terakhir=None, pakai_terakhir=False):
+        self.batas_memori = batas_memori   # byte; total DataFrame di memori untuk semua dataset
+        self.maks_dataset = maks_dataset   # jumlah entri (termasuk yang sudah dilepas dari memori)
+        self._entri = OrderedDict()        # id -> EntriDataset, urut LRU
+        self._memori = 0
+        self._terakhir = None              # id upload terakhir
+        self.berkas_terakhir = berkas_terakhir  # JSON {dataset_id, path, streaming} bersama antar worker
+        self.pakai_terakhir = pakai_terakhir    # ambil() tanpa id memakai upload terakhir (satu pengguna)
+        self.penyimpanan = penyimpanan     # PenyimpananKolom (opsional) untuk tahap di disk
+        self.kunci_tahap = kunci_tahap     # (dataset_id, tahap) -> kunci berkas di penyimpanan
+        self._kunci = threading.RLock()
+
+    def __len__(self):
+        return len(self._entri)
+
+    @property
+    def memori_terpakai(self):
+        return self._memori
+
+    def daftar(self, path, raw=None, dataset_id=None, streaming=False):
+        # Dataset dari berkas upload; raw boleh sudah dibaca. dataset_id yang sudah terdaftar (isi
+        # berkas sama) memakai entri yang ada beserta tahap-tahapnya.
+        # streaming: upload besar yang tidak dimuat; tetap non-streaming jika data mentahnya sudah ada
+        with self._kunci:
+            entri = self._entri.get(dataset_id) if dataset_id else None
+            if entri is None:
+                entri = EntriDataset(path, dataset_id)
+                self._entri[entri.id] = entri
+                self._pasang_berkas(entri)
+            if streaming:
+                entri.streaming = 'raw' not in entri.tahap and not (
+                    self.penyimpanan is not None and self.penyimpanan.ada(entri.id))
+            self._terakhir = entri.id
+            self._tulis_terakhir(entri)
+            self._entri.move_to_end(entri.id)
+            while len(self._entri) > self.maks_dataset:
+                _, lama = self._entri.popitem(last=False)
+                self._memori -= sum(lama.ukuran.values())
+            if raw is not None and 'raw' not in entri.tahap:
+                self.simpan(entri.id, 'raw', raw)
+        return entri
+
+    def _pasang_berkas(self, entri):
+        # Daftarkan tahap yang sudah ada di penyimpanan kolumnar sebagai berkas yang bisa dibaca ulang
+        if self.penyimpanan is None:
+            return
+        for nama in TAHAP:
+            kunci = self.kunci_tahap(entri.id, nama)
+            if self.penyimpanan.ada(kunci):
+                entri.berkas[nama] = self.penyimpanan.path(kunci)
+
+    def _tulis_terakhir(self, entri):
+        if self.berkas_terakhir is None or not self.pakai_terakhir:
+            return
+        sementara = f'{self.berkas_terakhir}.{os.getpid()}.tmp'
+        with open(sementara, 'w') as berkas:
+            json.dump({'dataset_id': entri.id, 'path': entri.path, 'streaming': entri.streaming}, berkas)
+        os.replace(sementara, self.berkas_terakhir)
+
+    def _baca_terakhir(self):
+        # Catatan upload terakhir dari worker mana pun, None jika belum ada
+        if self.berkas_terakhir is None:
+            return None
+        try:
+            with open(self.berkas_terakhir) as berkas:
+                return json.load(berkas)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def ambil(self, dataset_id=None):
+        # Entri berdasarkan id; tanpa id None, kecuali pada mode pakai_terakhir (upload terakhir).
+        # Id yang tidak ada di memori dipulihkan dari penyimpanan kolumnar jika upload-nya ada di sana,
+        # atau dari catatan upload terakhir (mis. upload streaming yang diterima worker lain).
+        with self._kunci:
+            terakhir = None
+            if dataset_id is None:
+                if not self.pakai_terakhir:
+                    return None
+                terakhir = self._baca_terakhir()
+                dataset_id = terakhir['dataset_id'] if terakhir else self._terakhir
+            entri = self._entri.get(dataset_id)
+            if entri is None and dataset_id and self.penyimpanan is not None and self.penyimpanan.ada(dataset_id):
+                log.info("Dataset %s dipulihkan dari penyimpanan kolumnar", dataset_id)
+                entri = EntriDataset(self.penyimpanan.path(dataset_id), dataset_id)
+                self._pasang_berkas(entri)
+                self._entri[dataset_id] = entri
+            elif entri is None and terakhir and os.path.exists(terakhir['path']):
+                entri = EntriDataset(terakhir['path'], dataset_id)
+                entri.streaming = terakhir['streaming']
+                self._pasang_berkas(entri)
+                self._entri[dataset_id] = entri
+            if entri is not None:
+                self._entri.move_to_end(dataset_id)
+            return entri
+
+    def simpan(self, dataset_id, tahap, df, berkas=None):
+        # berkas: tempat tahap ini tersimpan di disk, sehingga boleh dilepas dari memori
+        with self._kunci:
+            entri = self._entri[dataset_id]
+            self._memori -= entri.ukuran.pop(tahap, 0)
+            entri.tahap[tahap] = df
+            entri.ukuran[tahap] = ukuran_frame(df)
+            self._memori += entri.ukuran[tahap]
+            if berkas is not None:
+                entri.berkas[tahap] = berkas
+            self._entri.move_to_end(dataset_id)
+            self._lepas_lru()
+
+    def pasang_berkas(self, dataset_id, tahap, berkas):
+        # Catat berkas tahap tanpa memuatnya ke memori (mis. keluaran preprocessing streaming)
+        with self._kunci:
+            self._entri[dataset_id].berkas[tahap] = berkas
+
+    def tahap(self, dataset_id, tahap):
+        # DataFrame tahap (read-only, jangan diubah in-place) atau None jika belum pernah dibuat
+        with self._kunci:
+            entri = self.ambil(dataset_id)
+            if entri is None:
+                return None
+            if tahap in entri.tahap:
+                return entri.tahap[tahap]
+            berkas = entri.berkas.get(tahap)
+        if berkas is None or not os.path.exists(berkas):
+            return None
+        log.info("Membaca ulang tahap %s dataset %s dari %s", tahap, entri.id, berkas)
+        df = baca_berkas(berkas)
+        self.simpan(entri.id, tahap, df)
+        return df
+
+    def _lepas_lru(self):
+        # Lepas tahap dari dataset paling lama tidak diakses; dataset terbaru selalu dipertahankan
+        for entri in list(self._entri.values())[:-1]:
+            if self._memori <= self.batas_memori:
+                return
+            if entri.tahap:
+                log.info("Melepas dataset %s dari memori (%d byte)", entri.id, sum(entri.ukuran.values()))
+            # Tahap tanpa berkas (mis. 'cleaned') tidak bisa dibaca ulang dan ikut hilang
+            self._memori -= sum(entri.ukuran.values())
+            entri.tahap.clear()
+            entri.ukuran.clear()
@@ -0,0 +1,55 @@
+import numpy as np
+from halaman import urutkan_itemset
+
+# Sapuan beberapa threshold dari satu kali mining. Hasil EFIM pada threshold terendah memuat semua
+# itemset untuk threshold yang lebih tinggi (itemset >= t adalah subset dari itemset >= t_min), jadi
+# cukup diurutkan sekali menurut utilitas: jumlah dan total utilitas per threshold didapat dengan
+# searchsorted + jumlah kumulatif, dan itemset per threshold adalah prefix dari urutan tersebut.
+
+JUMLAH_BIN = 20
+
+
+class SapuanThreshold:
+    def __init__(self, itemsets):
+        # itemsets: list (itemset, utilitas) hasil mining pada threshold terendah sapuan
+        self.itemsets = urutkan_itemset(itemsets, 'utility')
+        self.utilitas = np.array([util for _, util in self.itemsets], dtype=np.float64)
+        # Jumlah kumulatif utilitas dari itemset terbesar
+        self._kumulatif = np.concatenate([[0.0], np.cumsum(self.utilitas)])
+
+    def jumlah(self, threshold):
+        # Banyaknya itemset dengan utilitas >= threshold (utilitas terurut menurun)
+        return int(np.searchsorted(-self.utilitas, -threshold, side='right'))
+
+    def ringkasan(self, threshold):
+        n = self.jumlah(threshold)
+        return {
+            'threshold': threshold,
+            'jumlah_itemset': n,
+            'total_utility': float(self._kumulatif[n]),
+            'utility_maks': float(self.utilitas[0]) if n else None,
+        }
+
+    def itemset(self, threshold, offset=0, ukuran=None, urut='utility'):
+        # Itemset >= threshold (opsional satu halaman) dalam urutan 'utility', 'utility_asc' atau 'id'
+        terpilih = self.itemsets[:self.jumlah(threshold)]
+        if urut != 'utility':
+            terpilih = urutkan_itemset(terpilih, urut)
+        return terpilih[offset:] if ukuran is None else terpilih[offset:offset + ukuran]
+
+    def histogram(self, jumlah_bin=JUMLAH_BIN):
+        # Histogram utilitas untuk kurva "jumlah itemset vs threshold": batas bin (log jika rentang
+        # utilitas lebar), jumlah itemset per bin, dan jumlah itemset >= batas bawah tiap bin
+        if len(self.utilitas) == 0:
+            return {'batas': [], 'jumlah': [], 'jumlah_di_atas': []}
+        bawah, atas = float(self.utilitas[-1]), float(self.utilitas[0])
+        if bawah > 0 and atas / bawah > 100:
+            batas = np.geomspace(bawah, atas, jumlah_bin + 1)
+        else:
+            batas = np.linspace(bawah, atas, jumlah_bin + 1)
+        jumlah, _ = np.histogram(self.utilitas, bins=batas)
+        return {
+            'batas': batas.tolist(),
+            'jumlah': jumlah.tolist(),
+            'jumlah_di_atas': [self.jumlah(b) for b in batas[:-1].tolist()],
+        }
@@ -0,0 +1,289 @@
+import importlib
+import io
+import os
+import tempfile
+import time
+import unittest
+import pandas as pd
+from data_uji import data_transaksi, MIN_UTIL
+
+# Test endpoint Flask lewat test_client. app memakai folder relatif 'uploads', jadi modul diimpor
+# dari direktori sementara agar test tidak menulis ke direktori backend.
+app = None
+_cwd_asli = None
+
+
+def setUpModule():
+    global app, _cwd_asli
+    _cwd_asli = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    app = importlib.import_module('app')
+
+
+def tearDownModule():
+    os.chdir(_cwd_asli)
+
+
+def baris_transaksi(df=None):
+    # Baris JSON lengkap (NAMA_BARANG, TANGGAL, QTY ikut) untuk parameter data /run_efim
+    df = data_transaksi() if df is None else df
+    return df.assign(NAMA_BARANG='Barang ' + df['KODE_BARANG'], TANGGAL='2024-01-01',
+                     QTY=df['KUANTITAS']).drop(columns=['HARGA', 'KUANTITAS']).to_dict('records')
+
+
+def unggah(client, df, **form):
+    respons = client.post('/upload', data={'file': (io.BytesIO(df.to_csv(index=False).encode()), 'b.csv'), **form},
+                          content_type='multipart/form-data')
+    return respons.get_json()['dataset_id']
+
+
+class TestAppDatasetId(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        df = data_transaksi().rename(columns={'HARGA': 'HARGASATUAN', 'KUANTITAS': 'QTY'})
+        self.df_a = df.assign(NAMA_BARANG='Barang ' + df['KODE_BARANG'], TANGGAL='2024-01-01')
+        self.df_b = self.df_a.head(6)
+
+    def test_dua_upload_tidak_saling_menimpa(self):
+        id_a, id_b = unggah(self.client, self.df_a), unggah(self.client, self.df_b)
+        self.assertNotEqual(id_a, id_b)
+        for dataset_id, df in ((id_a, self.df_a), (id_b, self.df_b)):
+            isi = self.client.get(f'/raw_preview?dataset_id={dataset_id}').get_json()
+            self.assertEqual(isi['total_rows'], len(df))
+            status = self.client.get(f'/get_data_status?dataset_id={dataset_id}').get_json()
+            self.assertEqual(status['dataset_id'], dataset_id)
+        # Preprocess dataset A setelah B diupload tetap memproses A
+        isi = self.client.post('/preprocess', json={'dataset_id': id_a, 'threshold': MIN_UTIL}).get_json()
+        self.assertEqual(isi['dataset_id'], id_a)
+
+    def test_tanpa_dataset_id_ditolak(self):
+        unggah(self.client, self.df_a)
+        self.assertEqual(self.client.get('/raw_preview').status_code, 400)
+        self.assertEqual(self.client.get('/get_data_status').status_code, 400)
+        self.assertEqual(self.client.post('/preprocess', json={'threshold': MIN_UTIL}).status_code, 400)
+        self.assertEqual(self.client.post('/run_efim', json={'min_util': MIN_UTIL}).status_code, 400)
+        self.assertEqual(self.client.get('/raw_preview?dataset_id=tidak-ada').status_code, 404)
+
+    def test_mode_satu_pengguna_memakai_upload_terakhir(self):
+        try:
+            app.registri.pakai_terakhir = True
+            id_b = unggah(self.client, self.df_b)
+            self.assertEqual(self.client.get('/get_data_status').get_json()['dataset_id'], id_b)
+        finally:
+            app.registri.pakai_terakhir = False
+
+
+class TestAppCacheEfim(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        app.cache_efim.kosongkan()
+        for nama in os.listdir(app.cache_efim.direktori):
+            os.remove(os.path.join(app.cache_efim.direktori, nama))
+
+    def test_hasil_kedua_dari_cache(self):
+        data = baris_transaksi()
+        pertama = self.client.post('/run_efim', json={'data': data, 'min_util': MIN_UTIL})
+        self.assertEqual(pertama.status_code, 200)
+        self.assertFalse(pertama.get_json()['dari_cache'])
+        kedua = self.client.post('/run_efim', json={'data': data, 'min_util': MIN_UTIL + 5000})
+        self.assertTrue(kedua.get_json()['dari_cache'])
+        self.assertLessEqual(len(kedua.get_json()['itemset_utilitas_tinggi']),
+                             len(pertama.get_json()['itemset_utilitas_tinggi']))
+
+    def test_cache_disk_json_dan_terbatas(self):
+        direktori = app.cache_efim.direktori
+        maks_entri = app.cache_efim.maks_entri_disk
+        try:
+            app.cache_efim.maks_entri_disk = 1
+            for tambahan in (0, 1):
+                df = data_transaksi()
+                df.loc[0, 'KUANTITAS'] += tambahan
+                respons = self.client.post('/run_efim', json={'data': baris_transaksi(df), 'min_util': MIN_UTIL})
+                self.assertEqual(respons.status_code, 200)
+        finally:
+            app.cache_efim.maks_entri_disk = maks_entri
+        berkas = os.listdir(direktori)
+        self.assertEqual(len(berkas), 1)
+        self.assertTrue(berkas[0].endswith('.json'))
+
+
+class TestAppHalaman(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+
+    def test_halaman_berurutan(self):
+        data = baris_transaksi()
+        semua = self.client.post('/run_efim', json={'data': data, 'min_util': MIN_UTIL}).get_json()
+        diterima = []
+        cursor = None
+        while True:
+            respons = self.client.post('/run_efim/halaman', json={'data': data, 'min_util': MIN_UTIL,
+                                                                   'page_size': 2, 'cursor': cursor})
+            self.assertEqual(respons.status_code, 200)
+            isi = respons.get_json()
+            self.assertLessEqual(len(isi['itemset_utilitas_tinggi']), 2)
+            diterima += isi['itemset_utilitas_tinggi']
+            cursor = isi['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(len(diterima), len(semua['itemset_utilitas_tinggi']))
+
+    def test_parameter_halaman_tidak_valid(self):
+        respons = self.client.post('/run_efim/halaman', json={'data': baris_transaksi(), 'min_util': MIN_UTIL,
+                                                               'page_size': 'banyak'})
+        self.assertEqual(respons.status_code, 400)
+
+    def test_indeks_item_ikut_nama_barang(self):
+        # Transaksi sama, nama barang berbeda: indeks item tidak boleh dipakai bersama
+        data = baris_transaksi()
+        for awalan in ('Barang ', 'Produk baru '):
+            for baris in data:
+                baris['NAMA_BARANG'] = awalan + baris['KODE_BARANG']
+            respons = self.client.post('/run_efim/halaman', json={'data': data, 'min_util': MIN_UTIL})
+            nama = respons.get_json()['itemset_utilitas_tinggi'][0]['nama_barang']
+            self.assertTrue(all(n.startswith(awalan) for n in nama), nama)
+
+
+class TestAppSapuan(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+
+    def test_sapuan_sama_dengan_run_efim(self):
+        data = baris_transaksi()
+        thresholds = [MIN_UTIL + 10000, MIN_UTIL]
+        respons = self.client.post('/run_efim/sweep', json={'data': data, 'thresholds': thresholds})
+        self.assertEqual(respons.status_code, 200)
+        isi = respons.get_json()
+        self.assertEqual(isi['threshold_mining'], MIN_UTIL)
+        for threshold, ringkasan in zip(thresholds, isi['sapuan']):
+            tunggal = self.client.post('/run_efim', json={'data': data, 'min_util': threshold}).get_json()
+            self.assertEqual(ringkasan['jumlah_itemset'], len(tunggal['itemset_utilitas_tinggi']))
+
+    def test_parameter_tidak_valid(self):
+        data = baris_transaksi()
+        for body in ({'data': data}, {'data': data, 'thresholds': [MIN_UTIL], 'k': 3},
+                     {'data': data, 'thresholds': [MIN_UTIL], 'mode': 'tertutup'},
+                     {'data': data, 'thresholds': ['banyak']}):
+            self.assertEqual(self.client.post('/run_efim/sweep', json=body).status_code, 400, body)
+
+    def test_indeks_item_ikut_nama_barang(self):
+        data = baris_transaksi()
+        for awalan in ('Barang ', 'Produk baru '):
+            for baris in data:
+                baris['NAMA_BARANG'] = awalan + baris['KODE_BARANG']
+            respons = self.client.post('/run_efim/sweep', json={'data': data, 'thresholds': [MIN_UTIL]})
+            nama = respons.get_json()['sapuan'][0]['itemset_utilitas_tinggi'][0]['nama_barang']
+            self.assertTrue(all(n.startswith(awalan) for n in nama), nama)
+
+
+class TestAppStreaming(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        df = data_transaksi().rename(columns={'HARGA': 'HARGASATUAN', 'KUANTITAS': 'QTY'})
+        df = pd.concat([df.assign(NAMA_BARANG='Barang ' + df['KODE_BARANG'], TANGGAL='2024-01-01')] * 2)
+        self.dataset_id = unggah(self.client, df, streaming='1')
+        self.assertTrue(app.registri.ambil(self.dataset_id).streaming)
+
+    def test_duplikat_chunked(self):
+        isi = self.client.get(f'/check_missing_and_duplicates?dataset_id={self.dataset_id}').get_json()
+        self.assertEqual(isi['num_duplicates'], 24)
+        self.assertEqual(isi['num_unique_duplicates'], 12)
+
+    def test_preprocess_melaporkan_memori_ringkasan(self):
+        isi = self.client.post('/preprocess', json={'dataset_id': self.dataset_id, 'threshold': MIN_UTIL}).get_json()
+        self.assertEqual(isi['memori_ringkasan_transaksi']['jumlah_transaksi'], 4)
+        self.assertGreater(isi['memori_ringkasan_transaksi']['byte'], 0)
+
+
+class TestAppJob(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+
+    def _tunggu(self, job_id):
+        for _ in range(200):
+            isi = self.client.get(f'/jobs/{job_id}').get_json()
+            if isi['status'] not in ('menunggu', 'berjalan'):
+                return isi
+            time.sleep(0.05)
+        self.fail(f'Job {job_id} tidak selesai')
+
+    def test_job_selesai_sama_dengan_run_efim(self):
+        data = baris_transaksi()
+        respons = self.client.post('/jobs', json={'data': data, 'min_util': MIN_UTIL})
+        self.assertEqual(respons.status_code, 202)
+        isi = self._tunggu(respons.get_json()['job_id'])
+        self.assertEqual(isi['status'], 'selesai')
+        self.assertIsNone(isi['dihentikan'])
+        langsung = self.client.post('/run_efim', json={'data': data, 'min_util': MIN_UTIL}).get_json()
+        self.assertEqual(len(isi['hasil']['itemset_utilitas_tinggi']), len(langsung['itemset_utilitas_tinggi']))
+
+    def test_n_workers_ditolak(self):
+        respons = self.client.post('/jobs', json={'data': baris_transaksi(), 'min_util': MIN_UTIL, 'n_workers': 4})
+        self.assertEqual(respons.status_code, 400)
+
+    def test_anggaran_node_hasil_parsial(self):
+        respons = self.client.post('/jobs', json={'data': baris_transaksi(), 'min_util': 0, 'anggaran_node': 3})
+        isi = self._tunggu(respons.get_json()['job_id'])
+        self.assertEqual(isi['dihentikan'], 'anggaran_node')
+        self.assertEqual(isi['progres']['jumlah_node'], 3)
+
+    def test_job_tidak_ada(self):
+        self.assertEqual(self.client.get('/jobs/tidak-ada').status_code, 404)
+        self.assertEqual(self.client.delete('/jobs/tidak-ada').status_code, 404)
+
+    def test_batalkan(self):
+        respons = self.client.post('/jobs', json={'data': baris_transaksi(), 'min_util': MIN_UTIL})
+        job_id = respons.get_json()['job_id']
+        batal = self.client.delete(f'/jobs/{job_id}')
+        self.assertEqual(batal.status_code, 200)
+        # Job yang sudah selesai sebelum pembatalan tetap selesai; selain itu dibatalkan
+        self.assertIn(self._tunggu(job_id)['status'], ('selesai', 'dibatalkan'))
+
+
+def nilai_metrik(teks, seri):
+    # Nilai seri Prometheus (nama{label}) dari teks /metrics, 0 jika belum ada
+    for baris in teks.splitlines():
+        if baris.startswith(seri + ' '):
+            return float(baris.rsplit(' ', 1)[1])
+    return 0.0
+
+
+class TestAppMetrik(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        app.cache_efim.kosongkan()
+        for nama in os.listdir(app.cache_efim.direktori):
+            os.remove(os.path.join(app.cache_efim.direktori, nama))
+
+    def _metrik(self):
+        respons = self.client.get('/metrics')
+        self.assertEqual(respons.status_code, 200)
+        self.assertTrue(respons.content_type.startswith('text/plain'))
+        return respons.get_data(as_text=True)
+
+    def test_format_dan_seri(self):
+        teks = self._metrik()
+        for nama in ('efim_http_request_duration_seconds', 'efim_mining_total', 'efim_cache_hasil_total'):
+            self.assertIn(f'# TYPE {nama} ', teks)
+
+    def test_mining_dan_cache_tercatat(self):
+        sebelum = self._metrik()
+        data = baris_transaksi()
+        for _ in range(2):
+            self.assertEqual(self.client.post('/run_efim', json={'data': data, 'min_util': MIN_UTIL}).status_code, 200)
+        sesudah = self._metrik()
+        for seri, tambah in (('efim_cache_hasil_total{hasil="miss"}', 1), ('efim_cache_hasil_total{hasil="hit"}', 1),
+                             ('efim_mining_total{mesin="utility_list",mode="semua",dihentikan="tidak"}', 1),
+                             ('efim_http_request_duration_seconds_count{route="/run_efim",method="POST",status="200"}', 2)):
+            self.assertEqual(nilai_metrik(sesudah, seri) - nilai_metrik(sebelum, seri), tambah, seri)
+        self.assertIn('efim_mining_join_total{hasil="dilewati_irisan"}', sesudah)
+
+    def test_route_berpola_dan_status_error(self):
+        sebelum = self._metrik()
+        self.assertEqual(self.client.get('/jobs/tidak-ada').status_code, 404)
+        seri = 'efim_http_request_duration_seconds_count{route="/jobs/<job_id>",method="GET",status="404"}'
+        self.assertEqual(nilai_metrik(self._metrik(), seri) - nilai_metrik(sebelum, seri), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
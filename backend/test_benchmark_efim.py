@@ -0,0 +1,52 @@
+import pandas as pd
+import unittest
+from efim import EFIM
+from benchmark_efim import buat_data_retail, siapkan_frame, jalankan_skenario, bandingkan, FASE
+
+
+class TestBenchmarkEfim(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = buat_data_retail(3000, jumlah_item=80, rata_keranjang=4, seed=7)
+        cls.ringkasan = jalankan_skenario('uji', 3000, 80, 4, 0.01, seed=7, ulang=1)
+
+    def test_data_retail_deterministik(self):
+        self.assertEqual(len(self.df), 3000)
+        self.assertEqual(list(self.df.columns),
+                         ['ID_PENJUALAN', 'TANGGAL', 'KODE_BARANG', 'NAMA_BARANG', 'QTY', 'HARGASATUAN'])
+        pd.testing.assert_frame_equal(self.df, buat_data_retail(3000, jumlah_item=80, rata_keranjang=4, seed=7))
+        self.assertFalse(self.df.duplicated(['ID_PENJUALAN', 'KODE_BARANG']).any())
+
+    def test_distribusi_zipf(self):
+        # Item terpopuler jauh lebih sering dari median, rata-rata keranjang mendekati parameter
+        frekuensi = self.df['KODE_BARANG'].value_counts()
+        self.assertGreater(frekuensi.iloc[0], 5 * frekuensi.median())
+        self.assertAlmostEqual(self.df.groupby('ID_PENJUALAN').size().mean(), 4, delta=1)
+
+    def test_ringkasan_skenario(self):
+        self.assertEqual(set(self.ringkasan['waktu']), set(FASE))
+        self.assertTrue(all(w >= 0 for w in self.ringkasan['waktu'].values()))
+        self.assertGreater(self.ringkasan['memori_puncak']['muat_data'], 0)
+        frame = siapkan_frame(self.df)
+        efim = EFIM(float(frame['UTILITY'].sum()) * 0.01)
+        efim.jalankan(frame)
+        self.assertEqual(self.ringkasan['jumlah_itemset'], len(efim.high_utility_itemsets))
+
+    def test_bandingkan_tanpa_regresi(self):
+        self.assertEqual(bandingkan({'uji': self.ringkasan}, {'uji': self.ringkasan}), [])
+        self.assertEqual(bandingkan({'uji': self.ringkasan}, {}), [])
+
+    def test_bandingkan_mendeteksi_regresi(self):
+        # Lebih lambat, lebih boros, atau hasil berbeda terdeteksi sebagai satu regresi
+        ringkasan = self.ringkasan
+        lambat = {**ringkasan, 'waktu': {**ringkasan['waktu'], 'rekursi': ringkasan['waktu']['rekursi'] * 2 + 1}}
+        boros = {**ringkasan, 'memori_puncak_maks': ringkasan['memori_puncak_maks'] * 2}
+        beda = {**ringkasan, 'jumlah_itemset': ringkasan['jumlah_itemset'] + 1}
+        for baru, kata in [(lambat, 'waktu rekursi'), (boros, 'memori puncak'), (beda, 'jumlah itemset')]:
+            regresi = bandingkan({'uji': baru}, {'uji': ringkasan})
+            self.assertEqual(len(regresi), 1)
+            self.assertIn(kata, regresi[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
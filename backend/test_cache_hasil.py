@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+from efim import jalankan_algoritma_efim
+from cache_hasil import CacheHasil, sidik_jari
+from data_uji import data_transaksi
+
+KOLOM = ('ID_PENJUALAN', 'KODE_BARANG', 'UTILITY')
+
+
+class TestCacheHasil(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[list(KOLOM)]
+        self.kunci = sidik_jari(self.data, KOLOM)
+
+    def test_sidik_jari(self):
+        self.assertEqual(self.kunci, sidik_jari(self.data.copy(), KOLOM))
+        self.assertNotEqual(self.kunci, sidik_jari(self.data.assign(UTILITY=self.data['UTILITY'] + 1), KOLOM))
+
+    def test_threshold_lebih_tinggi_disaring(self):
+        cache = CacheHasil()
+        self.assertIsNone(cache.ambil(self.kunci, 10000))
+        cache.simpan(self.kunci, 10000, jalankan_algoritma_efim(self.data, 10000))
+        # Threshold >= threshold cache dijawab dengan penyaringan, hasilnya sama dengan mining ulang
+        for threshold in [10000, 15000, 25000]:
+            self.assertEqual(cache.ambil(self.kunci, threshold), jalankan_algoritma_efim(self.data, threshold))
+        self.assertIsNone(cache.ambil(self.kunci, 5000))
+        self.assertEqual(cache.ambil(self.kunci, 0, k=3), jalankan_algoritma_efim(self.data, 0, k=3))
+
+    def test_eviction_memori(self):
+        # Eviction LRU berdasarkan jumlah entri
+        cache = CacheHasil(maks_entri=1)
+        cache.simpan('a', 0, [(['A'], 1)])
+        cache.simpan('b', 0, [(['B'], 1)])
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.ambil('a', 0))
+
+    def test_persistensi_json(self):
+        # Instance baru membaca dari disk; berkasnya JSON biasa, bukan pickle
+        cache = CacheHasil(direktori=tempfile.mkdtemp())
+        cache.simpan(self.kunci, 10000, jalankan_algoritma_efim(self.data, 10000))
+        cache.simpan('tertutup', 0, [(['A', 'B'], 43000, [20000, 23000])])
+        with open(os.path.join(cache.direktori, f'efim_{self.kunci}.json')) as berkas:
+            self.assertEqual(json.load(berkas)['threshold'], 10000)
+        cache_baru = CacheHasil(direktori=cache.direktori)
+        self.assertEqual(cache_baru.ambil(self.kunci, 15000), jalankan_algoritma_efim(self.data, 15000))
+        self.assertEqual(cache_baru.ambil('tertutup', 0), [(['A', 'B'], 43000, [20000, 23000])])
+
+    def test_berkas_rusak_diabaikan(self):
+        cache = CacheHasil(direktori=tempfile.mkdtemp())
+        with open(os.path.join(cache.direktori, 'efim_rusak.json'), 'w') as berkas:
+            berkas.write('{"threshold": 0, "itemsets": [')
+        self.assertIsNone(cache.ambil('rusak', 0))
+
+    def test_batas_entri_disk(self):
+        cache = CacheHasil(direktori=tempfile.mkdtemp(), maks_entri_disk=None)
+        for i, kunci in enumerate('abc'):
+            cache.simpan(kunci, 0, [([kunci.upper()], 1)])
+            os.utime(cache._berkas(kunci), (i, i))
+        # Membaca 'a' dari disk menyentuh mtime-nya, jadi 'b' yang paling lama tidak dipakai
+        self.assertEqual(CacheHasil(direktori=cache.direktori).ambil('a', 0), [(['A'], 1)])
+        cache.maks_entri_disk = 2
+        self.assertEqual(cache.rapikan_disk(), ['b'])
+        self.assertEqual(sorted(os.listdir(cache.direktori)), ['efim_a.json', 'efim_c.json'])
+        # Penulisan berikutnya merapikan sendiri
+        cache.simpan('d', 0, [(['D'], 1)])
+        self.assertEqual(len(os.listdir(cache.direktori)), 2)
+        self.assertTrue(os.path.exists(cache._berkas('d')))
+
+    def test_batas_byte_disk(self):
+        cache = CacheHasil(direktori=tempfile.mkdtemp(), maks_entri_disk=None, maks_byte_disk=0)
+        cache.simpan('a', 0, [(['A'], 1)])
+        # Berkas di atas batas langsung dihapus, tetapi entri di memori tetap melayani
+        self.assertEqual(os.listdir(cache.direktori), [])
+        self.assertEqual(cache.ambil('a', 0), [(['A'], 1)])
+        cache = CacheHasil(direktori=cache.direktori, maks_entri_disk=None, maks_byte_disk=None)
+        cache.simpan('a', 0, [(['A'], 1)])
+        cache.simpan('b', 0, [(['B'], 1)])
+        os.utime(cache._berkas('a'), (0, 0))
+        cache.maks_byte_disk = os.path.getsize(cache._berkas('b'))
+        self.assertEqual(cache.rapikan_disk(), ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from efim_jendela import tambang_per_jendela
+from data_uji import data_transaksi
+
+KOLOM = ['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']
+
+
+def sebagai_dict(itemsets):
+    return {frozenset(i): u for i, u in itemsets}
+
+
+class TestEfimJendela(unittest.TestCase):
+    def setUp(self):
+        tanggal = {'T1': '2024-01-01', 'T2': '2024-01-02', 'T3': '2024-01-04', 'T4': '2024-01-09'}
+        data = data_transaksi()
+        self.data = data.assign(TANGGAL=data['ID_PENJUALAN'].map(tanggal))
+
+    def _periksa(self, jenis, isi):
+        hasil = list(tambang_per_jendela(self.data, 10000, jenis, lebar_hari=4, langkah_hari=2))
+        self.assertEqual(len(hasil), len(isi))
+        for h, tid in zip(hasil, isi):
+            # Hasil tiap jendela harus sama dengan EFIM penuh atas transaksi di jendela tersebut
+            harapan = jalankan_algoritma_efim(self.data[self.data['ID_PENJUALAN'].isin(tid)][KOLOM], 10000)
+            self.assertEqual(h['jumlah_transaksi'], len(tid))
+            self.assertEqual(sebagai_dict(h['itemset']), sebagai_dict(harapan))
+
+    def test_harian(self):
+        self._periksa('harian', [['T1'], ['T2'], ['T3'], ['T4']])
+
+    def test_mingguan(self):
+        self._periksa('mingguan', [['T1', 'T2', 'T3'], ['T4']])
+
+    def test_geser(self):
+        # Jendela 4 hari bergeser 2 hari; jendela tanpa transaksi tetap dilaporkan
+        self._periksa('geser', [['T1', 'T2', 'T3'], ['T3'], [], ['T4']])
+
+    def test_hapus_transaksi(self):
+        # Kebalikan tambah_transaksi: hapus transaksi dari EFIM yang sudah di-mining (id tak dikenal diabaikan)
+        efim = EFIM(10000)
+        efim.jalankan(self.data[KOLOM])
+        hasil = efim.hapus_transaksi(['T2', 'TX'])
+        harapan = jalankan_algoritma_efim(self.data[self.data['ID_PENJUALAN'] != 'T2'][KOLOM], 10000)
+        self.assertEqual(sebagai_dict(hasil), sebagai_dict(harapan))
+        self.assertEqual(efim.jumlah_transaksi, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
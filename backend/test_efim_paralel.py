@@ -0,0 +1,21 @@
+import unittest
+from efim import jalankan_algoritma_efim
+from data_uji import data_transaksi
+
+
+class TestEfimParalel(unittest.TestCase):
+    def setUp(self):
+        self.data_transaksi = data_transaksi()
+
+    def test_mining_paralel(self):
+        data = self.data_transaksi[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+        for mesin in ['utility_list', 'proyeksi']:
+            serial = jalankan_algoritma_efim(data, 10000, mesin=mesin)
+            paralel = jalankan_algoritma_efim(data, 10000, mesin=mesin, n_workers=2)
+            # Hasil dan urutannya harus identik dengan mode serial
+            self.assertEqual(serial, paralel)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from data_uji import data_transaksi
+
+
+class TestEfimProyeksi(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+
+    def test_sama_dengan_utility_list(self):
+        for min_util in [0, 10000, 15000, 25000]:
+            efim_ul = EFIM(min_util)
+            efim_ul.jalankan(self.data)
+            efim_proyeksi = EFIM(min_util, mesin='proyeksi')
+            efim_proyeksi.jalankan(self.data)
+
+            hasil_ul = {frozenset(itemset): util for itemset, util in efim_ul.high_utility_itemsets}
+            hasil_proyeksi = {frozenset(itemset): util for itemset, util in efim_proyeksi.high_utility_itemsets}
+            self.assertEqual(hasil_ul, hasil_proyeksi, min_util)
+
+    def test_utilitas_itemset_panjang(self):
+        # Utilitas {A, B, C} hanya dari T1: 10000 + 7000 + 3000
+        hasil_0 = dict((frozenset(itemset), util) for itemset, util in jalankan_algoritma_efim(self.data, 0, mesin='proyeksi'))
+        self.assertEqual(hasil_0[frozenset('ABC')], 20000)
+
+    def test_mesin_tidak_dikenal(self):
+        with self.assertRaises(ValueError):
+            EFIM(15000, mesin='tidak_ada')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from efim import EFIM
+from data_uji import data_transaksi
+
+
+class TestEUCS(unittest.TestCase):
+    def setUp(self):
+        self.data_transaksi = data_transaksi()
+
+    def test_eucs_sparse(self):
+        efim = EFIM(50000)
+        efim.muat_data(self.data_transaksi[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']])
+        efim.hitung_TWU()
+        items = efim.prune_items_by_twu()
+        efim.hitung_EUCS(items)
+
+        kode = {label: i for i, label in enumerate(efim.label_item)}
+        # Hanya A, B, C yang lolos (TWU >= 50000) -> 3 pasangan, masing-masing disimpan sekali
+        self.assertEqual(len(efim.eucs), 3)
+        # EUCS(A, B) = TU(T1) + TU(T4) setelah pruning = 20000 + 26000
+        self.assertEqual(efim.eucs[(kode['A'], kode['B'])], 46000)
+        self.assertEqual(efim.eucs[(kode['B'], kode['A'])], 46000)
+        self.assertEqual(efim.eucs[(kode['A'], kode['D'])], 0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import pandas as pd
+import unittest
+from pipeline_preprocessing import kelompokkan
+from halaman import (parameter_halaman, info_halaman, urutkan_itemset,
+                     urutan_transaksi, kelompokkan_transaksi, iter_blok_transaksi, URUTAN)
+
+
+class TestHalaman(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'ID_PENJUALAN': [3, 1, 2, 1, 3, 2, 4],
+            'KODE_BARANG': ['A', 'B', 'A', 'C', 'C', 'B', 'A'],
+            'NAMA_BARANG': ['a', 'b', 'a', 'c', 'c', 'b', 'a'],
+            'QTY': [1, 2, 3, 1, 1, 1, 5],
+            'HARGASATUAN': [10, 20, 10, 5, 5, 20, 10],
+            'TANGGAL': pd.to_datetime(['2024-01-01'] * 7),
+        }).assign(UTILITY=lambda df: df['QTY'] * df['HARGASATUAN'])
+
+    def test_urutkan_itemset(self):
+        itemsets = [(['B'], 50), (['A', 'C'], 90), (['C'], 50), (['A'], 90), (['B', 'C'], 10)]
+        terurut = urutkan_itemset(itemsets, 'utility')
+        self.assertEqual(terurut, [(['A'], 90), (['A', 'C'], 90), (['B'], 50), (['C'], 50), (['B', 'C'], 10)])
+        self.assertEqual(urutkan_itemset(itemsets, 'utility_asc')[0], (['B', 'C'], 10))
+        self.assertEqual(urutkan_itemset(itemsets, 'id'), itemsets)
+
+    def test_parameter_halaman(self):
+        self.assertEqual(parameter_halaman({}), (0, 100, 'utility'))
+        self.assertEqual(parameter_halaman({'cursor': '40', 'page_size': '20', 'urut': 'id'}), (40, 20, 'id'))
+        for salah in ({'page_size': 0}, {'cursor': '-1'}, {'urut': 'nama'}, {'cursor': 'abc'}):
+            with self.assertRaises(ValueError):
+                parameter_halaman(salah)
+
+    def test_info_halaman(self):
+        self.assertIsNone(info_halaman(5, 3, 2, 'id')['next_cursor'])
+        self.assertEqual(info_halaman(5, 0, 2, 'id')['next_cursor'], '2')
+
+    def test_halaman_transaksi(self):
+        # Halaman transaksi disusun ulang dari kelompokkan() tanpa mengelompokkan seluruh data
+        semua = kelompokkan(self.df)
+        self.assertEqual(urutan_transaksi(self.df, 'id').tolist(), [1, 2, 3, 4])
+        self.assertEqual(urutan_transaksi(self.df, 'utility').tolist(), [2, 4, 1, 3])   # TU 50, 50, 45, 15
+        halaman = kelompokkan_transaksi(self.df, urutan_transaksi(self.df, 'utility')[1:3])
+        self.assertEqual(halaman['ID_PENJUALAN'].tolist(), [4, 1])
+        self.assertEqual(halaman.iloc[1].to_dict(), semua.iloc[0].to_dict())
+
+    def test_blok_transaksi(self):
+        for urut in URUTAN:
+            gabung = pd.concat(list(iter_blok_transaksi(self.df, urut, ukuran_blok=3)), ignore_index=True)
+            self.assertEqual(gabung['ID_PENJUALAN'].tolist(), urutan_transaksi(self.df, urut).tolist())
+        gabung = pd.concat(list(iter_blok_transaksi(self.df, 'id', ukuran_blok=3)), ignore_index=True)
+        pd.testing.assert_frame_equal(gabung, kelompokkan(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import unittest
+from efim import EFIM
+from hui_tertutup import saring_maksimal, pulihkan_hui
+
+MIN_UTIL = 600
+
+
+class TestHuiTertutup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Transaksi berpola bundel: item satu bundel sering dibeli bersama sehingga banyak HUI redundan
+        rng = np.random.default_rng(8)
+        baris = []
+        for tid in range(200):
+            bundel = rng.integers(0, 3)
+            items = set(range(bundel * 3, bundel * 3 + rng.integers(2, 4))) | set(rng.integers(9, 14, 2).tolist())
+            baris.extend((tid, f'I{item}', int(rng.integers(1, 20))) for item in items)
+        cls.df = pd.DataFrame(baris, columns=['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY'])
+
+        cls.semua = EFIM(MIN_UTIL)
+        cls.semua.jalankan(cls.df)
+        cls.hui = {frozenset(i): u for i, u in cls.semua.high_utility_itemsets}
+
+        # Acuan: tidset setiap HUI dari data, closed = tanpa superset HUI dengan tidset sama
+        tidset_item = cls.df.groupby('KODE_BARANG')['ID_PENJUALAN'].agg(frozenset).to_dict()
+        tidset = {x: frozenset.intersection(*(tidset_item[i] for i in x)) for x in cls.hui}
+        cls.tertutup_acuan = {x for x in cls.hui if not any(x < y and tidset[y] == tidset[x] for y in cls.hui)}
+        cls.maksimal_acuan = {x for x in cls.hui if not any(x < y for y in cls.hui)}
+
+        cls.hasil = {}
+        for mode in ['tertutup', 'maksimal']:
+            cls.hasil[mode] = EFIM(MIN_UTIL, mode=mode)
+            cls.hasil[mode].jalankan(cls.df)
+
+    def _itemset(self, mode):
+        return {frozenset(i) for i, _ in self.hasil[mode].high_utility_itemsets}
+
+    def test_utilitas_sama_dengan_semua_hui(self):
+        for efim in self.hasil.values():
+            for itemset, util in efim.high_utility_itemsets:
+                self.assertEqual(util, self.hui[frozenset(itemset)])
+
+    def test_tertutup(self):
+        self.assertEqual(self._itemset('tertutup'), self.tertutup_acuan)
+        self.assertLess(len(self.tertutup_acuan), len(self.hui))
+
+    def test_maksimal(self):
+        self.assertEqual(self._itemset('maksimal'), self.maksimal_acuan)
+
+    def test_pemangkasan_saat_pencarian(self):
+        # Pemangkasan terjadi saat pencarian: node yang dijelajahi lebih sedikit
+        self.assertGreater(self.hasil['tertutup'].cabang_tidak_tertutup, 0)
+        self.assertLess(self.hasil['tertutup'].jumlah_node, self.semua.jumlah_node)
+
+    def test_pulihkan_dari_tertutup(self):
+        # Semua HUI dibangun ulang dari closed HUI + utilitas per item
+        efim = self.hasil['tertutup']
+        tertutup = [(i, u, efim.utilitas_unit[tuple(i)]) for i, u in efim.high_utility_itemsets]
+        for itemset, util, unit in tertutup:
+            self.assertEqual(sum(unit), util)
+        self.assertEqual({frozenset(i): u for i, u in pulihkan_hui(tertutup, MIN_UTIL)}, self.hui)
+        self.assertEqual({frozenset(x[0]) for x in saring_maksimal(tertutup)}, self.maksimal_acuan)
+
+    def test_saring_maksimal(self):
+        self.assertEqual(saring_maksimal([(['A'], 5), (['A', 'B'], 7), (['C'], 3)]), [(['A', 'B'], 7), (['C'], 3)])
+
+    def test_kombinasi_tidak_didukung(self):
+        with self.assertRaises(ValueError):
+            EFIM(MIN_UTIL, mode='tertutup', mesin='proyeksi')
+        with self.assertRaises(ValueError):
+            EFIM(MIN_UTIL, mode='maksimal', k=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from efim import EFIM
+from indeks_item import IndeksItem
+from data_uji import data_transaksi, MIN_UTIL
+
+
+class TestIndeksItem(unittest.TestCase):
+    def setUp(self):
+        tanggal = {'T1': '2024-01-01', 'T2': '2024-01-05', 'T3': '2024-01-03', 'T4': 'bukan tanggal'}
+        data = data_transaksi()
+        self.data = data.assign(TANGGAL=data['ID_PENJUALAN'].map(tanggal), QTY=data['KUANTITAS'],
+                                NAMA_BARANG='Barang ' + data['KODE_BARANG'])
+        self.indeks = IndeksItem(self.data)
+
+    def test_twu_sama_dengan_efim(self):
+        # TWU hasil groupby vektor sama dengan TWU EFIM, dan TWU EFIM dipakai ulang jika diberikan
+        efim = EFIM(MIN_UTIL)
+        efim.jalankan(self.data[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']])
+        self.assertEqual(self.indeks.twu, dict(efim.items_twu))
+        self.assertEqual(IndeksItem(self.data, efim).twu, self.indeks.twu)
+
+    def test_format_itemset(self):
+        hasil = self.indeks.format_itemset(('A', 'C'), 20000)
+        self.assertEqual(hasil['nama_barang'], ['Barang A', 'Barang C'])
+        self.assertEqual(hasil['rentang_waktu'], 4)   # C: 1 s.d. 5 Januari; tanggal tidak valid diabaikan
+        self.assertEqual(hasil['total_terjual'], 4 + 5)
+
+    def test_item_tidak_dikenal(self):
+        self.assertEqual(self.indeks.format_itemset(['Z'], 0)['nama_barang'], ['Produk Z'])
+
+
+if __name__ == '__main__':
+    unittest.main()
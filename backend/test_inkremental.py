@@ -0,0 +1,34 @@
+import pandas as pd
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from data_uji import data_transaksi
+
+
+class TestInkremental(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+        self.tambahan = pd.DataFrame({
+            'ID_PENJUALAN': ['T1', 'T5', 'T5', 'T5'],  # T1 sudah ada: baris ditambahkan ke transaksi lama
+            'KODE_BARANG': ['A', 'A', 'B', 'D'],
+            'UTILITY': [4000, 3000, 2000, 9000],
+        })
+
+    def test_sama_dengan_mining_ulang(self):
+        harapan = jalankan_algoritma_efim(pd.concat([self.data, self.tambahan]), 10000)
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(10000, mesin=mesin)
+            efim.jalankan(self.data)
+            hasil = efim.tambah_transaksi(self.tambahan)
+            self.assertEqual({frozenset(i): u for i, u in hasil}, {frozenset(i): u for i, u in harapan})
+
+    def test_twu_dan_transaksi_diperbarui(self):
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(10000, mesin=mesin)
+            efim.jalankan(self.data)
+            efim.tambah_transaksi(self.tambahan)
+            self.assertEqual(efim.items_twu['D'], 18000 + 14000)
+            self.assertEqual(efim.jumlah_transaksi, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import threading
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from pekerjaan import PengelolaJob
+from data_uji import data_transaksi
+
+
+class TestKendaliPencarian(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+        self.lengkap = {frozenset(i): u for i, u in jalankan_algoritma_efim(self.data, 0)}
+
+    def test_anggaran_node(self):
+        # Berhenti tepat setelah 5 node, hasil parsial adalah bagian dari hasil lengkap
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(0, mesin=mesin, anggaran_node=5, n_workers=4)
+            efim.jalankan(self.data)
+            self.assertEqual(efim.dihentikan, 'anggaran_node')
+            self.assertEqual(efim.jumlah_node, 5)
+            self.assertTrue(0 < len(efim.high_utility_itemsets) < len(self.lengkap))
+            for itemset, util in efim.high_utility_itemsets:
+                self.assertEqual(self.lengkap[frozenset(itemset)], util)
+
+    def test_anggaran_cukup(self):
+        # Anggaran cukup besar: hasil lengkap dan tidak dihentikan
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(0, mesin=mesin, anggaran_node=1000, anggaran_waktu=60)
+            efim.jalankan(self.data)
+            self.assertIsNone(efim.dihentikan)
+            self.assertEqual(len(efim.high_utility_itemsets), len(self.lengkap))
+
+    def test_dibatalkan(self):
+        batal = threading.Event()
+        batal.set()
+        efim = EFIM(0, batal=batal)
+        efim.jalankan(self.data)
+        self.assertEqual((efim.dihentikan, efim.high_utility_itemsets), ('dibatalkan', []))
+
+    def test_pengelola_job(self):
+        # Pool satu worker, job kedua dibatalkan selagi menunggu
+        pengelola = PengelolaJob(maks_worker=1)
+        lepas = threading.Event()
+
+        def tambang(efim):
+            lepas.wait(10)
+            efim.jalankan(self.data)
+            return len(efim.high_utility_itemsets)
+
+        job1 = pengelola.kirim(tambang, EFIM(0))
+        job2 = pengelola.kirim(tambang, EFIM(0))
+        self.assertEqual(pengelola.batalkan(job2.id).status, 'dibatalkan')
+        lepas.set()
+        job1.future.result(10)
+        self.assertEqual((job1.status, job1.hasil), ('selesai', len(self.lengkap)))
+        self.assertEqual(job1.ringkasan()['progres']['jumlah_itemset'], len(self.lengkap))
+        self.assertIsNone(pengelola.batalkan('tidak-ada'))
+
+
+if __name__ == '__main__':
+    unittest.main()
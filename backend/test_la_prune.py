@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import unittest
+from efim import EFIM
+from bitmap_tid import BitmapTid
+import bitmap_tid
+import efim as modul_efim
+
+
+def hasil(efim):
+    return sorted((tuple(sorted(i)), u) for i, u in efim.high_utility_itemsets)
+
+
+class TestLaPrune(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 3000
+        bobot = np.linspace(2, 0.2, 12)
+        self.df = pd.DataFrame({
+            'ID_PENJUALAN': rng.integers(1, 400, n),
+            'KODE_BARANG': rng.choice(list('ABCDEFGHIJKL'), n, p=bobot / bobot.sum()),
+            'UTILITY': rng.integers(1, 60, n),
+        }).drop_duplicates(['ID_PENJUALAN', 'KODE_BARANG'])
+
+    def _tanpa_bitmap(self, min_util):
+        # Tanpa bitmap (searchsorted) dan dengan blok kecil (batas dicek berkali-kali per join)
+        asli_batas, asli_blok = bitmap_tid.BATAS_BYTE_BITMAP, modul_efim.UKURAN_BLOK_JOIN
+        try:
+            bitmap_tid.BATAS_BYTE_BITMAP, modul_efim.UKURAN_BLOK_JOIN = 0, 8
+            efim = EFIM(min_util)
+            efim.jalankan(self.df)
+        finally:
+            bitmap_tid.BATAS_BYTE_BITMAP, modul_efim.UKURAN_BLOK_JOIN = asli_batas, asli_blok
+        return efim
+
+    def test_bitmap_anggota(self):
+        # Keanggotaan tid per item sama dengan himpunan aslinya
+        rng = np.random.default_rng(5)
+        items, tids = rng.integers(0, 6, 300), rng.integers(0, 77, 300)
+        bitmap = BitmapTid.dari_pasangan(items, tids, 6, 77)
+        semua = np.arange(77)
+        for item in range(6):
+            np.testing.assert_array_equal(bitmap.anggota(item, semua), np.isin(semua, tids[items == item]))
+        self.assertIsNone(BitmapTid.dari_pasangan(items, tids, 6, 77, batas_byte=10))
+
+    def test_jumlah_irisan(self):
+        # AND + popcount sama dengan ukuran irisan himpunan, juga saat kandidat diproses per blok kecil
+        rng = np.random.default_rng(7)
+        items, tids = rng.integers(0, 20, 2000), rng.integers(0, 500, 2000)
+        bitmap = BitmapTid.dari_pasangan(items, tids, 20, 500)
+        px = np.unique(rng.integers(37, 300, 60))
+        harapan = [len(np.intersect1d(px, tids[items == item])) for item in range(20)]
+        self.assertEqual(bitmap.jumlah_irisan(np.arange(20), px).tolist(), harapan)
+        asli = bitmap_tid.UKURAN_BLOK_IRISAN
+        try:
+            bitmap_tid.UKURAN_BLOK_IRISAN = 1
+            self.assertEqual(bitmap.jumlah_irisan(np.arange(20), px).tolist(), harapan)
+        finally:
+            bitmap_tid.UKURAN_BLOK_IRISAN = asli
+        self.assertEqual(bitmap.jumlah_irisan(np.arange(20), px[:0]).tolist(), [0] * 20)
+
+    def test_hasil_sama_dengan_acuan(self):
+        for min_util in [2000, 800]:
+            # Mesin proyeksi tidak memakai join utility list: acuan hasil
+            acuan = EFIM(min_util, mesin='proyeksi')
+            acuan.jalankan(self.df)
+            efim = EFIM(min_util)
+            efim.jalankan(self.df)
+            self.assertIsNotNone(efim._bitmap)
+            self.assertEqual(hasil(efim), hasil(acuan))
+            tanpa_bitmap = self._tanpa_bitmap(min_util)
+            self.assertIsNone(tanpa_bitmap._bitmap)
+            self.assertEqual(hasil(tanpa_bitmap), hasil(acuan))
+
+    def test_join_dilewati_pra_cek_irisan(self):
+        for min_util in [2000, 800]:
+            efim = EFIM(min_util)
+            efim.jalankan(self.df)
+            tanpa_bitmap = self._tanpa_bitmap(min_util)
+            # Dengan bitmap sebagian kandidat tidak pernah di-join; sisanya masih bisa dipangkas LA-Prune.
+            # Tanpa bitmap semua kandidat itu dipangkas LA-Prune di tengah join.
+            self.assertGreater(efim.join_dilewati, 0)
+            self.assertEqual(tanpa_bitmap.join_dilewati, 0)
+            self.assertEqual(efim.join_dilewati + efim.join_dipangkas, tanpa_bitmap.join_dipangkas)
+            self.assertEqual(efim.join_dibangun, tanpa_bitmap.join_dibangun)
+            self.assertEqual(efim.progres()['join_dilewati'], efim.join_dilewati)
+
+    def test_join_dilewati_tidak_memanggil_join(self):
+        efim = EFIM(2000)
+        dipanggil = []
+        asli = efim.construct_utility_list
+        efim.construct_utility_list = lambda *args: dipanggil.append(1) or asli(*args)
+        efim.jalankan(self.df)
+        self.assertEqual(len(dipanggil), efim.join_dibangun + efim.join_dipangkas)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+from contextlib import redirect_stdout
+import io
+import unittest
+from efim import EFIM
+from metrik import RegistriMetrik, MetrikEfim
+from data_uji import data_transaksi
+
+
+class TestMetrik(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+
+    def test_tanpa_cetak(self):
+        # Tanpa konfigurasi logging, mining tidak mencetak apa pun
+        for mesin in ['utility_list', 'proyeksi']:
+            keluaran = io.StringIO()
+            with redirect_stdout(keluaran):
+                EFIM(10000, mesin=mesin).jalankan(self.data)
+            self.assertEqual(keluaran.getvalue(), '')
+
+    def test_statistik_penghitung(self):
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(10000, mesin=mesin)
+            efim.jalankan(self.data)
+            statistik = efim.statistik()
+            self.assertEqual(statistik['jumlah_itemset'], len(efim.high_utility_itemsets))
+            self.assertEqual(statistik['jumlah_node'], efim.jumlah_node)
+            self.assertEqual(statistik['pangkas_twu'], int((efim.twu < 10000).sum()))
+            if mesin == 'utility_list':
+                self.assertGreater(statistik['join_dibangun'], 0)
+            else:
+                self.assertEqual(statistik['join_dibangun'], 0)
+            # Run berikutnya mulai dari nol, bukan akumulasi
+            efim.jalankan(self.data)
+            self.assertEqual(efim.statistik()['jumlah_node'], statistik['jumlah_node'])
+
+        # Threshold lebih tinggi memangkas lebih banyak item lewat TWU
+        ketat = EFIM(40000)
+        ketat.jalankan(self.data)
+        self.assertGreaterEqual(ketat.pangkas_twu, statistik['pangkas_twu'])
+
+    def test_statistik_fase(self):
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(10000, mesin=mesin)
+            efim.jalankan(self.data)
+            statistik = efim.statistik()
+            fase = {'muat_data', 'hitung_TWU', 'database_terpangkas', 'rekursi'}
+            if mesin == 'utility_list':
+                fase |= {'hitung_EUCS', 'buat_utility_list'}
+            self.assertEqual(set(statistik['fase']), fase)
+            self.assertTrue(all(f['detik'] >= 0 and f['memori'] >= 0 for f in statistik['fase'].values()))
+            self.assertGreater(statistik['fase']['muat_data']['memori'], 0)
+            self.assertGreater(statistik['fase']['rekursi']['memori'], 0)
+
+    def test_penghitung_paralel(self):
+        # Penghitung mode paralel = jumlah penghitung worker = penghitung serial
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(10000, mesin=mesin)
+            efim.jalankan(self.data)
+            paralel = EFIM(10000, mesin=mesin, n_workers=2)
+            paralel.jalankan(self.data)
+            self.assertEqual(paralel.high_utility_itemsets, efim.high_utility_itemsets)
+            self.assertEqual(paralel.penghitung(), efim.penghitung())
+
+    def test_log_debug(self):
+        # Log DEBUG memuat TWU per item hanya jika diaktifkan
+        with self.assertLogs('efim', level='DEBUG') as catatan:
+            EFIM(10000).jalankan(self.data)
+        self.assertTrue(any('TWU per item' in baris for baris in catatan.output))
+
+    def test_format_prometheus(self):
+        # Format teks Prometheus: counter dan histogram kumulatif berlabel
+        registri = RegistriMetrik()
+        registri.daftar('uji_total', 'counter', 'Uji counter.', ('jenis',))
+        registri.daftar('uji_detik', 'histogram', 'Uji histogram.', ('route',), (0.1, 1.0))
+        registri.tambah('uji_total', 2, jenis='a"b')
+        for nilai in [0.05, 0.1, 0.5, 3.0]:
+            registri.amati('uji_detik', nilai, route='/x')
+        teks = registri.teks()
+        self.assertIn('# TYPE uji_total counter', teks)
+        self.assertIn('uji_total{jenis="a\\"b"} 2', teks)
+        self.assertIn('uji_detik_bucket{route="/x",le="0.1"} 2', teks)
+        self.assertIn('uji_detik_bucket{route="/x",le="1.0"} 3', teks)
+        self.assertIn('uji_detik_bucket{route="/x",le="+Inf"} 4', teks)
+        self.assertIn('uji_detik_count{route="/x"} 4', teks)
+        self.assertIn('uji_detik_sum{route="/x"} 3.65', teks)
+        with self.assertRaises(ValueError):
+            registri.tambah('uji_total', jenis='a', lain='b')
+
+    def test_metrik_efim(self):
+        efim = EFIM(10000, mesin='proyeksi')
+        efim.jalankan(self.data)
+        statistik = efim.statistik()
+        metrik = MetrikEfim()
+        metrik.catat_mining(statistik)
+        metrik.catat_mining(statistik)
+        metrik.catat_request('/run_efim', 'POST', 200, 0.2)
+        teks = metrik.teks()
+        self.assertIn(f'efim_mining_node_total{{mesin="proyeksi"}} {2 * statistik["jumlah_node"]}', teks)
+        self.assertIn('efim_mining_total{mesin="proyeksi",mode="semua",dihentikan="tidak"} 2', teks)
+        self.assertIn('efim_http_request_duration_seconds_count{route="/run_efim",method="POST",status="200"} 1', teks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import pandas as pd
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from data_uji import data_transaksi
+
+
+def sebagai_dict(itemsets):
+    return {frozenset(itemset): util for itemset, util in itemsets}
+
+
+class TestMuatData(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+        self.harapan = sebagai_dict(jalankan_algoritma_efim(self.data, 15000))
+
+    def test_input_array(self):
+        kunci = self.data[['ID_PENJUALAN', 'KODE_BARANG']].to_numpy()
+        hasil = jalankan_algoritma_efim((kunci, self.data['UTILITY'].to_numpy()), 15000)
+        self.assertEqual(sebagai_dict(hasil), self.harapan)
+
+    def test_id_kosong_dibuang(self):
+        # Baris dengan id kosong dibuang saat pemuatan
+        data_kosong = pd.concat([self.data, pd.DataFrame({'ID_PENJUALAN': [None], 'KODE_BARANG': ['A'], 'UTILITY': [99999]})])
+        efim = EFIM(15000)
+        efim.muat_data(data_kosong)
+        efim.hitung_TWU()
+        self.assertEqual(efim.jumlah_transaksi, 4)
+        self.assertEqual(efim.items_twu['A'], 66000)
+
+    def test_input_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.skipTest('pyarrow tidak tersedia')
+        hasil = jalankan_algoritma_efim(pa.Table.from_pandas(self.data), 15000)
+        self.assertEqual(sebagai_dict(hasil), self.harapan)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import pandas as pd
+import unittest
+from registri_dataset import RegistriDataset, baca_berkas, kunci_tahap
+from penyimpanan_kolom import PenyimpananKolom
+from data_uji import data_transaksi
+
+
+class TestPenyimpananKolom(unittest.TestCase):
+    def setUp(self):
+        self.data_transaksi = data_transaksi()
+        self.direktori = tempfile.mkdtemp()
+        self.penyimpanan = PenyimpananKolom(os.path.join(self.direktori, 'kolom'))
+        if not self.penyimpanan.tersedia:
+            self.skipTest('pyarrow tidak tersedia')
+        self.path = [os.path.join(self.direktori, nama) for nama in ('a.csv', 'b.csv')]
+        for p in self.path:
+            self.data_transaksi.to_csv(p, index=False)
+
+    def test_upload_sama_diparse_sekali(self):
+        # Isi berkas sama -> kunci sama, CSV hanya diparse sekali
+        dibaca = []
+        def baca_teks(p):
+            dibaca.append(p)
+            return baca_berkas(p)
+        kunci, df = self.penyimpanan.muat_upload(self.path[0], baca_teks)
+        kunci_kedua, df_kedua = self.penyimpanan.muat_upload(self.path[1], baca_teks)
+        self.assertEqual((kunci, dibaca), (kunci_kedua, [self.path[0]]))
+        pd.testing.assert_frame_equal(df_kedua, df)
+
+    def test_tipe_kolom_dipertahankan(self):
+        kunci, df = self.penyimpanan.muat_upload(self.path[0], baca_berkas)
+        processed = df.assign(TANGGAL=pd.Timestamp('2024-01-01'))
+        self.penyimpanan.simpan(kunci_tahap(kunci, 'processed'), processed)
+        pd.testing.assert_frame_equal(self.penyimpanan.baca(kunci_tahap(kunci, 'processed')), processed)
+
+    def test_registri_memulihkan_dari_id(self):
+        # Registri baru (restart / worker lain) memulihkan dataset dari id saja
+        kunci, df = self.penyimpanan.muat_upload(self.path[0], baca_berkas)
+        processed = df.assign(TANGGAL=pd.Timestamp('2024-01-01'))
+        self.penyimpanan.simpan(kunci_tahap(kunci, 'processed'), processed)
+        registri = RegistriDataset(penyimpanan=self.penyimpanan)
+        self.assertIsNotNone(registri.ambil(kunci))
+        pd.testing.assert_frame_equal(registri.tahap(kunci, 'processed'), processed)
+        self.assertIsNone(registri.tahap(kunci, 'cleaned'))
+        self.assertIsNone(registri.ambil('0' * 32))
+
+    def test_frame_bukan_arrow_tidak_disimpan(self):
+        self.assertIsNone(self.penyimpanan.simpan('campuran', pd.DataFrame({'x': [1, 'a']})))
+        self.assertFalse(self.penyimpanan.ada('campuran'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import gc
+import tempfile
+import weakref
+import pandas as pd
+import unittest
+from penyimpanan_kolom import PenyimpananKolom
+from pipeline_preprocessing import PipelinePreprocessing
+
+
+class TestPipelinePreprocessing(unittest.TestCase):
+    def setUp(self):
+        self.raw = pd.DataFrame({
+            'id penjualan': ['T1', 'T1', 'T2', 'T2', 'T2', 'T3'],
+            'kode barang': ['A', 'B', 'A', 'C', 'C', None],
+            'NAMA_BARANG': ['a', 'b', 'a', 'c', 'c', 'x'],
+            'QTY': [1, 2, 1, 3, 3, 1],
+            'HARGASATUAN': [100, 200, 100, 300, 300, 100],
+            'TANGGAL': ['2024-01-01', '2024-01-01', 'bukan', '2024-01-02', '2024-01-02', '2024-01-03'],
+            'SATUAN': ['pcs'] * 6,
+        })
+        self.ambil_raw = lambda: self.raw
+        self.pipeline = PipelinePreprocessing()
+
+    def test_keluaran_utilitas(self):
+        salinan = self.raw.copy()
+        processed = self.pipeline.keluaran('dataset', 'utilitas', self.ambil_raw)
+        self.assertEqual(list(processed.columns),
+                         ['ID_PENJUALAN', 'KODE_BARANG', 'NAMA_BARANG', 'QTY', 'HARGASATUAN', 'TANGGAL', 'UTILITY'])
+        self.assertEqual(processed['UTILITY'].tolist(), [100, 400, 100, 900])   # NaN & duplikat dibuang
+        self.assertEqual(processed['TANGGAL'].iloc[2], pd.Timestamp('2010-06-02'))
+        pd.testing.assert_frame_equal(self.raw, salinan)   # input tidak diubah
+
+    def test_tahap_tidak_dihitung_ulang(self):
+        # Pemanggilan ulang tidak menjalankan tahap apa pun lagi
+        processed = self.pipeline.keluaran('dataset', 'utilitas', self.ambil_raw)
+        self.pipeline.keluaran('dataset', 'grup', self.ambil_raw)
+        self.assertIs(self.pipeline.keluaran('dataset', 'utilitas', self.ambil_raw), processed)
+        self.assertEqual(dict(self.pipeline.dihitung), {'bersihkan': 1, 'outlier': 1, 'utilitas': 1, 'grup': 1})
+
+    def test_kunci_bergantung_parameter(self):
+        lain = PipelinePreprocessing(parameter={'outlier': {'faktor_iqr': 3.0}})
+        self.assertEqual(self.pipeline.kunci('dataset')['bersihkan'], lain.kunci('dataset')['bersihkan'])
+        self.assertNotEqual(self.pipeline.kunci('dataset')['utilitas'], lain.kunci('dataset')['utilitas'])
+
+    def test_penyimpanan_kolom(self):
+        # Dengan penyimpanan kolumnar, pipeline baru (restart) memakai keluaran di disk
+        penyimpanan = PenyimpananKolom(tempfile.mkdtemp())
+        if not penyimpanan.tersedia:
+            self.skipTest('pyarrow tidak tersedia')
+        processed = PipelinePreprocessing(penyimpanan=penyimpanan).keluaran('dataset', 'utilitas', self.ambil_raw)
+        baru = PipelinePreprocessing(penyimpanan=penyimpanan)
+        pd.testing.assert_frame_equal(baru.keluaran('dataset', 'utilitas', self.ambil_raw), processed)
+        self.assertEqual(sum(baru.dihitung.values()), 0)
+        self.assertIsNotNone(baru.path('dataset', 'utilitas'))
+        self.assertIsNone(baru.path('dataset', 'grup'))
+
+    def test_cache_tidak_menahan_frame(self):
+        raw = pd.DataFrame({'ID_PENJUALAN': ['T1', 'T2'], 'KODE_BARANG': ['A', 'B'], 'QTY': [1, 2],
+                            'HARGASATUAN': [100, 200]})
+        processed = self.pipeline.keluaran('dataset', 'utilitas', lambda: raw)
+        # Selama pemilik (registri) memegang frame, cache pipeline mengembalikannya tanpa hitung ulang
+        self.assertIs(self.pipeline.keluaran('dataset', 'utilitas', lambda: raw), processed)
+        self.assertEqual(self.pipeline.dihitung['utilitas'], 1)
+        # Setelah dilepas pemiliknya, frame tidak tertahan di cache pipeline
+        ref = weakref.ref(processed)
+        del processed
+        gc.collect()
+        self.assertIsNone(ref())
+        self.pipeline.keluaran('dataset', 'utilitas', lambda: raw)
+        self.assertEqual(self.pipeline.dihitung['utilitas'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
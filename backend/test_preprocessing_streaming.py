@@ -0,0 +1,167 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import unittest
+import warnings
+from unittest import mock
+import preprocessing_streaming
+from penyimpanan_kolom import PenyimpananKolom, baca_feather
+from pipeline_preprocessing import PipelinePreprocessing
+from tipe_ringkas import ringkas_tipe
+from halaman import URUTAN, urutan_transaksi, urutan_dari_total, kelompokkan_transaksi
+from preprocessing_streaming import (SketsaKuantil, PartisiBaris, preprocess_streaming, ringkasan_berkas,
+                                     periksa_missing_dan_duplikat, hitung_baris, ringkasan_transaksi,
+                                     baris_transaksi)
+
+
+def data_mentah(rng, n=600):
+    raw = pd.DataFrame({
+        'id penjualan': rng.integers(1, 100, n),
+        'KODE_BARANG': rng.choice(list('ABCDE'), n),
+        'NAMA_BARANG': rng.choice(list('abcde'), n),
+        'QTY': rng.integers(1, 10, n).astype(float),
+        'HARGASATUAN': rng.choice([100, 200, 300, 5000], n, p=[0.3, 0.3, 0.3, 0.1]),
+        'TANGGAL': rng.choice(['2024-01-01', '2024-01-02', 'bukan'], n),
+        'SATUAN': 'pcs',
+    })
+    raw.loc[rng.choice(n, 20), 'QTY'] = np.nan
+    return pd.concat([raw, raw.head(50)])
+
+
+class TestSketsaKuantil(unittest.TestCase):
+    def test_eksak_tanpa_kompaksi(self):
+        nilai = np.random.default_rng(3).normal(size=1000)
+        sketsa = SketsaKuantil(k=4096)
+        sketsa.tambah(nilai)
+        self.assertEqual(sketsa.kuantil(0.25), float(np.quantile(nilai, 0.25)))
+
+    def test_galat_rank_kecil(self):
+        nilai = np.random.default_rng(3).normal(size=50000)
+        sketsa = SketsaKuantil(k=512)
+        for awal in range(0, len(nilai), 1000):
+            sketsa.tambah(nilai[awal:awal + 1000])
+        for q in (0.25, 0.5, 0.75):
+            rank = (nilai < sketsa.kuantil(q)).mean()
+            self.assertLess(abs(rank - q), 0.02)
+
+
+class TestPartisiBaris(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        n = 500
+        self.df = pd.DataFrame({'A': rng.integers(0, 5, n), 'B': rng.choice(['x', 'y', 'x,y', 'z"'], n),
+                                'C': rng.choice([0.1, 0.2, 0.1 + 0.2], n)})
+
+    def _duplikat(self, jumlah_partisi, keep):
+        partisi = PartisiBaris(tempfile.mkdtemp(), jumlah_partisi)
+        try:
+            for awal in range(0, len(self.df), 64):
+                partisi.tambah(self.df.iloc[awal:awal + 64])
+            return partisi.baris_duplikat(keep).tolist()
+        finally:
+            partisi.hapus()
+            self.assertFalse(os.path.exists(partisi.direktori))
+
+    def test_sama_dengan_duplicated(self):
+        for jumlah_partisi in (1, 7):
+            for keep in ('first', False):
+                harapan = np.flatnonzero(self.df.duplicated(keep=keep)).tolist()
+                self.assertEqual(self._duplikat(jumlah_partisi, keep), harapan)
+
+    def test_tabrakan_hash_dibandingkan_isi(self):
+        # Semua baris ber-hash sama: duplikat tetap ditentukan dari isi baris
+        with mock.patch.object(preprocessing_streaming, '_hash_baris',
+                               lambda chunk: np.zeros(len(chunk), dtype=np.uint64)):
+            self.assertEqual(self._duplikat(7, 'first'), np.flatnonzero(self.df.duplicated()).tolist())
+
+
+class TestPreprocessingStreaming(unittest.TestCase):
+    def setUp(self):
+        self.direktori = tempfile.mkdtemp()
+        self.raw = data_mentah(np.random.default_rng(3))
+        self.path = os.path.join(self.direktori, 'besar.csv')
+        self.raw.to_csv(self.path, index=False)
+
+    def _preprocess(self, **opsi):
+        if not PenyimpananKolom(self.direktori).tersedia:
+            self.skipTest('pyarrow tidak tersedia')
+        self.harapan = PipelinePreprocessing().keluaran('dataset', 'utilitas', lambda: pd.read_csv(self.path))
+        self.path_hasil = os.path.join(self.direktori, 'hasil.feather')
+        return preprocess_streaming(self.path, os.path.join(self.direktori, 'bersih.feather'), self.path_hasil,
+                                    ukuran_chunk=64, **opsi)
+
+    def test_periksa_missing_dan_duplikat(self):
+        for jumlah_partisi in (None, 5):
+            kosong, num_duplicates, num_unique_duplicates = periksa_missing_dan_duplikat(
+                self.path, ukuran_chunk=64, jumlah_partisi=jumlah_partisi)
+            self.assertEqual(num_duplicates, int(self.raw.duplicated(keep=False).sum()))
+            self.assertEqual(num_unique_duplicates, int(self.raw.duplicated().sum()))
+            self.assertEqual(kosong.to_dict(), self.raw.isnull().sum().to_dict())
+        self.assertEqual(hitung_baris(self.path, ukuran_chunk=64), len(self.raw))
+
+    def test_sama_dengan_pipeline_memori(self):
+        # Hasil per chunk kecil sama dengan pipeline di memori (kuantil eksak untuk data sekecil ini).
+        # Format TANGGAL ditebak sekali, bukan per chunk (tanpa UserWarning fallback dateutil)
+        for jumlah_partisi in (1, 5):
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', UserWarning)
+                statistik = self._preprocess(jumlah_partisi=jumlah_partisi)
+            jumlah, kolom, _ = ringkasan_berkas(self.path_hasil)
+            self.assertEqual(statistik['baris_hasil'], len(self.harapan))
+            self.assertEqual(statistik['baris_duplikat'], int(self.raw.dropna().duplicated().sum()))
+            self.assertEqual(jumlah, len(self.harapan))
+            self.assertEqual(kolom, list(self.harapan.columns))
+            hasil = ringkas_tipe(baca_feather(self.path_hasil))
+            pd.testing.assert_frame_equal(hasil, self.harapan.reset_index(drop=True), check_dtype=False,
+                                          check_categorical=False)
+        self.assertEqual([nama for nama in os.listdir(self.direktori) if nama.startswith('partisi_')], [])
+
+    def test_ringkasan_transaksi(self):
+        # Ringkasan per transaksi dari lintasan chunk sama dengan groupby hasil utuh
+        transaksi = self._preprocess()['transaksi']
+        tu = self.harapan.groupby('ID_PENJUALAN', observed=True)['UTILITY'].sum()
+        self.assertEqual(transaksi['ID_PENJUALAN'].tolist(), tu.index.tolist())
+        self.assertEqual(transaksi['UTILITY'].tolist(), tu.tolist())
+        self.assertEqual(transaksi['JUMLAH_BARIS'].tolist(),
+                         self.harapan.groupby('ID_PENJUALAN', observed=True).size().tolist())
+        pd.testing.assert_frame_equal(ringkasan_transaksi(self.path_hasil), transaksi)
+
+    def test_grouped_data_dari_ringkasan(self):
+        # Ringkasan cukup untuk urutan serta isi grouped_data berhalaman
+        transaksi = self._preprocess()['transaksi']
+        for urut in URUTAN:
+            ids = urutan_dari_total(transaksi['ID_PENJUALAN'].to_numpy(), transaksi['UTILITY'].to_numpy(), urut)
+            self.assertEqual(ids.tolist(), urutan_transaksi(self.harapan, urut).tolist())
+        ids = ids[5:12]
+        bagian = ringkas_tipe(baris_transaksi(self.path_hasil, ids))
+        pd.testing.assert_frame_equal(kelompokkan_transaksi(bagian, ids), kelompokkan_transaksi(self.harapan, ids))
+
+    def test_kolom_dibuang_setelah_dedup(self):
+        # NOMORREF ikut menentukan dropna dan duplikat sebelum dibuang, seperti di pipeline di memori:
+        # baris dengan NOMORREF kosong hilang, baris yang hanya berbeda NOMORREF tetap ada
+        rng = np.random.default_rng(5)
+        n = 300
+        raw = pd.DataFrame({
+            'ID_PENJUALAN': rng.integers(1, 40, n),
+            'KODE_BARANG': rng.choice(list('ABC'), n),
+            'NAMA_BARANG': rng.choice(list('abc'), n),
+            'QTY': rng.integers(1, 5, n).astype(float),
+            'HARGASATUAN': rng.choice([100, 200, 300], n),
+            'TANGGAL': '2024-01-01',
+            'NOMORREF': [f'R{i}' for i in range(n)],
+            'SATUAN': 'pcs',
+        })
+        raw.loc[rng.choice(n, 30, replace=False), 'NOMORREF'] = np.nan
+        beda_ref = raw.head(40).assign(NOMORREF=[f'S{i}' for i in range(40)])
+        pd.concat([raw, beda_ref, raw.tail(20)]).to_csv(self.path, index=False)
+        statistik = self._preprocess()
+        self.assertNotIn('NOMORREF', self.harapan.columns)
+        self.assertEqual(statistik['baris_hasil'], len(self.harapan))
+        hasil = ringkas_tipe(baca_feather(self.path_hasil))
+        pd.testing.assert_frame_equal(hasil, self.harapan.reset_index(drop=True), check_dtype=False,
+                                      check_categorical=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import unittest
+from pipeline_preprocessing import PipelinePreprocessing, bersihkan
+from profil_data import ProfilData
+
+
+class TestProfilData(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 300
+        df = pd.DataFrame({
+            'id penjualan': rng.integers(1, 40, n),
+            'KODE_BARANG': rng.choice(['A', 'B', 'C'], n),
+            'QTY': rng.integers(1, 4, n).astype(float),
+            'CATATAN': rng.choice(['x', None, None], n),
+            'TANGGAL': rng.choice(['2024-01-01', '2024-01-02'], n),
+        })
+        df.loc[rng.choice(n, 10), 'QTY'] = np.nan
+        df.loc[[7, 8]] = np.nan                           # baris kosong seluruhnya
+        self.df = pd.concat([df, df.sample(40, random_state=1)], ignore_index=True)
+        self.profil = ProfilData(self.df)
+
+    def test_statistik_kolom(self):
+        df, profil = self.df, self.profil
+        self.assertEqual(profil.kosong, {col: int(v) for col, v in df.isnull().sum().items()})
+        self.assertEqual(profil.baris_kosong, int(df.isnull().all(axis=1).sum()))
+        self.assertEqual(profil.jumlah_duplikat, int(df.duplicated(keep=False).sum()))
+        self.assertEqual(profil.jumlah_duplikat_unik, int(df.duplicated().sum()))
+        self.assertEqual(profil.kardinalitas['KODE_BARANG'], 3)
+        self.assertEqual(profil.kuantil['QTY']['0.5'], float(df['QTY'].quantile(0.5)))
+        self.assertNotIn('CATATAN', profil.kuantil)
+
+    def test_halaman_duplikat(self):
+        # Grup duplikat per halaman sama dengan groupby semua kolom
+        df, profil = self.df, self.profil
+        halaman = profil.halaman_duplikat(df, 0, 15) + profil.halaman_duplikat(df, 15, 10_000)
+        self.assertEqual(len(halaman), profil.jumlah_duplikat)
+        grup = [baris['Duplicate_Group'] for baris in halaman]
+        self.assertEqual(grup, sorted(grup))
+        pandas = df[df.duplicated(keep=False)]
+        pandas = pandas.assign(g=pandas.groupby(list(df.columns), dropna=False, sort=False).ngroup())
+        self.assertEqual(len(set(grup)), pandas['g'].nunique())
+
+    def test_nomor_grup_urut_kemunculan(self):
+        pertama = {}
+        for posisi, g in zip(self.profil.posisi_duplikat, self.profil.grup_duplikat):
+            pertama.setdefault(int(g), int(posisi))
+        self.assertEqual(list(pertama.values()), sorted(pertama.values()))
+
+    def test_bersihkan_dengan_profil(self):
+        # Tahap 'bersihkan' dengan profil sama dengan tanpa profil (kolom CATATAN > 50% kosong dibuang)
+        dengan = bersihkan(self.df, profil=self.profil)
+        pd.testing.assert_frame_equal(dengan, bersihkan(self.df))
+        self.assertNotIn('CATATAN', dengan.columns)
+        pipeline = PipelinePreprocessing()
+        pd.testing.assert_frame_equal(pipeline.keluaran('d', 'utilitas', lambda: self.df, self.profil),
+                                      PipelinePreprocessing().keluaran('d', 'utilitas', lambda: self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import pandas as pd
+import unittest
+from registri_dataset import RegistriDataset, ukuran_frame
+from data_uji import data_transaksi
+
+
+class TestRegistriDataset(unittest.TestCase):
+    def setUp(self):
+        self.data_transaksi = data_transaksi()
+        direktori = tempfile.mkdtemp()
+        self.path = [os.path.join(direktori, f'data{i}.csv') for i in range(3)]
+        for p in self.path:
+            self.data_transaksi.to_csv(p, index=False)
+        # Batas memori cukup untuk dua frame saja
+        self.registri = RegistriDataset(batas_memori=2 * ukuran_frame(self.data_transaksi))
+
+    def test_ambil_per_id(self):
+        entri = [self.registri.daftar(p, self.data_transaksi) for p in self.path[:2]]
+        self.assertIs(self.registri.ambil(entri[0].id), entri[0])
+        self.assertIs(self.registri.tahap(entri[0].id, 'raw'), self.data_transaksi)  # dibagikan tanpa salinan
+        self.assertIsNone(self.registri.tahap(entri[0].id, 'processed'))
+        self.assertIsNone(self.registri.ambil('tidak-ada'))
+
+    def test_tanpa_id_tidak_memakai_upload_terakhir(self):
+        # Upload pengguna lain tidak pernah menjadi dataset request tanpa dataset_id
+        self.registri.daftar(self.path[0], self.data_transaksi)
+        self.assertIsNone(self.registri.ambil())
+        satu_pengguna = RegistriDataset(pakai_terakhir=True)
+        entri = [satu_pengguna.daftar(p, self.data_transaksi) for p in self.path[:2]]
+        self.assertIs(satu_pengguna.ambil(), entri[1])
+
+    def test_batas_memori(self):
+        entri = [self.registri.daftar(p, self.data_transaksi) for p in self.path[:2]]
+        self.registri.ambil(entri[0].id)
+        # Dataset ketiga melewati batas: dataset paling lama tidak diakses (entri[1]) dilepas
+        entri.append(self.registri.daftar(self.path[2], self.data_transaksi))
+        self.assertLessEqual(self.registri.memori_terpakai, self.registri.batas_memori)
+        self.assertEqual(entri[1].tahap, {})
+        self.assertIn('raw', entri[0].tahap)
+
+        # Tahap yang dilepas dibaca ulang dari berkasnya
+        dibaca = self.registri.tahap(entri[1].id, 'raw')
+        self.assertIsNot(dibaca, self.data_transaksi)
+        pd.testing.assert_frame_equal(dibaca, self.data_transaksi)
+        self.assertEqual(entri[1].ringkasan()['tahap'], {'raw': True, 'cleaned': False, 'processed': False})
+
+
+if __name__ == '__main__':
+    unittest.main()
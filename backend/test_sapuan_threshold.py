@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import unittest
+from efim import EFIM
+from sapuan_threshold import SapuanThreshold
+
+THRESHOLDS = [3000, 1200, 6000, 20000, 500]
+
+
+class TestSapuanThreshold(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 400
+        self.df = pd.DataFrame({
+            'ID_PENJUALAN': rng.integers(1, 80, n),
+            'KODE_BARANG': rng.choice(list('ABCDEFG'), n),
+            'UTILITY': rng.integers(1, 50, n) * 10,
+        }).drop_duplicates(['ID_PENJUALAN', 'KODE_BARANG'])
+        efim = EFIM(min(THRESHOLDS))
+        efim.jalankan(self.df)
+        self.sapuan = SapuanThreshold(efim.high_utility_itemsets)
+
+    def test_sama_dengan_mining_terpisah(self):
+        for threshold in THRESHOLDS:
+            terpisah = EFIM(threshold)
+            terpisah.jalankan(self.df)
+            harapan = sorted((tuple(sorted(i)), u) for i, u in terpisah.high_utility_itemsets)
+            ringkasan = self.sapuan.ringkasan(threshold)
+            self.assertEqual(ringkasan['jumlah_itemset'], len(harapan))
+            self.assertEqual(ringkasan['total_utility'], sum(u for _, u in harapan))
+            self.assertEqual(sorted((tuple(sorted(i)), u) for i, u in self.sapuan.itemset(threshold)), harapan)
+
+    def test_threshold_di_atas_semua(self):
+        self.assertEqual(self.sapuan.ringkasan(10**9)['jumlah_itemset'], 0)
+        self.assertIsNone(self.sapuan.ringkasan(10**9)['utility_maks'])
+
+    def test_halaman(self):
+        # Urut utility adalah prefix urutan global; urutan lain disaring lalu diurutkan
+        halaman = self.sapuan.itemset(1200, offset=2, ukuran=3)
+        self.assertEqual(halaman, self.sapuan.itemset(1200)[2:5])
+        naik = self.sapuan.itemset(1200, urut='utility_asc')
+        self.assertEqual([u for _, u in naik], sorted(u for _, u in naik))
+
+    def test_histogram(self):
+        histogram = self.sapuan.histogram(jumlah_bin=8)
+        self.assertEqual(len(histogram['batas']), 9)
+        self.assertEqual(sum(histogram['jumlah']), len(self.sapuan.itemsets))
+        self.assertEqual(histogram['jumlah_di_atas'][0], len(self.sapuan.itemsets))
+        self.assertEqual(histogram['jumlah_di_atas'], sorted(histogram['jumlah_di_atas'], reverse=True))
+        self.assertEqual(SapuanThreshold([]).histogram(), {'batas': [], 'jumlah': [], 'jumlah_di_atas': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
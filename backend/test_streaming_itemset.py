@@ -0,0 +1,38 @@
+import io
+import json
+import unittest
+from efim import EFIM, jalankan_algoritma_efim, tulis_itemset
+from data_uji import data_transaksi
+
+
+class TestStreamingItemset(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+
+    def _harapan(self, mesin='utility_list'):
+        return [(tuple(itemset), util) for itemset, util in jalankan_algoritma_efim(self.data, 10000, mesin=mesin)]
+
+    def test_iter_sama_dengan_hasil_biasa(self):
+        for mesin in ['utility_list', 'proyeksi']:
+            harapan = self._harapan(mesin)
+            stream = EFIM(10000, mesin=mesin).iter_itemset(self.data)
+            self.assertEqual(next(stream), harapan[0])
+            self.assertEqual([harapan[0]] + list(stream), harapan)
+
+    def test_hasil_tidak_ditampung(self):
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(10000, mesin=mesin)
+            list(efim.iter_itemset(self.data))
+            self.assertEqual(efim.high_utility_itemsets, [])
+
+    def test_tulis_ndjson(self):
+        harapan = self._harapan()
+        berkas = io.StringIO()
+        jumlah = tulis_itemset(EFIM(10000).iter_itemset(self.data), berkas)
+        baris = [json.loads(b) for b in berkas.getvalue().splitlines()]
+        self.assertEqual(jumlah, len(harapan))
+        self.assertEqual({(tuple(b['itemset']), b['utility']) for b in baris}, set(harapan))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import unittest
+from efim import EFIM
+from indeks_item import IndeksItem
+from tipe_ringkas import ringkas_tipe, turunkan_numerik, perkalian_lebar
+
+
+class TestTipeRingkas(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'ID_PENJUALAN': ['T1', 'T1', 'T2', 'T2', 'T3', 'T3', 'T4'],
+            'kode barang': ['A', 'B', 'A', 'C', 'B', 'C', 'A'],
+            'NAMA_BARANG': ['a', 'b', 'a', 'c', 'b', 'c', 'a'],
+            'QTY': [100, 120, 50, 3, 127, 1, 2],
+            'HARGASATUAN': [30000.0, 250.5, 30000.0, 700.0, 300.0, 700.0, 30000.0],
+            'DISKON': [0.1, 0.2, 0.0, 0.0, 0.0, 0.0, 0.0],
+        })
+        self.ringkas = ringkas_tipe(self.df)
+
+    def _dengan_utility(self):
+        ringkas = self.ringkas.rename(columns={'kode barang': 'KODE_BARANG'})
+        ringkas = ringkas.assign(UTILITY=turunkan_numerik(perkalian_lebar(ringkas['QTY'], ringkas['QTY']) * 300))
+        biasa = self.df.rename(columns={'kode barang': 'KODE_BARANG'})
+        return ringkas, biasa.assign(UTILITY=biasa['QTY'] * biasa['QTY'] * 300)
+
+    def test_tipe_kolom(self):
+        for col in ('ID_PENJUALAN', 'kode barang', 'NAMA_BARANG'):
+            self.assertIsInstance(self.ringkas[col].dtype, pd.CategoricalDtype)
+        self.assertEqual(self.ringkas['QTY'].dtype, np.int8)
+        self.assertEqual(self.ringkas['HARGASATUAN'].dtype, np.float32)   # semua nilai eksak di float32
+        self.assertEqual(self.ringkas['DISKON'].dtype, np.float64)        # 0.1 tidak eksak: tetap float64
+
+    def test_idempoten_dan_input_tidak_diubah(self):
+        self.assertIs(ringkas_tipe(self.ringkas)['QTY'].dtype, self.ringkas['QTY'].dtype)
+        self.assertEqual(self.df['QTY'].dtype, np.int64)
+
+    def test_perkalian_tanpa_overflow(self):
+        # UTILITY dari kolom int8 x float32 tidak overflow / kehilangan presisi
+        utilitas = perkalian_lebar(self.ringkas['QTY'], self.ringkas['HARGASATUAN'])
+        self.assertEqual(utilitas.tolist(), (self.df['QTY'] * self.df['HARGASATUAN']).tolist())
+        ringkas, biasa = self._dengan_utility()
+        self.assertEqual(ringkas['UTILITY'].tolist(), biasa['UTILITY'].tolist())
+
+    def test_efim_atas_kategori(self):
+        # EFIM memakai kode kategori langsung (kategori tak terpakai dibuang); hasil sama dengan object
+        ringkas, biasa = self._dengan_utility()
+        ringkas = ringkas[ringkas['ID_PENJUALAN'] != 'T4']
+        biasa = biasa[biasa['ID_PENJUALAN'] != 'T4']
+        efim_ringkas, efim_biasa = EFIM(3000000), EFIM(3000000)
+        efim_ringkas.jalankan(ringkas)
+        efim_biasa.jalankan(biasa)
+        self.assertEqual(sorted(efim_ringkas.high_utility_itemsets), sorted(efim_biasa.high_utility_itemsets))
+        self.assertEqual(sorted(efim_ringkas.label_transaksi.tolist()), ['T1', 'T2', 'T3'])
+        self.assertEqual(efim_ringkas.util_transaksi.dtype, np.int64)
+        indeks = IndeksItem(ringkas, efim_ringkas)
+        self.assertEqual(indeks.twu, IndeksItem(biasa, efim_biasa).twu)
+        self.assertEqual(indeks.format_itemset(('A',), 1)['nama_barang'], ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
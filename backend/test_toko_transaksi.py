@@ -0,0 +1,132 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from cache_hasil import sidik_jari
+from registri_dataset import RegistriDataset
+from toko_transaksi import DirektoriToko, TokoTransaksi, array_bersama, petakan_array
+from data_uji import data_transaksi
+
+KOLOM = ('ID_PENJUALAN', 'KODE_BARANG', 'UTILITY')
+
+
+class TestTokoTransaksi(unittest.TestCase):
+    def setUp(self):
+        self.direktori = tempfile.mkdtemp()
+        self.data = data_transaksi()[list(KOLOM)]
+        self.kunci = sidik_jari(self.data, KOLOM)
+
+    def _toko_lain(self):
+        # Worker lain: cukup membuka indeks, array dipetakan read-only dari berkas yang sama
+        self.toko = DirektoriToko(self.direktori).ambil(self.kunci, self.data)
+        return DirektoriToko(self.direktori).buka(self.kunci)
+
+    def test_buka_dari_worker_lain(self):
+        self.assertIsNone(DirektoriToko(self.direktori).buka(self.kunci))
+        lain = self._toko_lain()
+        self.assertEqual(lain.jumlah_transaksi, 4)
+        self.assertEqual(lain.label_item.tolist(), ['A', 'B', 'C', 'D', 'E'])
+        for nama in ['offset', 'item', 'utilitas', 'label_transaksi', 'label_item']:
+            self.assertFalse(getattr(lain, nama).flags.writeable)
+            np.testing.assert_array_equal(getattr(lain, nama), getattr(self.toko, nama))
+
+    def test_mining_sama_dengan_dataframe(self):
+        lain = self._toko_lain()
+        for mesin in ['utility_list', 'proyeksi']:
+            harapan = jalankan_algoritma_efim(self.data, 10000, mesin=mesin)
+            self.assertEqual(jalankan_algoritma_efim(lain, 10000, mesin=mesin), harapan)
+            self.assertEqual(jalankan_algoritma_efim(lain, 10000, mesin=mesin, n_workers=2), harapan)
+        self.assertEqual(jalankan_algoritma_efim(lain, 10000, mode='tertutup'),
+                         jalankan_algoritma_efim(self.data, 10000, mode='tertutup'))
+
+    def test_inkremental_tidak_mengubah_berkas(self):
+        # Mining inkremental di atas toko menyalin store ke buffer sendiri; berkas tidak berubah
+        tambahan = pd.DataFrame({'ID_PENJUALAN': ['T5', 'T5'], 'KODE_BARANG': ['A', 'D'], 'UTILITY': [3000, 9000]})
+        efim = EFIM(10000)
+        efim.jalankan(self._toko_lain())
+        hasil = efim.tambah_transaksi(tambahan)
+        harapan = jalankan_algoritma_efim(pd.concat([self.data, tambahan]), 10000)
+        self.assertEqual({frozenset(i): u for i, u in hasil}, {frozenset(i): u for i, u in harapan})
+        self.assertEqual(DirektoriToko(self.direktori).buka(self.kunci).jumlah_transaksi, 4)
+
+    def test_tipe_label(self):
+        # Label numerik tetap numerik; label campuran ditolak (pemanggil kembali ke DataFrame)
+        angka = TokoTransaksi.dari_transaksi('angka', ([1, 1, 2], [10, 20, 10], [5, 6, 7]))
+        self.assertEqual(angka.label_item.dtype.kind, 'i')
+        with self.assertRaises(ValueError):
+            TokoTransaksi.dari_transaksi('campur', (np.array([1, 1, 2]), np.array(['a', 2, 'a'], dtype=object),
+                                                    np.array([5, 6, 7])))
+
+    def test_array_bersama(self):
+        # Array bersama untuk worker pool: termasuk array kosong, dihapus setelah blok with
+        with array_bersama({'a': np.arange(5), 'kosong': np.empty(0, dtype=np.float64), 'teks': np.array(['x', 'yz'])},
+                           self.direktori) as (path, tata_letak):
+            arrays = petakan_array(path, tata_letak)
+            self.assertEqual(arrays['a'].tolist(), list(range(5)))
+            self.assertEqual(len(arrays['kosong']), 0)
+            self.assertEqual(arrays['teks'].tolist(), ['x', 'yz'])
+        self.assertFalse(os.path.exists(path))
+
+    def test_upload_terakhir_bersama(self):
+        # Mode satu pengguna: upload terakhir dicatat bersama, registri worker lain memakai dataset yang sama
+        berkas = os.path.join(self.direktori, 'terakhir.json')
+        registri_a = RegistriDataset(berkas_terakhir=berkas, pakai_terakhir=True)
+        registri_b = RegistriDataset(berkas_terakhir=berkas, pakai_terakhir=True)
+        self.assertIsNone(registri_b.ambil())
+        path_upload = os.path.join(self.direktori, 'upload.csv')
+        self.data.to_csv(path_upload, index=False)
+        entri = registri_a.daftar(path_upload, dataset_id='abc', streaming=True)
+        self.assertTrue(entri.streaming)
+        dipulihkan = registri_b.ambil()
+        self.assertEqual((dipulihkan.id, dipulihkan.path, dipulihkan.streaming), ('abc', path_upload, True))
+
+
+class TestBatasUkuranToko(unittest.TestCase):
+    def setUp(self):
+        self.direktori = tempfile.mkdtemp()
+        self.data = data_transaksi()[list(KOLOM)]
+        # Satu toko data uji; batas cukup untuk dua toko
+        contoh = DirektoriToko(tempfile.mkdtemp())
+        self.ukuran = os.path.getsize(contoh.path(contoh.ambil('x', self.data).kunci, 'csr'))
+        penulis = DirektoriToko(self.direktori, maks_terbuka=1, maks_byte=2 * self.ukuran)
+        for i, kunci in enumerate(['a', 'b', 'c']):
+            penulis.ambil(kunci, self.data)
+            os.utime(penulis.path(kunci), (i, i))
+        self.penulis = penulis
+
+    def test_paling_lama_dihapus(self):
+        # 'a' paling lama tidak dibuka dan tidak dipetakan lagi oleh proses ini: dihapus
+        self.assertFalse(self.penulis.ada('a'))
+        self.assertFalse(os.path.exists(self.penulis.path('a', 'csr')))
+        self.assertTrue(self.penulis.ada('b') and self.penulis.ada('c'))
+
+    def test_toko_terpetakan_dipertahankan(self):
+        # Toko yang sedang dipetakan tidak dihapus walaupun paling lama; toko yang dibuka ulang jadi
+        # paling baru
+        pembaca = DirektoriToko(self.direktori, maks_byte=2 * self.ukuran)
+        toko_b = pembaca.buka('b')
+        os.utime(pembaca.path('b'), (0, 0))
+        pembaca.ambil('d', self.data)
+        self.assertTrue(pembaca.ada('b'))
+        self.assertFalse(pembaca.ada('c'))
+        self.assertEqual(toko_b.jumlah_transaksi, 4)
+
+    def test_toko_terhapus_tetap_terbaca(self):
+        # Worker lain yang masih memegang toko terhapus tetap bisa membacanya, lalu menerbitkan ulang
+        pembaca = DirektoriToko(self.direktori, maks_byte=2 * self.ukuran)
+        toko_b = pembaca.buka('b')
+        os.utime(pembaca.path('b'), (0, 0))
+        pembaca.ambil('d', self.data)
+        pembaca.rapikan()
+        DirektoriToko(self.direktori, maks_byte=self.ukuran).ambil('e', self.data)
+        self.assertFalse(pembaca.ada('b'))
+        self.assertEqual(toko_b.label_item.tolist(), ['A', 'B', 'C', 'D', 'E'])
+        self.assertIsNone(pembaca.buka('c'))
+        self.assertEqual(pembaca.ambil('c', self.data).jumlah_transaksi, 4)
+        self.assertTrue(pembaca.ada('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from efim import EFIM, jalankan_algoritma_efim
+from data_uji import data_transaksi
+
+
+class TestTopK(unittest.TestCase):
+    def setUp(self):
+        self.data = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+        self.semua = sorted((util for _, util in jalankan_algoritma_efim(self.data, 0)), reverse=True)
+
+    def test_k_terbaik(self):
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(None, mesin=mesin, k=5)
+            efim.jalankan(self.data)
+            self.assertEqual([util for _, util in efim.high_utility_itemsets], self.semua[:5])
+
+    def test_threshold_dinaikkan(self):
+        # Threshold akhir adalah utilitas itemset ke-K
+        for mesin in ['utility_list', 'proyeksi']:
+            efim = EFIM(None, mesin=mesin, k=5)
+            efim.jalankan(self.data)
+            self.assertEqual(efim.min_util, self.semua[4])
+
+    def test_k_tidak_valid(self):
+        with self.assertRaises(ValueError):
+            EFIM(None, k=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import unittest
+from efim import EFIM, UtilityList, jalankan_algoritma_efim
+from data_uji import data_transaksi
+
+# Utilitas dihitung tangan dari data_uji (HARGA x KUANTITAS):
+#   T1: A=10000 B=7000  C=3000
+#   T2: A=5000  C=9000  D=4000
+#   T3: B=14000 C=3000  E=4000
+#   T4: A=5000  B=21000 E=2000
+UTILITAS_TANGAN = {
+    frozenset('AB'): 10000 + 7000 + 5000 + 21000,
+    frozenset('AC'): 10000 + 3000 + 5000 + 9000,
+    frozenset('BC'): 7000 + 3000 + 14000 + 3000,
+    frozenset('BE'): 14000 + 4000 + 21000 + 2000,
+    frozenset('ABC'): 10000 + 7000 + 3000,
+    frozenset('ABE'): 5000 + 21000 + 2000,
+    frozenset('BCE'): 14000 + 3000 + 4000,
+}
+
+
+class TestUtilityList(unittest.TestCase):
+    def setUp(self):
+        self.data_transaksi = data_transaksi()[['ID_PENJUALAN', 'KODE_BARANG', 'UTILITY']]
+
+    def test_utilitas_itemset_eksak(self):
+        # Itemset panjang >= 3 dulu dihitung lebih (utilitas prefix ikut dijumlahkan di tiap join)
+        for mesin in ['utility_list', 'proyeksi']:
+            hasil = {frozenset(itemset): util
+                     for itemset, util in jalankan_algoritma_efim(self.data_transaksi, 0, mesin=mesin)}
+            for itemset, util in UTILITAS_TANGAN.items():
+                self.assertEqual(hasil[itemset], util, (mesin, sorted(itemset)))
+
+    def test_join_array_paralel(self):
+        efim = EFIM(0)
+        db = efim.siapkan(self.data_transaksi)
+        utility_lists = efim.buat_utility_list(efim.rank_ke_item, db)
+        rank = {label: r for r, label in enumerate(efim.label_item[efim.rank_ke_item].tolist())}
+        ul = {item: utility_lists[rank[item]] for item in 'ABC'}
+        for ulist in ul.values():
+            self.assertIsInstance(ulist, UtilityList)
+            self.assertTrue(np.all(np.diff(ulist.tids) > 0))
+
+        # Prefix diurutkan sesuai rank (TWU naik) agar join mengikuti urutan pencarian
+        x, y, z = sorted('ABC', key=rank.get)
+        ul_xy = efim.construct_utility_list(ul[x], ul[y])
+        ul_xz = efim.construct_utility_list(ul[x], ul[z])
+        ul_xyz = efim.construct_utility_list(ul_xy, ul_xz, ul[x])
+        self.assertEqual(len(ul_xyz), 1)
+        self.assertEqual(ul_xy.sum_iutils, UTILITAS_TANGAN[frozenset(x + y)])
+        self.assertEqual(ul_xyz.sum_iutils, UTILITAS_TANGAN[frozenset('ABC')])
+        self.assertEqual(len(ul_xyz.tids), len(ul_xyz.iutils))
+        self.assertEqual(len(ul_xyz.tids), len(ul_xyz.rutils))
+
+    def test_baris_berulang_dijumlahkan(self):
+        # Pasangan (transaksi, item) yang muncul di beberapa baris dijumlahkan utilitasnya
+        data = pd.concat([self.data_transaksi,
+                          pd.DataFrame({'ID_PENJUALAN': ['T1'], 'KODE_BARANG': ['A'], 'UTILITY': [1000]})])
+        hasil = {frozenset(itemset): util for itemset, util in jalankan_algoritma_efim(data, 0)}
+        self.assertEqual(hasil[frozenset('ABC')], UTILITAS_TANGAN[frozenset('ABC')] + 1000)
+        self.assertEqual(hasil[frozenset('A')], 10000 + 5000 + 5000 + 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+# Tipe data ringkas untuk frame transaksi. Kolom identitas bertipe teks (kode/nama barang, id
+# penjualan non-numerik) disimpan sebagai categorical: kode integer per baris + kamus kategori
+# yang hanya dipakai untuk tampilan. EFIM memakai kode kategori langsung sebagai id item/transaksi,
+# dan label asli baru dipakai saat respons diformat. Kolom numerik diturunkan ke tipe terkecil
+# yang masih memuat nilainya tanpa kehilangan presisi.
+
+KOLOM_IDENTITAS = ('ID_PENJUALAN', 'KODE_BARANG', 'NAMA_BARANG')
+
+
+def _nama_standar(col):
+    return str(col).upper().strip().replace(' ', '_')
+
+
+def turunkan_numerik(kolom):
+    # Integer -> int terkecil; float -> float32 hanya jika semua nilai sama persis setelah konversi
+    if pd.api.types.is_bool_dtype(kolom) or not pd.api.types.is_numeric_dtype(kolom):
+        return kolom
+    if pd.api.types.is_integer_dtype(kolom):
+        return pd.to_numeric(kolom, downcast='integer')
+    if kolom.dtype == np.float64:
+        nilai = kolom.to_numpy()
+        with np.errstate(over='ignore'):
+            if np.array_equal(nilai.astype(np.float32), nilai, equal_nan=True):
+                return kolom.astype(np.float32)
+    return kolom
+
+
+def ringkas_tipe(df, kolom_identitas=KOLOM_IDENTITAS):
+    # Salinan dangkal df dengan tipe ringkas; kolom yang sudah ringkas tidak diubah. Nama kolom
+    # dicocokkan setelah standarisasi sehingga bisa dipakai sebelum maupun sesudah cleaning.
+    identitas = set(kolom_identitas)
+    ubah = {}
+    for col in df.columns:
+        kolom = df[col]
+        if isinstance(kolom.dtype, pd.CategoricalDtype):
+            continue
+        if _nama_standar(col) in identitas and not pd.api.types.is_numeric_dtype(kolom):
+            ubah[col] = kolom.astype('category')
+        else:
+            hasil = turunkan_numerik(kolom)
+            if hasil.dtype != kolom.dtype:
+                ubah[col] = hasil
+    return df.assign(**ubah) if ubah else df.copy(deep=False)
+
+
+def perkalian_lebar(a, b):
+    # a * b dengan tipe minimal int64/float64 agar kolom yang sudah diturunkan tidak overflow
+    if isinstance(a.dtype, np.dtype):
+        a = a.astype(np.result_type(a.dtype, np.int64))
+    return a * b
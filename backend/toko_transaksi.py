@@ -0,0 +1,232 @@
+import json
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# Toko transaksi bersama: database transaksi hasil preprocessing dalam bentuk CSR (offset transaksi,
+# kode item, utilitas, beserta label item/transaksi) diterbitkan sekali per isi data sebagai berkas
+# biner dengan indeks JSON kecil. Tiap worker Flask memetakan berkas yang sama secara read-only
+# (mmap), sehingga halaman memorinya dibagi lewat page cache dan tidak disalin per proses; worker
+# yang belum pernah melihat data cukup membuka indeksnya. Dipilih berkas yang dipetakan alih-alih
+# multiprocessing.shared_memory karena tetap ada saat worker di-restart dan tidak bergantung pada
+# resource tracker proses pembuatnya; letakkan direktorinya di /dev/shm agar sepenuhnya di RAM.
+# Mekanisme yang sama (array_bersama) dipakai untuk membagikan database terpangkas ke worker pool
+# mining paralel.
+
+VERSI = 1
+# Awal tiap array di berkas diratakan agar view NumPy selalu aligned
+PERATAAN = 64
+# Berkas sementara untuk worker pool: di RAM jika tersedia
+DIREKTORI_SEMENTARA = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+def tulis_array(path, arrays):
+    # Tulis array 1D (dict nama -> ndarray) berurutan ke satu berkas; mengembalikan tata letaknya
+    tata_letak = {}
+    posisi = 0
+    with open(path, 'wb') as berkas:
+        for nama, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            mulai = -(-posisi // PERATAAN) * PERATAAN
+            berkas.write(b'\0' * (mulai - posisi))
+            array.tofile(berkas)
+            tata_letak[nama] = {'dtype': array.dtype.str, 'panjang': len(array), 'mulai': mulai}
+            posisi = mulai + array.nbytes
+    return tata_letak
+
+
+def petakan_array(path, tata_letak):
+    # View read-only (tanpa salinan) atas berkas hasil tulis_array
+    with open(path, 'rb') as berkas:
+        ukuran = os.fstat(berkas.fileno()).st_size
+        peta = mmap.mmap(berkas.fileno(), 0, access=mmap.ACCESS_READ) if ukuran else None
+    arrays = {}
+    for nama, info in tata_letak.items():
+        dtype = np.dtype(info['dtype'])
+        if not info['panjang']:
+            arrays[nama] = np.empty(0, dtype=dtype)
+        else:
+            arrays[nama] = np.frombuffer(peta, dtype=dtype, count=info['panjang'], offset=info['mulai'])
+    return arrays
+
+
+@contextmanager
+def array_bersama(arrays, direktori=None):
+    # Bagikan arrays ke proses lain selama blok with: yield (path, tata_letak) untuk petakan_array.
+    # Berkas dihapus setelahnya; proses yang sudah memetakannya tetap bisa membaca sampai selesai.
+    fd, path = tempfile.mkstemp(prefix='efim_', suffix='.arr', dir=direktori or DIREKTORI_SEMENTARA)
+    os.close(fd)
+    try:
+        yield path, tulis_array(path, arrays)
+    finally:
+        os.remove(path)
+
+
+def _array_label(label):
+    # Label numerik disimpan apa adanya, label teks sebagai unicode lebar tetap (bisa dipetakan).
+    # Label lain (campuran, tanggal, ...) tidak bisa dipetakan tanpa kehilangan tipe.
+    label = np.asarray(label)
+    if label.dtype.kind in 'biufU':
+        return label
+    if not len(label):
+        return np.empty(0, dtype='U1')
+    if label.dtype.kind == 'O' and pd.api.types.infer_dtype(label, skipna=False) == 'string':
+        teks = label.astype(str)
+        if (teks == label).all():  # unicode NumPy membuang karakter NUL di akhir
+            return teks
+    raise ValueError(f'Label bertipe {pd.api.types.infer_dtype(label, skipna=False)} tidak bisa disimpan di toko transaksi')
+
+
+class TokoTransaksi:
+    # Database transaksi CSR siap pakai EFIM (lihat EFIM.muat_data): item dan transaksi sudah berupa id
+    # padat, label[id] memberi nilai aslinya
+    __slots__ = ('kunci', 'offset', 'item', 'utilitas', 'label_transaksi', 'label_item')
+
+    def __init__(self, kunci, offset, item, utilitas, label_transaksi, label_item):
+        self.kunci = kunci
+        self.offset = offset
+        self.item = item
+        self.utilitas = utilitas
+        self.label_transaksi = label_transaksi
+        self.label_item = label_item
+
+    @property
+    def jumlah_transaksi(self):
+        return len(self.offset) - 1
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, nama).nbytes for nama in self.__slots__[1:])
+
+    @classmethod
+    def dari_transaksi(cls, kunci, data_transaksi, kolom_id_transaksi='ID_PENJUALAN', kolom_id_item='KODE_BARANG',
+                       kolom_utilitas='UTILITY'):
+        # Faktorisasi dan susun CSR sekali (sama seperti EFIM.muat_data)
+        from efim import faktorisasi_transaksi
+        from csr import susun_csr
+        kode_tid, label_tid, kode_item, label_item, utilitas = faktorisasi_transaksi(
+            data_transaksi, kolom_id_transaksi, kolom_id_item, kolom_utilitas)
+        offset, item, utilitas = susun_csr(kode_tid, kode_item, utilitas, len(label_tid))
+        return cls(kunci, offset, item, utilitas, _array_label(label_tid), _array_label(label_item))
+
+
+class DirektoriToko:
+    # Toko transaksi di satu direktori: <kunci>.csr (array) dan <kunci>.json (indeks). Indeks ditulis
+    # terakhir dan atomik, jadi toko yang indeksnya ada selalu lengkap. Toko yang sudah dipetakan
+    # disimpan per proses (LRU) agar request berikutnya tidak membuka ulang berkas.
+    # maks_byte membatasi total ukuran berkas: setelah menerbitkan, toko yang paling lama tidak dibuka
+    # (mtime indeks, disentuh tiap buka) dihapus, kecuali yang sedang dipetakan proses ini. Worker lain
+    # yang masih memetakan berkas terhapus tetap bisa membacanya (unlink tidak membatalkan mmap) dan
+    # menerbitkannya ulang saat dibutuhkan lagi.
+    def __init__(self, direktori, maks_terbuka=32, maks_byte=None):
+        self.direktori = direktori
+        self.maks_terbuka = maks_terbuka
+        self.maks_byte = maks_byte
+        self._terbuka = OrderedDict()
+        self._kunci = threading.Lock()
+        os.makedirs(direktori, exist_ok=True)
+
+    def path(self, kunci, ekstensi='json'):
+        return os.path.join(self.direktori, f'{kunci}.{ekstensi}')
+
+    def ada(self, kunci):
+        return os.path.exists(self.path(kunci))
+
+    def buka(self, kunci):
+        # TokoTransaksi yang dipetakan dari berkas, atau None jika belum diterbitkan
+        with self._kunci:
+            toko = self._terbuka.get(kunci)
+            if toko is not None:
+                self._terbuka.move_to_end(kunci)
+                self._sentuh(kunci)
+                return toko
+            try:
+                with open(self.path(kunci)) as berkas:
+                    indeks = json.load(berkas)
+                if indeks.get('versi') != VERSI:
+                    return None
+                arrays = petakan_array(self.path(kunci, 'csr'), indeks['array'])
+            except FileNotFoundError:
+                # Belum diterbitkan, atau baru saja dihapus worker lain
+                return None
+            self._sentuh(kunci)
+            toko = TokoTransaksi(kunci, **arrays)
+            self._terbuka[kunci] = toko
+            while len(self._terbuka) > self.maks_terbuka:
+                self._terbuka.popitem(last=False)
+            return toko
+
+    def terbitkan(self, toko):
+        # Tulis toko ke berkas sementara lalu rename (atomik); worker lain yang menerbitkan isi yang
+        # sama bersamaan hanya menimpa dengan berkas identik. Mengembalikan versi yang dipetakan.
+        akhiran = f'{os.getpid()}.{threading.get_ident()}.tmp'
+        arrays = {nama: getattr(toko, nama) for nama in TokoTransaksi.__slots__[1:]}
+        path_data = self.path(toko.kunci, 'csr')
+        tata_letak = tulis_array(f'{path_data}.{akhiran}', arrays)
+        os.replace(f'{path_data}.{akhiran}', path_data)
+        indeks = {'versi': VERSI, 'kunci': toko.kunci, 'jumlah_transaksi': toko.jumlah_transaksi,
+                  'jumlah_item': len(toko.label_item), 'array': tata_letak}
+        path_indeks = self.path(toko.kunci)
+        with open(f'{path_indeks}.{akhiran}', 'w') as berkas:
+            json.dump(indeks, berkas)
+        os.replace(f'{path_indeks}.{akhiran}', path_indeks)
+        with self._kunci:
+            self._terbuka.pop(toko.kunci, None)
+        toko = self.buka(toko.kunci)
+        self.rapikan()
+        return toko
+
+    def _sentuh(self, kunci):
+        # Tandai pemakaian untuk urutan LRU antar worker
+        try:
+            os.utime(self.path(kunci))
+        except FileNotFoundError:
+            pass
+
+    def rapikan(self):
+        # Hapus toko paling lama tidak dibuka sampai total berkas <= maks_byte; toko yang sedang
+        # dipetakan proses ini dilewati. Mengembalikan kunci yang dihapus.
+        if self.maks_byte is None:
+            return []
+        toko = []
+        for nama in os.listdir(self.direktori):
+            if not nama.endswith('.csr'):
+                continue
+            kunci = nama[:-len('.csr')]
+            try:
+                # Tanpa indeks: sedang diterbitkan worker lain, jangan disentuh
+                waktu = os.path.getmtime(self.path(kunci))
+                ukuran = os.path.getsize(self.path(kunci, 'csr'))
+            except FileNotFoundError:
+                continue
+            toko.append((waktu, kunci, ukuran))
+        total = sum(ukuran for _, _, ukuran in toko)
+        dihapus = []
+        with self._kunci:
+            for _, kunci, ukuran in sorted(toko):
+                if total <= self.maks_byte:
+                    break
+                if kunci in self._terbuka:
+                    continue
+                # Indeks dihapus dulu agar toko tidak pernah terlihat lengkap tanpa datanya
+                for ekstensi in ('json', 'csr'):
+                    try:
+                        os.remove(self.path(kunci, ekstensi))
+                    except FileNotFoundError:
+                        pass
+                total -= ukuran
+                dihapus.append(kunci)
+        return dihapus
+
+    def ambil(self, kunci, data_transaksi, **kolom):
+        # Toko untuk kunci (sidik jari data_transaksi); diterbitkan dari data_transaksi jika belum ada.
+        # ValueError jika label data tidak bisa dipetakan.
+        toko = self.buka(kunci)
+        if toko is None:
+            toko = self.terbitkan(TokoTransaksi.dari_transaksi(kunci, data_transaksi, **kolom))
+        return toko